@@ -0,0 +1,65 @@
+"""
+peak memory of the lexer input streams (antlr's InputStream vs solidity_parser.charstream) for
+synthetic sources of the given sizes in MB, ASCII and with one non-latin-1 character
+
+    python benchmarks/bench_charstream.py [MB ...]
+"""
+import gc
+import sys
+import tracemalloc
+
+from common import ROOT  # noqa: F401 (sys.path)
+
+from antlr4.InputStream import InputStream
+
+from solidity_parser.charstream import BufferStream, CodePointStream
+
+CONTRACT = """contract C%d {
+    uint256 public total;
+    function add(uint256 value) public returns (uint256) {
+        total += value; // running sum
+        return total;
+    }
+}
+"""
+
+
+def source(megabytes, unicode=False):
+    text = []
+    size = 0
+    while size < megabytes * 1000 * 1000:
+        text.append(CONTRACT % len(text))
+        size += len(text[-1])
+    if unicode:
+        text.append("// €\n")
+    return "".join(text)
+
+
+def peak(make, data):
+    """
+    :return: bytes allocated at the peak while building the stream (excluding the source itself)
+    """
+    gc.collect()
+    tracemalloc.start()
+    stream = make(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del stream
+    return peak
+
+
+def main(sizes):
+    print("%6s  %-8s  %14s  %14s  %14s" % ("MB", "source", "InputStream", "CodePointStream", "BufferStream"))
+    for megabytes in sizes:
+        for unicode in (False, True):
+            text = source(megabytes, unicode)
+            row = [peak(InputStream, text), peak(CodePointStream, text)]
+            row.append(peak(BufferStream, text.encode("ascii")) if not unicode else None)
+            print("%6s  %-8s  %12.1f MB  %12.1f MB  %12s" % (
+                megabytes, "unicode" if unicode else "ascii", row[0] / 1e6, row[1] / 1e6,
+                "%.1f MB" % (row[2] / 1e6) if row[2] is not None else "-"))
+            del text
+
+
+if __name__ == "__main__":
+    main([float(size) for size in sys.argv[1:]] or [1, 10, 50])
@@ -0,0 +1,41 @@
+"""
+parse time of the ANTLR engine and the recursive-descent engine (engine="rd") with both lexers,
+per file and in total (warm prediction caches). The engine column of stats shows fallbacks to ANTLR.
+
+    python benchmarks/bench_engines.py [file.sol|directory ...]
+"""
+import os
+import sys
+
+from common import best_of, source_files
+
+from solidity_parser import parser
+
+CONFIGS = [("antlr", "antlr"), ("regex", "antlr"), ("antlr", "rd"), ("regex", "rd")]
+
+
+def main(paths):
+    print("%-30s %8s" % ("file", "size") + "".join(" %13s" % ("%s/%s" % config) for config in CONFIGS) + "  rd used")
+    totals = [0.0] * len(CONFIGS)
+    fallbacks = 0
+    for path in source_files(paths):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        stats = {}
+        try:
+            parser.parse(text, lexer="regex", engine="rd", stats=stats)
+        except Exception as e:
+            print("skipping %s: %s" % (path, e), file=sys.stderr)
+            continue
+        fallbacks += stats["engine"] != "rd"
+        times = [best_of(lambda: parser.parse(text, lexer=lexer, engine=engine)) for lexer, engine in CONFIGS]
+        totals = [total + t for total, t in zip(totals, times)]
+        print("%-30s %7.1fk" % (os.path.basename(path)[:30], len(text) / 1000.0)
+              + "".join(" %12.3fs" % t for t in times) + "  " + ("yes" if stats["engine"] == "rd" else "no"))
+    print("%-30s %8s" % ("total", "") + "".join(" %12.3fs" % t for t in totals) + "  %d fallbacks" % fallbacks)
+    if totals[0]:
+        print("%-30s %8s" % ("speedup", "") + "".join(" %12.2fx" % (totals[0] / t) for t in totals))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
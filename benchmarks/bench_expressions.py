@@ -0,0 +1,31 @@
+"""
+AstVisitor on long expression chains: an n-operand && guard and an n-argument abi.encodePacked()
+call. The time per operand should stay flat as n grows (operators are found by token type, not
+by getText() of whole subexpressions).
+
+    python benchmarks/bench_expressions.py [n ...]
+"""
+import sys
+
+from common import best_of, parse_tree
+
+from solidity_parser.astbuilder import AstVisitor
+
+
+def source(n):
+    guard = " && ".join("a[%d] > %d" % (i, i) for i in range(n))
+    packed = ", ".join("a[%d]" % i for i in range(n))
+    return ("contract C { function f(uint[] memory a) public pure returns (bytes memory) {"
+            " require(%s); return abi.encodePacked(%s); } }" % (guard, packed))
+
+
+def main(sizes):
+    print("%6s %10s %16s" % ("n", "visit", "per operand"))
+    for n in sizes:
+        tree = parse_tree(source(n))
+        seconds = best_of(lambda: AstVisitor().visit(tree))
+        print("%6d %9.3fs %13.2f us" % (n, seconds, seconds / (2 * n) * 1e6))
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [250, 500, 1000, 2000])
@@ -0,0 +1,52 @@
+"""
+import time of the package and time to the first parse, with and without a prebuilt ATN pickle
+(see solidity_parser.grammar). Every measurement runs in a fresh interpreter.
+
+    python benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+# the child prints the seconds it took; ATN_CACHE_PATH is pointed at the pickle to use (or a missing file)
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import solidity_parser
+from solidity_parser import grammar, parser
+grammar.ATN_CACHE_PATH = sys.argv[1]
+if sys.argv[2] == "parse":
+    parser.parse("contract C { function f() public {} }")
+print(time.perf_counter() - start)
+"""
+
+
+def run(atn_cache, what, runs):
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", CHILD, atn_cache, what], cwd=ROOT, check=True,
+                             stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(out))
+    return statistics.median(times)
+
+
+def main(runs):
+    from solidity_parser import grammar
+
+    # up to date .pyc files (also with PYTHONDONTWRITEBYTECODE set), the import would compile the modules otherwise
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "solidity_parser"], cwd=ROOT, check=True)
+    with tempfile.TemporaryDirectory() as directory:
+        missing = os.path.join(directory, "missing.pickle")
+        prebuilt = os.path.join(directory, "SolidityATN.pickle")
+        grammar.build_atn_cache(prebuilt)
+        print("import solidity_parser:            %7.1f ms" % (run(missing, "import", runs) * 1000))
+        print("import + first parse, no pickle:   %7.1f ms" % (run(missing, "parse", runs) * 1000))
+        print("import + first parse, with pickle: %7.1f ms" % (run(prebuilt, "parse", runs) * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
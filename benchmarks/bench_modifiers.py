@@ -0,0 +1,104 @@
+"""
+AstVisitor on modifier-heavy function headers (visibility, mutability, virtual, override and
+three to six modifier invocations each): python calls and time per function of visiting the
+prebuilt parse tree, and the child lookups of visitFunctionDefinition done with the generated
+accessors (one scan of the children per accessor) vs one _ChildIndex scan per context.
+
+    python benchmarks/bench_modifiers.py [n ...]
+"""
+import random
+import sys
+
+from bench_statements import calls
+from common import best_of, parse_tree
+
+from solidity_parser.astbuilder import AstVisitor, SolidityParser, _ChildIndex
+
+VISIBILITY = ["public", "external", "internal", "private"]
+MUTABILITY = ["", "view", "pure", "payable"]
+MODIFIERS = ["onlyOwner", "nonReentrant", "whenNotPaused", "initializer", "onlyRole(ADMIN)", "validAddress(a)"]
+
+
+def source(n):
+    rng = random.Random(n)
+    members = []
+    for i in range(n):
+        members.append("  uint256 %s constant c%d = %d;" % (rng.choice(["public", "internal", "private"]), i, i))
+        members.append("  function f%d(uint a, address b) %s %s virtual override(A, B) %s returns (uint) { }" % (
+            i, rng.choice(VISIBILITY), rng.choice(MUTABILITY), " ".join(rng.sample(MODIFIERS, rng.randint(3, 6)))))
+    return "contract M is A, B {\n%s\n}\n" % "\n".join(members)
+
+
+def functions(tree):
+    found = []
+    stack = [tree]
+    while stack:
+        ctx = stack.pop()
+        if isinstance(ctx, SolidityParser.FunctionDefinitionContext):
+            found.append(ctx)
+        stack.extend(getattr(ctx, "children", None) or ())
+    return found
+
+
+def accessors(ctx):
+    """
+    the lookups of visitFunctionDefinition (without the visits) through the generated accessors
+    """
+    fd = ctx.functionDescriptor()
+    if fd.ConstructorKeyword():
+        fd.ConstructorKeyword()
+    elif fd.FallbackKeyword():
+        fd.FallbackKeyword()
+    elif fd.ReceiveKeyword():
+        fd.ReceiveKeyword()
+    elif fd.identifier():
+        fd.identifier()
+    ctx.parameterList()
+    ctx.returnParameters() and ctx.returnParameters()
+    ctx.block() and ctx.block()
+    modifiers = ctx.modifierList().modifierInvocation()
+    (ctx.modifierList().ExternalKeyword(0) or ctx.modifierList().InternalKeyword(0)
+     or ctx.modifierList().PublicKeyword(0) or ctx.modifierList().PrivateKeyword(0))
+    ctx.modifierList().stateMutability(0) and ctx.modifierList().stateMutability(0)
+    return modifiers
+
+
+def child_index(ctx):
+    """
+    the same lookups through _ChildIndex, as visitFunctionDefinition does them
+    """
+    children = _ChildIndex(ctx)
+    fd = _ChildIndex(children.rule(SolidityParser.RULE_functionDescriptor))
+    if fd.token(SolidityParser.ConstructorKeyword):
+        fd.token(SolidityParser.ConstructorKeyword)
+    elif fd.token(SolidityParser.FallbackKeyword):
+        fd.token(SolidityParser.FallbackKeyword)
+    elif fd.token(SolidityParser.ReceiveKeyword):
+        fd.token(SolidityParser.ReceiveKeyword)
+    elif fd.rule(SolidityParser.RULE_identifier):
+        fd.rule(SolidityParser.RULE_identifier)
+    children.rule(SolidityParser.RULE_parameterList)
+    children.rule(SolidityParser.RULE_returnParameters)
+    children.rule(SolidityParser.RULE_block)
+    modifier_list = _ChildIndex(children.rule(SolidityParser.RULE_modifierList))
+    modifiers = modifier_list.all(SolidityParser.RULE_modifierInvocation)
+    (modifier_list.token(SolidityParser.ExternalKeyword) or modifier_list.token(SolidityParser.InternalKeyword)
+     or modifier_list.token(SolidityParser.PublicKeyword) or modifier_list.token(SolidityParser.PrivateKeyword))
+    modifier_list.rule(SolidityParser.RULE_stateMutability) and modifier_list.rule(SolidityParser.RULE_stateMutability)
+    return modifiers
+
+
+def main(sizes):
+    print("%6s %10s %10s %14s %14s %14s" % ("n", "calls", "visit", "per function", "accessors", "_ChildIndex"))
+    for n in sizes:
+        tree = parse_tree(source(n))
+        contexts = functions(tree)
+        assert all(accessors(ctx) == child_index(ctx) for ctx in contexts)
+        seconds = best_of(lambda: AstVisitor().visit(tree))
+        checks = [best_of(lambda: [check(ctx) for ctx in contexts]) / n * 1e6 for check in (accessors, child_index)]
+        print("%6d %10d %9.3fs %11.2f us %11.2f us %11.2f us" % (
+            n, calls(lambda: AstVisitor().visit(tree)), seconds, seconds / n * 1e6, checks[0], checks[1]))
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [200, 1000, 2000])
@@ -0,0 +1,95 @@
+"""
+memory and field access speed of dict nodes (Node) vs compact slot nodes (parse(..., nodes="slots"))
+
+    python benchmarks/bench_nodes.py [file.sol|directory ...]
+
+Memory: bytes per node retained by the parsed asts (tracemalloc, includes the loc dicts and field
+values) and the shallow sys.getsizeof() of the node objects alone. Access: ns per read of a data
+field, as attribute and as item, over the nodes that have the field. The "type" of a SlotNode is a
+class attribute, so reading it does not measure the slot access.
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from common import source_files
+
+from solidity_parser import parser
+
+FIELDS = ("name", "body", "expression")
+
+
+def _nodes(ast):
+    """
+    :return: all nodes of ast
+    """
+    nodes = []
+    stack = [ast]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, (parser.Node, parser.SlotNode)):
+            nodes.append(value)
+            stack.extend(v for k, v in value.items() if k != "loc")
+    return nodes
+
+
+def _per_read(nodes, read):
+    """
+    :return: best ns per read(node) over nodes
+    """
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for node in nodes:
+            read(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(nodes) * 1e9
+
+
+def main(paths):
+    sources = []
+    for path in source_files(paths):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        try:
+            parser.parse(text, loc=True)
+        except Exception as e:
+            print("skipping %s: %s" % (path, e), file=sys.stderr)
+            continue
+        sources.append(text)
+
+    reads = {
+        "name": (lambda n: n.name, lambda n: n["name"]),
+        "body": (lambda n: n.body, lambda n: n["body"]),
+        "expression": (lambda n: n.expression, lambda n: n["expression"]),
+    }
+    header = "%-6s %8s %11s %11s" % ("nodes", "count", "bytes/node", "getsizeof")
+    for field in FIELDS:
+        header += " %13s %13s" % ("." + field, '["%s"]' % field)
+    print(header)
+    for representation in ("dict", "slots"):
+        gc.collect()
+        tracemalloc.start()
+        asts = [parser.parse(text, loc=True, nodes=representation) for text in sources]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        nodes = [node for ast in asts for node in _nodes(ast)]
+        shallow = sum(sys.getsizeof(node) for node in nodes)
+        row = "%-6s %8d %11d %11d" % (representation, len(nodes), retained / len(nodes), shallow / len(nodes))
+        for field in FIELDS:
+            having = [node for node in nodes if field in node]
+            if not having:
+                row += " %13s %13s" % ("-", "-")
+                continue
+            row += " %10.0f ns %10.0f ns" % tuple(_per_read(having, read) for read in reads[field])
+        print(row)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,37 @@
+"""
+cost of objectify() relative to parse() for each file (warm prediction caches)
+
+    python benchmarks/bench_objectify.py [file.sol|directory ...]
+"""
+import os
+import sys
+
+from common import best_of, source_files
+
+from solidity_parser import parser
+
+
+def main(paths):
+    print("%-40s %8s %10s %10s %7s" % ("file", "size", "parse", "objectify", "ratio"))
+    total_parse = total_objectify = 0
+    for path in source_files(paths):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        try:
+            ast = parser.parse(text)
+        except Exception as e:
+            print("skipping %s: %s" % (path, e), file=sys.stderr)
+            continue
+        parse = best_of(lambda: parser.parse(text))
+        objectify = best_of(lambda: parser.objectify(ast))
+        total_parse += parse
+        total_objectify += objectify
+        print("%-40s %7.1fk %9.3fs %9.3fs %6.1f%%" % (os.path.basename(path)[:40], len(text) / 1000.0,
+                                                     parse, objectify, 100.0 * objectify / parse))
+    if total_parse:
+        print("%-40s %8s %9.3fs %9.3fs %6.1f%%" % ("total", "", total_parse, total_objectify,
+                                                  100.0 * total_objectify / total_parse))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
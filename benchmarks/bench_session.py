@@ -0,0 +1,41 @@
+"""
+per call overhead of parsing tiny inputs: a reused ParserSession (what parse() does) vs a fresh
+session per call, which builds new lexer, token stream and parser instances every time
+
+    python benchmarks/bench_session.py [iterations]
+"""
+import sys
+import timeit
+
+from common import ROOT  # noqa: F401 (sys.path)
+
+from solidity_parser import parser
+
+SNIPPETS = [
+    ("a", "expression"),
+    ("a + b * c", "expression"),
+    ("uint x;", "stateVariableDeclaration"),
+    ("pragma solidity ^0.8.0;", "pragmaDirective"),
+    ("x = 1;", "statement"),
+]
+
+
+def per_call(fn, iterations):
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations
+
+
+def main(iterations):
+    session = parser.ParserSession()
+    for text, start in SNIPPETS:
+        session.parse(text, start=start)  # warm the prediction caches
+
+    print("%-26s %-26s %10s %10s %10s" % ("input", "start", "session", "fresh", "saved"))
+    for text, start in SNIPPETS:
+        reused = per_call(lambda: session.parse(text, start=start), iterations)
+        fresh = per_call(lambda: parser.ParserSession().parse(text, start=start), iterations)
+        print("%-26s %-26s %8.1fus %8.1fus %8.1fus" % (repr(text), start, reused * 1e6, fresh * 1e6,
+                                                      (fresh - reused) * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,60 @@
+"""
+AstVisitor on statement-heavy code (n functions of 20 statements each): python calls made while
+visiting the prebuilt parse tree (exact, unlike the cpu time) and the time per statement. Most of
+the calls are visit() dispatch and the pass-through statement rules.
+
+    python benchmarks/bench_statements.py [n ...]
+"""
+import sys
+
+from common import best_of, parse_tree
+
+from solidity_parser.astbuilder import AstVisitor
+
+STATEMENTS = [
+    "if (a > {i}) {{ b = b - 1; }} else {{ b += 2; }}",
+    "require(b != {i}, \"no\");",
+    "x = a + {i};",
+    "for (uint i = 0; i < a; i++) {{ m[i] = b; }}",
+    "uint v{i} = m[a];",
+]
+
+
+def source(n):
+    functions = []
+    for f in range(n):
+        body = "\n".join("    " + STATEMENTS[(f + i) % len(STATEMENTS)].format(i=i) for i in range(19))
+        functions.append("  function f%d(uint a, uint b) public returns (uint) {\n%s\n    return b;\n  }" % (f, body))
+    return "contract S {\n  uint x; mapping(uint => uint) m;\n%s\n}\n" % "\n".join(functions)
+
+
+def calls(fn):
+    """
+    :return: number of python function calls made by fn()
+    """
+    count = [0]
+
+    def profile(frame, event, arg):
+        if event == "call":
+            count[0] += 1
+
+    sys.setprofile(profile)
+    try:
+        fn()
+    finally:
+        sys.setprofile(None)
+    return count[0]
+
+
+def main(sizes):
+    print("%6s %10s %10s %10s %16s" % ("n", "statements", "calls", "visit", "per statement"))
+    for n in sizes:
+        tree = parse_tree(source(n))
+        statements = 20 * n
+        seconds = best_of(lambda: AstVisitor().visit(tree))
+        print("%6d %10d %10d %9.3fs %13.2f us" % (n, statements, calls(lambda: AstVisitor().visit(tree)), seconds,
+                                                 seconds / statements * 1e6))
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [50, 150, 500])
@@ -0,0 +1,60 @@
+"""
+helpers of the benchmark scripts in this directory. Run the scripts from anywhere, they import
+solidity_parser from this checkout, e.g.
+
+    python benchmarks/bench_expressions.py
+"""
+import gc
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.setrecursionlimit(100000)
+
+
+def best_of(fn, repeat=5):
+    """
+    :return: lowest cpu time (seconds) of repeat calls of fn, with the garbage collector off while timing
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.process_time()
+            fn()
+            elapsed = time.process_time() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def source_files(paths=None):
+    """
+    :param paths: .sol files or directories (searched recursively), samples/ if empty
+    :return: sorted list of .sol files
+    """
+    files = []
+    for path in paths or [os.path.join(ROOT, "samples")]:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "**", "*.sol"), recursive=True))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def parse_tree(text, start="sourceUnit"):
+    """
+    :return: ANTLR parse tree of text built by the generated parser alone (full LL, no fast paths),
+             e.g. to time AstVisitor on it
+    """
+    from antlr4 import CommonTokenStream, InputStream
+    from solidity_parser import grammar
+
+    SolidityLexer, SolidityParser = grammar.load()
+    parser = SolidityParser(CommonTokenStream(SolidityLexer(InputStream(text))))
+    return getattr(parser, start)()
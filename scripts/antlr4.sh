@@ -9,3 +9,6 @@ rm -rf src/solidity-antlr4
 
 touch solidity_parser/solidity_antlr4/__init__.py
 touch solidity_parser/solidity_antlr4/__AUTOGENERATED__
+
+# prebuilt ATNs for faster loading (optional, ignored once stale)
+python3 -m solidity_parser.grammar
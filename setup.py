@@ -25,6 +25,7 @@ setup(
     name=name,
     version=version,
     packages=find_packages(),
+    package_data={"solidity_parser.solidity_antlr4": ["SolidityATN.pickle"]},  # optional, see scripts/antlr4.sh
     author="tintinweb",
     author_email="tintinweb@oststrom.com",
     description=(
@@ -1,3 +1,3 @@
-from .parser import parse_file, parse, objectify, visit
+from .parser import parse_file, parse, parse_files, objectify, visit
 
-__ALL__ = ["parse", "parse_file", "objectify", "visit"]
+__ALL__ = ["parse", "parse_file", "parse_files", "objectify", "visit"]
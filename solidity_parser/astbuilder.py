@@ -0,0 +1,1800 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+# derived from https://github.com/federicobond/solidity-parser-antlr/
+#
+"""
+Builds the AST from the ANTLR parse tree.
+
+Everything here needs the antlr runtime and the generated grammar. parser.py imports this
+module on first use only (see grammar.load()), so importing solidity_parser stays cheap.
+"""
+
+from solidity_parser import grammar
+
+grammar.load()
+
+from antlr4 import *
+from antlr4.atn.Transition import RuleTransition
+from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.tree.Tree import TerminalNodeImpl
+from solidity_parser.solidity_antlr4.SolidityParser import SolidityParser
+from solidity_parser.solidity_antlr4.SolidityVisitor import SolidityVisitor
+from solidity_parser import dfacache
+from solidity_parser.charstream import BufferStream, CodePointStream
+from solidity_parser.lexer import LEXERS
+from solidity_parser.parser import NODE_FIELDS, _node_factory, _TokenPositions, _Utf8Offsets
+
+
+# token type of each literal token of the grammar, e.g. _TOKEN_TYPES[','] == SolidityParser.T__15
+_TOKEN_TYPES = dict((name[1:-1], ttype) for ttype, name in enumerate(SolidityParser.literalNames)
+                    if name.startswith("'"))
+
+_UNARY_PREFIX_OPERATORS = ('+', '-', '++', '--', '!', '~', 'after', 'delete')
+_UNARY_POSTFIX_OPERATORS = ('++', '--')
+_BINARY_OPERATORS = ('+', '-', '*', '/', '**', '%', '<<', '>>', '&&', '||', '&', '|', '^',
+                     '<', '>', '<=', '>=', '==', '!=',
+                     '=', '|=', '^=', '&=', '<<=', '>>=', '+=', '-=', '*=', '/=', '%=')
+
+
+def _token_types(*literals):
+    return frozenset(_TOKEN_TYPES[literal] for literal in literals)
+
+
+_UNARY_PREFIX_TYPES = _token_types(*_UNARY_PREFIX_OPERATORS)
+_UNARY_POSTFIX_TYPES = _token_types(*_UNARY_POSTFIX_OPERATORS)
+_BINARY_TYPES = _token_types(*_BINARY_OPERATORS)
+
+
+def _token_type(tree):
+    """
+    token type of a terminal parse tree node, None for rule contexts.
+
+    Checking punctuation by token type avoids getText() which rebuilds the text of
+    a whole subtree when called on a rule context.
+    """
+    return tree.symbol.type if isinstance(tree, TerminalNode) else None
+
+
+class _ChildIndex(object):
+    """
+    children of a rule context bucketed by token type and by rule in a single scan.
+
+    The generated accessors (e.g. ctx.PublicKeyword(0), ctx.stateMutability(0)) scan the children
+    on every call, which adds up for contexts with many children and many keyword checks.
+    """
+
+    __slots__ = ('tokens', 'rules')
+
+    def __init__(self, ctx):
+        tokens = self.tokens = {}
+        rules = self.rules = {}
+        for child in ctx.children or ():
+            if isinstance(child, TerminalNode):
+                key, bucket = child.symbol.type, tokens
+            else:
+                key, bucket = child.getRuleIndex(), rules
+            children = bucket.get(key)
+            if children is None:
+                bucket[key] = [child]
+            else:
+                children.append(child)
+
+    def token(self, ttype):
+        """
+        :return: first child token of the token type, None if there is none
+        """
+        children = self.tokens.get(ttype)
+        return children[0] if children else None
+
+    def rule(self, rule):
+        """
+        :return: first child context of the rule (by rule index), None if there is none
+        """
+        children = self.rules.get(rule)
+        return children[0] if children else None
+
+    def all(self, rule):
+        """
+        :return: list of the child contexts of the rule (by rule index)
+        """
+        return self.rules.get(rule, [])
+
+
+# ast node types created by the visit method of each rule itself, not by the rules it visits.
+# Rules without a visit method create none. Keep in sync with the visit methods below.
+_RULE_NODE_TYPES = {
+    'sourceUnit': ('SourceUnit',),
+    'pragmaDirective': ('PragmaDirective',),
+    'importDirective': ('ImportDirective',),
+    'contractDefinition': ('ContractDefinition',),
+    'inheritanceSpecifier': ('InheritanceSpecifier',),
+    'stateVariableDeclaration': ('StateVariableDeclaration', 'VariableDeclaration'),
+    'fileLevelConstant': ('FileLevelConstant',),
+    'customErrorDefinition': ('CustomErrorDefinition',),
+    'typeDefinition': ('TypeDefinition',),
+    'usingForDeclaration': ('UsingForDeclaration',),
+    'structDefinition': ('StructDefinition',),
+    'modifierDefinition': ('ModifierDefinition',),
+    'modifierInvocation': ('ModifierInvocation',),
+    'functionDefinition': ('FunctionDefinition',),
+    'eventDefinition': ('EventDefinition',),
+    'enumValue': ('EnumValue',),
+    'enumDefinition': ('EnumDefinition',),
+    'parameterList': ('ParameterList',),
+    'parameter': ('Parameter',),
+    'eventParameterList': ('ParameterList', 'VariableDeclaration'),
+    'eventParameter': ('VariableDeclaration',),
+    'functionTypeParameter': ('VariableDeclaration',),
+    'variableDeclaration': ('VariableDeclaration',),
+    'typeName': ('ArrayTypeName', 'ElementaryTypeName'),
+    'userDefinedTypeName': ('UserDefinedTypeName',),
+    'mapping': ('Mapping',),
+    'functionTypeName': ('FunctionTypeName',),
+    'block': ('Block', 'SkippedBlock'),
+    'expressionStatement': ('ExpressionStatement',),
+    'ifStatement': ('IfStatement',),
+    'tryStatement': ('TryStatement',),
+    'catchClause': ('CatchClause',),
+    'whileStatement': ('WhileStatement',),
+    'uncheckedStatement': ('UncheckedStatement',),
+    'forStatement': ('ForStatement', 'ExpressionStatement'),
+    'inlineAssemblyStatement': ('InLineAssemblyStatement',),
+    'doWhileStatement': ('DoWhileStatement',),
+    'throwStatement': ('ThrowStatement',),
+    'emitStatement': ('EmitStatement',),
+    'revertStatement': ('RevertStatement',),
+    'variableDeclarationStatement': ('VariableDeclarationStatement',),
+    'variableDeclarationList': ('VariableDeclaration',),
+    'identifierList': ('VariableDeclaration',),
+    'elementaryTypeName': ('ElementaryTypeName',),
+    'expression': ('NewExpression', 'UnaryOperation', 'TupleExpression', 'MemberAccess', 'BinaryOperation',
+                   'FunctionCall', 'IndexAccess', 'Conditional'),
+    'primaryExpression': ('BooleanLiteral', 'hexLiteral', 'stringLiteral', 'ArrayTypeName', 'UserDefinedTypeName',
+                          'ElementaryTypeName'),
+    'functionCall': ('FunctionCall',),
+    'assemblyBlock': ('AssemblyBlock',),
+    'assemblyItem': ('HexLiteral', 'StringLiteral', 'Break', 'Continue'),
+    'assemblyMember': ('AssemblyMember',),
+    'assemblyCall': ('AssemblyExpression',),
+    'assemblyLocalDefinition': ('AssemblyLocalDefinition',),
+    'assemblyAssignment': ('AssemblyAssignment',),
+    'assemblyStackAssignment': ('AssemblyStackAssignment',),
+    'labelDefinition': ('LabelDefinition',),
+    'assemblySwitch': ('AssemblySwitch',),
+    'assemblyCase': ('AssemblyCase',),
+    'assemblyFunctionDefinition': ('AssemblyFunctionDefinition',),
+    'assemblyFor': ('AssemblyFor',),
+    'assemblyIf': ('AssemblyIf',),
+    'assemblyLiteral': ('StringLiteral', 'DecimalNumber', 'HexNumber', 'HexLiteral'),
+    'tupleExpression': ('TupleExpression',),
+    'numberLiteral': ('NumberLiteral',),
+    'identifier': ('Identifier',),
+}
+
+_reachable_types = None
+
+
+def _rule_reachable_types():
+    """
+    :return: list of the ast node types that can be created within the subtree of each rule (by rule index),
+             built once by closing _RULE_NODE_TYPES over the rule references of the ATN
+    """
+    global _reachable_types
+    if _reachable_types is None:
+        calls = [set() for _ in SolidityParser.ruleNames]
+        for state in SolidityParser.atn.states:
+            for transition in state.transitions:
+                if isinstance(transition, RuleTransition):
+                    calls[state.ruleIndex].add(transition.target.ruleIndex)
+
+        reachable = [set(_RULE_NODE_TYPES.get(name, ())) for name in SolidityParser.ruleNames]
+        changed = True
+        while changed:
+            changed = False
+            for rule, callees in enumerate(calls):
+                for callee in callees:
+                    if not reachable[callee] <= reachable[rule]:
+                        reachable[rule] |= reachable[callee]
+                        changed = True
+        _reachable_types = [frozenset(types) for types in reachable]
+    return _reachable_types
+
+
+def _kept_rules(keep):
+    """
+    :param keep: ast node types to keep (see parse())
+    :return: set of the rule indexes whose subtrees can contain a node of one of these types
+    """
+    unknown = set(keep).difference(NODE_FIELDS)
+    if unknown:
+        raise Exception("unknown node type(s) in keep: %s" % ", ".join(sorted(unknown)))
+    rules = set(rule for rule, types in enumerate(_rule_reachable_types()) if not types.isdisjoint(keep))
+    if SolidityParser.RULE_assemblyCase in rules:
+        # visitAssemblyCase() tells cases from the default case by their value
+        rules.add(SolidityParser.RULE_assemblyLiteral)
+    return frozenset(rules)
+
+
+class AstVisitor(SolidityVisitor):
+
+    def __init__(self, contexts=None, nodes="dict", lazyBodies=None, keep=None, loc=False):
+        """
+        :param contexts: optional side table (dict) that receives id(node) -> parse tree context
+                         for every node created. Nodes never reference parse tree objects themselves.
+        :param nodes: node representation, "dict" (Node) or "slots" (compact SlotNode classes)
+        :param lazyBodies: optional parser._LazySource, skipped bodies become its LazyBody objects
+                           instead of SkippedBlock nodes
+        :param keep: optional set of ast node types. Rule contexts whose subtrees cannot contain any of
+                     them are not visited, they become None. Expressions are visited as a whole.
+        :param loc: add location information to ast nodes: True, or the parser._TokenPositions the
+                    SourceLocation objects of loc="lazy" refer to
+        """
+        super().__init__()
+        self.contexts = contexts
+        self.lazyBodies = lazyBodies
+        self._nodeFactory = _node_factory(nodes, loc)
+        self._dispatch = _dispatch_table(type(self), None if keep is None else _kept_rules(keep))
+
+    def _mapCommasToNulls(self, children):
+        if not children or len(children) == 0:
+            return []
+
+        values = []
+        comma = True
+
+        comma_type = _TOKEN_TYPES[',']
+
+        for el in children:
+            if comma:
+                if _token_type(el) == comma_type:
+                    values.append(None)
+                else:
+                    values.append(el)
+                    comma = False
+            else:
+                if _token_type(el) != comma_type:
+                    raise Exception('expected comma')
+
+                comma = True
+
+        if comma:
+            values.append(None)
+
+        return values
+
+    def _createNode(self, ctx, **kwargs):
+        node = self._nodeFactory(ctx=ctx, **kwargs)
+        if self.contexts is not None:
+            self.contexts[id(node)] = ctx
+        return node
+
+    def _bindContext(self, node, ctx):
+        """
+        record a more specific parse tree context for node in the contexts side table
+        """
+        if self.contexts is not None:
+            self.contexts[id(node)] = ctx
+
+    def visit(self, tree):
+        """
+        visit a parse tree, a list of parse trees (returns the list of their results) or None
+
+        Dispatches on the class of tree through a table (see _dispatch_table()) instead of accept()
+        and skips the contexts of pass-through rules like statement instead of visiting them.
+
+        :param tree:
+        :return:
+        """
+        dispatch = self._dispatch
+        method = dispatch.get(tree.__class__, _accept)
+        while method is _visit_first_child:
+            tree = tree.children[0]
+            method = dispatch.get(tree.__class__, _accept)
+        return method(self, tree)
+
+    def visitChildren(self, node):
+        """
+        visit of rules without a visit method
+
+        :return: result of the last child
+        """
+        visit = self.visit
+        result = None
+        for c in node.getChildren():
+            result = visit(c)
+        return result
+
+    def _visit_nodes(self, nodes):
+        """
+        :return: list of the results of visiting nodes
+        """
+        visit = self.visit
+        return [visit(c) for c in nodes]
+
+    # ********************************************************
+
+    def visitSourceUnit(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="SourceUnit",
+                                children=self.visit(ctx.children[:-1]))  # skip EOF
+
+    def visitEnumDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="EnumDefinition",
+                                name=ctx.identifier().getText(),
+                                members=self.visit(ctx.enumValue()))
+
+    def visitEnumValue(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="EnumValue",
+                                name=ctx.identifier().getText())
+
+    def visitTypeDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="TypeDefinition",
+                                typeKeyword=ctx.TypeKeyword().getText(),
+                                elementaryTypeName=self.visit(ctx.elementaryTypeName()))
+
+
+    def visitCustomErrorDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="CustomErrorDefinition",
+                                name=self.visit(ctx.identifier()),
+                                parameterList=self.visit(ctx.parameterList()))
+
+    def visitFileLevelConstant(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="FileLevelConstant",
+                                name=self.visit(ctx.identifier()),
+                                typeName=self.visit(ctx.typeName()),
+                                ConstantKeyword=self.visit(ctx.ConstantKeyword()))
+
+
+    def visitUsingForDeclaration(self, ctx: SolidityParser.UsingForDeclarationContext):
+        typename = None
+        if ctx.getChild(3) != '*':
+            typename = self.visit(ctx.getChild(3))
+
+        return self._createNode(ctx=ctx,
+                                type="UsingForDeclaration",
+                                typeName=typename,
+                                libraryName=ctx.identifier().getText())
+
+    def visitInheritanceSpecifier(self, ctx: SolidityParser.InheritanceSpecifierContext):
+        return self._createNode(ctx=ctx,
+                                type="InheritanceSpecifier",
+                                baseName=self.visit(ctx.userDefinedTypeName()),
+                                arguments=self.visit(ctx.expressionList()))
+
+    def visitContractPart(self, ctx: SolidityParser.ContractPartContext):
+        return self.visit(ctx.children[0])
+
+
+    def visitFunctionDefinition(self, ctx: SolidityParser.FunctionDefinitionContext):
+        isConstructor = isFallback =isReceive = False
+        children = _ChildIndex(ctx)
+
+        fd = _ChildIndex(children.rule(SolidityParser.RULE_functionDescriptor))
+        if fd.token(SolidityParser.ConstructorKeyword):
+            name = fd.token(SolidityParser.ConstructorKeyword).getText()
+            isConstructor = True
+        elif fd.token(SolidityParser.FallbackKeyword):
+            name = fd.token(SolidityParser.FallbackKeyword).getText()
+            isFallback = True
+        elif fd.token(SolidityParser.ReceiveKeyword):
+            name = fd.token(SolidityParser.ReceiveKeyword).getText()
+            isReceive = True
+        elif fd.rule(SolidityParser.RULE_identifier):
+            name = fd.rule(SolidityParser.RULE_identifier).getText()
+        else:
+            name = ctx.getText()
+
+        parameters = self.visit(children.rule(SolidityParser.RULE_parameterList))
+        returnParameters = children.rule(SolidityParser.RULE_returnParameters)
+        returnParameters = self.visit(returnParameters) if returnParameters else []
+        block = children.rule(SolidityParser.RULE_block)
+        block = self.visit(block) if block else []
+
+        modifierList = _ChildIndex(children.rule(SolidityParser.RULE_modifierList))
+        modifiers = [self.visit(i) for i in modifierList.all(SolidityParser.RULE_modifierInvocation)]
+
+        if modifierList.token(SolidityParser.ExternalKeyword):
+            visibility = "external"
+        elif modifierList.token(SolidityParser.InternalKeyword):
+            visibility = "internal"
+        elif modifierList.token(SolidityParser.PublicKeyword):
+            visibility = "public"
+        elif modifierList.token(SolidityParser.PrivateKeyword):
+            visibility = "private"
+        else:
+            visibility = 'default'
+
+        if modifierList.rule(SolidityParser.RULE_stateMutability):
+            stateMutability = modifierList.rule(SolidityParser.RULE_stateMutability).getText()
+        else:
+            stateMutability = None
+
+        return self._createNode(ctx=ctx,
+                                type="FunctionDefinition",
+                                name=name,
+                                parameters=parameters,
+                                returnParameters=returnParameters,
+                                body=block,
+                                visibility=visibility,
+                                modifiers=modifiers,
+                                isConstructor=isConstructor,
+                                isFallback=isFallback,
+                                isReceive=isReceive,
+                                stateMutability=stateMutability)
+
+    def visitReturnParameters(self, ctx: SolidityParser.ReturnParametersContext):
+        return self.visit(ctx.parameterList())
+
+    def visitParameterList(self, ctx: SolidityParser.ParameterListContext):
+        parameters = [self.visit(p) for p in ctx.parameter()]
+        return self._createNode(ctx=ctx,
+                                type="ParameterList",
+                                parameters=parameters)
+
+    def visitParameter(self, ctx: SolidityParser.ParameterContext):
+
+        storageLocation = ctx.storageLocation().getText() if ctx.storageLocation() else None
+        name = ctx.identifier().getText() if ctx.identifier() else None
+
+        return self._createNode(ctx=ctx,
+                                type="Parameter",
+                                typeName=self.visit(ctx.typeName()),
+                                name=name,
+                                storageLocation=storageLocation,
+                                isStateVar=False,
+                                isIndexed=False
+                                )
+
+    def visitModifierInvocation(self, ctx):
+        exprList = ctx.expressionList()
+
+        if exprList is not None:
+            args = self.visit(exprList.expression())
+        else:
+            args = []
+
+        return self._createNode(ctx=ctx,
+                                type='ModifierInvocation',
+                                name=ctx.identifier().getText(),
+                                arguments=args)
+
+    def visitElementaryTypeNameExpression(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='ElementaryTypeNameExpression',
+                                typeName=self.visit(ctx.elementaryTypeName()))
+
+    def visitTypeName(self, ctx):
+        if len(ctx.children) > 2:
+            length = None
+            if len(ctx.children) == 4:
+                length = self.visit(ctx.getChild(2))
+
+            return self._createNode(ctx=ctx,
+                                    type='ArrayTypeName',
+                                    baseTypeName=self.visit(ctx.getChild(0)),
+                                    length=length)
+
+        if len(ctx.children) == 2:
+            # 'address' 'payable'
+            return self._createNode(ctx=ctx,
+                                    type='ElementaryTypeName',
+                                    name=ctx.getChild(0).symbol.text,
+                                    stateMutability=ctx.getChild(1).symbol.text)
+
+        return self.visit(ctx.getChild(0))
+
+    def visitFunctionTypeName(self, ctx):
+        children = _ChildIndex(ctx)
+        parameterLists = children.all(SolidityParser.RULE_functionTypeParameterList)
+        parameterTypes = [self.visit(p) for p in children.rule(SolidityParser.RULE_functionTypeParameterList).functionTypeParameter()]
+        returnTypes = []
+
+        if len(parameterLists) > 1:
+            returnTypes = [self.visit(p) for p in parameterLists[1].functionTypeParameter()]
+
+        visibility = 'default'
+        if children.token(SolidityParser.InternalKeyword):
+            visibility = 'internal'
+        elif children.token(SolidityParser.ExternalKeyword):
+            visibility = 'external'
+
+        stateMutability = None
+        if children.rule(SolidityParser.RULE_stateMutability):
+            stateMutability = children.rule(SolidityParser.RULE_stateMutability).getText()
+
+        return self._createNode(ctx=ctx,
+                                type='FunctionTypeName',
+                                parameterTypes=parameterTypes,
+                                returnTypes=returnTypes,
+                                visibility=visibility,
+                                stateMutability=stateMutability)
+
+    def visitFunctionCall(self, ctx):
+        args = []
+        names = []
+
+        ctxArgs = ctx.functionCallArguments()
+
+        if ctxArgs.expressionList():
+            args = [self.visit(a) for a in ctxArgs.expressionList().expression()]
+
+        elif ctxArgs.nameValueList():
+            for nameValue in ctxArgs.nameValueList().nameValue():
+                args.append(self.visit(nameValue.expression()))
+                names.append(nameValue.identifier().getText())
+
+        return self._createNode(ctx=ctx,
+                                type='FunctionCall',
+                                expression=self.visit(ctx.expression()),
+                                arguments=args,
+                                names=names)
+
+    def visitEmitStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='EmitStatement',
+                                eventCall=self.visit(ctx.getChild(1)))
+
+    def visitThrowStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='ThrowStatement')
+
+    def visitStructDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='StructDefinition',
+                                name=ctx.identifier().getText(),
+                                members=self.visit(ctx.variableDeclaration()))
+
+    def visitVariableDeclaration(self, ctx):
+        storageLocation = None
+
+        if ctx.storageLocation():
+            storageLocation = ctx.storageLocation().getText()
+
+        return self._createNode(ctx=ctx,
+                                type='VariableDeclaration',
+                                typeName=self.visit(ctx.typeName()),
+                                name=ctx.identifier().getText(),
+                                storageLocation=storageLocation)
+
+    def visitEventParameter(self, ctx):
+        storageLocation = None
+
+        # TODO: fixme
+
+        # if (ctx.storageLocation(0)):
+        #    storageLocation = ctx.storageLocation(0).getText()
+
+        return self._createNode(ctx=ctx,
+                                type='VariableDeclaration',
+                                typeName=self.visit(ctx.typeName()),
+                                name=ctx.identifier().getText(),
+                                storageLocation=storageLocation,
+                                isStateVar=False,
+                                isIndexed=not not ctx.IndexedKeyword())
+
+    def visitFunctionTypeParameter(self, ctx):
+        storageLocation = None
+
+        if ctx.storageLocation():
+            storageLocation = ctx.storageLocation().getText()
+
+        return self._createNode(ctx=ctx,
+                                type='VariableDeclaration',
+                                typeName=self.visit(ctx.typeName()),
+                                name=None,
+                                storageLocation=storageLocation,
+                                isStateVar=False,
+                                isIndexed=False)
+
+    def visitWhileStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='WhileStatement',
+                                condition=self.visit(ctx.expression()),
+                                body=self.visit(ctx.statement()))
+
+    def visitDoWhileStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='DoWhileStatement',
+                                condition=self.visit(ctx.expression()),
+                                body=self.visit(ctx.statement()))
+
+    def visitIfStatement(self, ctx):
+
+        TrueBody = self.visit(ctx.statement(0))
+
+        FalseBody = None
+        if len(ctx.statement()) > 1:
+            FalseBody = self.visit(ctx.statement(1))
+
+        return self._createNode(ctx=ctx,
+                                type='IfStatement',
+                                condition=self.visit(ctx.expression()),
+                                TrueBody=TrueBody,
+                                FalseBody=FalseBody)
+
+    def visitTryStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='TryStatement',
+                                expression=self.visit(ctx.expression()),
+                                block=self.visit(ctx.block()),
+                                returnParameters=self.visit(ctx.returnParameters()),
+                                catchClause=self.visit(ctx.catchClause()))
+
+    def visitCatchClause(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='CatchClause',
+                                identifier=self.visit(ctx.identifier()),
+                                parameterList=self.visit(ctx.parameterList()),
+                                block=self.visit(ctx.block()))
+
+    def visitUserDefinedTypeName(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='UserDefinedTypeName',
+                                namePath=ctx.getText())
+
+    def visitElementaryTypeName(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='ElementaryTypeName',
+                                name=ctx.getText())
+
+    def visitBlock(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='Block',
+                                statements=self.visit(ctx.statement()))
+
+    def visitSkippedBlock(self, ctx):
+        if self.lazyBodies is not None:
+            return self.lazyBodies.body(ctx.start, ctx.stop)
+        return self._createNode(ctx=ctx,
+                                type='SkippedBlock',
+                                range=[ctx.start.start, ctx.stop.stop],
+                                tokenRange=[ctx.start.tokenIndex, ctx.stop.tokenIndex])
+
+    def visitExpressionStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='ExpressionStatement',
+                                expression=self.visit(ctx.expression()))
+
+    def visitNumberLiteral(self, ctx):
+        number = ctx.getChild(0).getText()
+        subdenomination = None
+
+        if len(ctx.children) == 2:
+            subdenomination = ctx.getChild(1).getText()
+
+        return self._createNode(ctx=ctx,
+                                type='NumberLiteral',
+                                number=number,
+                                subdenomination=subdenomination)
+
+    def visitMapping(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='Mapping',
+                                keyType=self.visit(ctx.mappingKey()),
+                                valueType=self.visit(ctx.typeName()))
+
+    def visitModifierDefinition(self, ctx):
+        parameters = []
+
+        if ctx.parameterList():
+            parameters = self.visit(ctx.parameterList())
+
+        return self._createNode(ctx=ctx,
+                                type='ModifierDefinition',
+                                name=ctx.identifier().getText(),
+                                parameters=parameters,
+                                body=self.visit(ctx.block()))
+
+    def visitStatement(self, ctx):
+        return self.visit(ctx.getChild(0))
+
+    def visitSimpleStatement(self, ctx):
+        return self.visit(ctx.getChild(0))
+
+    def visitUncheckedStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='UncheckedStatement',
+                                body=self.visit(ctx.block())) 
+
+    def visitRevertStatement(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='RevertStatement',
+                                functionCall=self.visit(ctx.functionCall()))
+
+    def visitExpression(self, ctx):
+
+        children = ctx.children
+        children_length = len(children)
+        if children_length == 1:
+            return self.visit(children[0])
+
+        elif children_length == 2:
+            op_type = _token_type(children[0])
+            if op_type == _TOKEN_TYPES['new']:
+                return self._createNode(ctx=ctx,
+                                        type='NewExpression',
+                                        typeName=self.visit(ctx.typeName()))
+
+            if op_type in _UNARY_PREFIX_TYPES:
+                return self._createNode(ctx=ctx,
+                                        type='UnaryOperation',
+                                        operator=children[0].symbol.text,
+                                        subExpression=self.visit(children[1]),
+                                        isPrefix=True)
+
+            if _token_type(children[1]) in _UNARY_POSTFIX_TYPES:
+                return self._createNode(ctx=ctx,
+                                        type='UnaryOperation',
+                                        operator=children[1].symbol.text,
+                                        subExpression=self.visit(children[0]),
+                                        isPrefix=False)
+        elif children_length == 3:
+            if _token_type(children[0]) == _TOKEN_TYPES['('] and _token_type(children[2]) == _TOKEN_TYPES[')']:
+                return self._createNode(ctx=ctx,
+                                        type='TupleExpression',
+                                        components=[self.visit(children[1])],
+                                        isArray=False)
+
+            op_type = _token_type(children[1])
+
+            if op_type == _TOKEN_TYPES[',']:
+                return self._createNode(ctx=ctx,
+                                        type='TupleExpression',
+                                        components=[
+                                            self.visit(children[0]),
+                                            self.visit(children[2])
+                                        ],
+                                        isArray=False)
+
+
+            elif op_type == _TOKEN_TYPES['.']:
+                expression = self.visit(children[0])
+                memberName = children[2].getText()
+                return self._createNode(ctx=ctx,
+                                        type='MemberAccess',
+                                        expression=expression,
+                                        memberName=memberName)
+
+            if op_type in _BINARY_TYPES:
+                return self._createNode(ctx=ctx,
+                                        type='BinaryOperation',
+                                        operator=children[1].symbol.text,
+                                        left=self.visit(children[0]),
+                                        right=self.visit(children[2]))
+
+        elif children_length == 4:
+
+            if _token_type(children[1]) == _TOKEN_TYPES['('] and _token_type(children[3]) == _TOKEN_TYPES[')']:
+                args = []
+                names = []
+
+                ctxArgs = ctx.functionCallArguments()
+                if ctxArgs.expressionList():
+                    args = [self.visit(a) for a in ctxArgs.expressionList().expression()]
+                elif ctxArgs.nameValueList():
+                    for nameValue in ctxArgs.nameValueList().nameValue():
+                        args.append(self.visit(nameValue.expression()))
+                        names.append(nameValue.identifier().getText())
+
+                return self._createNode(ctx=ctx,
+                                        type='FunctionCall',
+                                        expression=self.visit(children[0]),
+                                        arguments=args,
+                                        names=names)
+
+            if _token_type(children[1]) == _TOKEN_TYPES['['] and _token_type(children[3]) == _TOKEN_TYPES[']']:
+                return self._createNode(ctx=ctx,
+                                        type='IndexAccess',
+                                        base=self.visit(children[0]),
+                                        index=self.visit(children[2]))
+
+        elif children_length == 5:
+            # ternary
+            if _token_type(children[1]) == _TOKEN_TYPES['?'] and _token_type(children[3]) == _TOKEN_TYPES[':']:
+                return self._createNode(ctx=ctx,
+                                        type='Conditional',
+                                        condition=self.visit(children[0]),
+                                        TrueExpression=self.visit(children[2]),
+                                        FalseExpression=self.visit(children[4]))
+
+        return self.visit(list(ctx.getChildren()))
+
+
+    def visitStateVariableDeclaration(self, ctx):
+        children = _ChildIndex(ctx)
+        type = self.visit(children.rule(SolidityParser.RULE_typeName))
+        iden = children.rule(SolidityParser.RULE_identifier)
+        name = iden.getText()
+
+        expression = None
+
+        if children.rule(SolidityParser.RULE_expression):
+            expression = self.visit(children.rule(SolidityParser.RULE_expression))
+
+        visibility = 'default'
+
+        if children.token(SolidityParser.InternalKeyword):
+            visibility = 'internal'
+        elif children.token(SolidityParser.PublicKeyword):
+            visibility = 'public'
+        elif children.token(SolidityParser.PrivateKeyword):
+            visibility = 'private'
+
+        isDeclaredConst = False
+        if children.token(SolidityParser.ConstantKeyword):
+            isDeclaredConst = True
+
+        decl = self._createNode(
+            ctx=ctx,
+            type='VariableDeclaration',
+            typeName=type,
+            name=name,
+            expression=expression,
+            visibility=visibility,
+            isStateVar=True,
+            isDeclaredConst=isDeclaredConst,
+            isIndexed=False)
+
+        return self._createNode(ctx=ctx,
+                                type='StateVariableDeclaration',
+                                variables=[decl],
+                                initialValue=expression)
+
+    def visitForStatement(self, ctx):
+        conditionExpression = self.visit(ctx.expressionStatement()) if ctx.expressionStatement() else None
+
+        if conditionExpression:
+            conditionExpression = conditionExpression.expression
+
+        return self._createNode(ctx=ctx,
+                                type='ForStatement',
+                                initExpression=self.visit(ctx.simpleStatement()),
+                                conditionExpression=conditionExpression,
+                                loopExpression=self._createNode(ctx=ctx,
+                                    type='ExpressionStatement',
+                                    expression=self.visit(ctx.expression())),
+                                body=self.visit(ctx.statement())
+                                )
+
+    def visitPrimaryExpression(self, ctx):
+        if ctx.BooleanLiteral():
+            return self._createNode(ctx=ctx,
+                                    type='BooleanLiteral',
+                                    value=ctx.BooleanLiteral().getText() == 'true')
+
+        if ctx.hexLiteral():
+            return self._createNode(ctx=ctx,
+                                    type='hexLiteral',
+                                    value=ctx.hexLiteral().getText())
+
+        if ctx.stringLiteral():
+            text = ctx.getText()
+            return self._createNode(ctx=ctx,
+                                    type='stringLiteral',
+                                    value=text[1: len(text) - 1])
+
+        if (len(ctx.children) == 3
+                and _token_type(ctx.getChild(1)) == _TOKEN_TYPES['[']
+                and _token_type(ctx.getChild(2)) == _TOKEN_TYPES[']']):
+            node = self.visit(ctx.getChild(0))
+            if node.type == 'Identifier':
+                node = self._createNode(ctx=ctx,
+                                        type='UserDefinedTypeName',
+                                        namePath=node.name)
+            else:
+                node = self._createNode(ctx=ctx,
+                                        type='ElementaryTypeName',
+                                        name=ctx.getChild(0).getText())
+
+            return self._createNode(ctx=ctx,
+                                    type='ArrayTypeName',
+                                    baseTypeName=node,
+                                    length=None)
+
+        return self.visit(ctx.getChild(0))
+
+    def visitIdentifier(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="Identifier",
+                                name=ctx.getText())
+
+    def visitTupleExpression(self, ctx):
+        children = ctx.children[1:-1]
+        components = [None if e is None else self.visit(e) for e in self._mapCommasToNulls(children)]
+
+        return self._createNode(ctx=ctx,
+                                type='TupleExpression',
+                                components=components,
+                                isArray=_token_type(ctx.getChild(0)) == _TOKEN_TYPES['['])
+
+    def visitIdentifierList(self, ctx: SolidityParser.IdentifierListContext):
+        children = ctx.children[1:-1]
+
+        result = []
+        for iden in self._mapCommasToNulls(children):
+            if iden == None:
+                result.append(None)
+            else:
+                node = self._createNode(ctx=ctx,
+                                        type="VariableDeclaration",
+                                        name=iden.getText(),
+                                        isStateVar=False,
+                                        isIndexed=False)
+                self._bindContext(node, iden)
+                result.append(node)
+
+        return result
+
+    def visitVariableDeclarationList(self, ctx: SolidityParser.VariableDeclarationListContext):
+        result = []
+        for decl in self._mapCommasToNulls(ctx.children):
+            if decl == None:
+                return None
+
+            node = self._createNode(ctx=ctx,
+                                    type='VariableDeclaration',
+                                    name=decl.identifier().getText(),
+                                    typeName=self.visit(decl.typeName()),
+                                    isStateVar=False,
+                                    isIndexed=False)
+            self._bindContext(node, decl)
+            result.append(node)
+
+        return result
+
+    def visitVariableDeclarationStatement(self, ctx):
+
+        if ctx.variableDeclaration():
+            variables = [self.visit(ctx.variableDeclaration())]
+        elif ctx.identifierList():
+            variables = self.visit(ctx.identifierList())
+        elif ctx.variableDeclarationList():
+            variables = self.visit(ctx.variableDeclarationList())
+
+        initialValue = None
+
+        if ctx.expression():
+            initialValue = self.visit(ctx.expression())
+
+        return self._createNode(ctx=ctx,
+                                type='VariableDeclarationStatement',
+                                variables=variables,
+                                initialValue=initialValue)
+
+    def visitEventDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='EventDefinition',
+                                name=ctx.identifier().getText(),
+                                parameters=self.visit(ctx.eventParameterList()),
+                                isAnonymous=not not ctx.AnonymousKeyword())
+
+    def visitEventParameterList(self, ctx):
+        parameters = []
+        for paramCtx in ctx.eventParameter():
+            type = self.visit(paramCtx.typeName())
+            name = None
+            if paramCtx.identifier():
+                name = paramCtx.identifier().getText()
+
+            parameters.append(self._createNode(ctx=ctx,
+                type='VariableDeclaration',
+                typeName=type,
+                name=name,
+                isStateVar=False,
+                isIndexed=not not paramCtx.IndexedKeyword()))
+
+        return self._createNode(ctx=ctx,
+                                type='ParameterList',
+                                parameters=parameters)
+
+    def visitInlineAssemblyStatement(self, ctx):
+        language = None
+
+        if ctx.StringLiteralFragment():
+            language = ctx.StringLiteralFragment().getText()
+            language = language[1: len(language) - 1]
+
+        return self._createNode(ctx=ctx,
+                                type='InLineAssemblyStatement',
+                                language=language,
+                                body=self.visit(ctx.assemblyBlock()))
+
+    def visitAssemblyBlock(self, ctx):
+        operations = [self.visit(it) for it in ctx.assemblyItem()]
+
+        return self._createNode(ctx=ctx,
+                                type='AssemblyBlock',
+                                operations=operations)
+
+    def visitAssemblyItem(self, ctx):
+
+        if ctx.hexLiteral():
+            return self._createNode(ctx=ctx,
+                                    type='HexLiteral',
+                                    value=ctx.hexLiteral().getText())
+
+        if ctx.stringLiteral():
+            text = ctx.stringLiteral().getText()
+            return self._createNode(ctx=ctx,
+                                    type='StringLiteral',
+                                    value=text[1: len(text) - 1])
+
+        if ctx.BreakKeyword():
+            return self._createNode(ctx=ctx,
+                                    type='Break')
+
+        if ctx.ContinueKeyword():
+            return self._createNode(ctx=ctx,
+                                    type='Continue')
+
+        return self.visit(ctx.getChild(0))
+
+    def visitAssemblyExpression(self, ctx):
+        return self.visit(ctx.getChild(0))
+
+    def visitAssemblyMember(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='AssemblyMember',
+                                name=ctx.identifier().getText())
+
+    def visitAssemblyCall(self, ctx):
+        functionName = ctx.getChild(0).getText()
+        args = [self.visit(arg) for arg in ctx.assemblyExpression()]
+
+        return self._createNode(ctx=ctx,
+                                type='AssemblyExpression',
+                                functionName=functionName,
+                                arguments=args)
+
+    def visitAssemblyLiteral(self, ctx):
+
+        if ctx.stringLiteral():
+            text = ctx.getText()
+            return self._createNode(ctx=ctx,
+                                    type='StringLiteral',
+                                    value=text[1: len(text) - 1])
+
+        if ctx.DecimalNumber():
+            return self._createNode(ctx=ctx,
+                                    type='DecimalNumber',
+                                    value=ctx.getText())
+
+        if ctx.HexNumber():
+            return self._createNode(ctx=ctx,
+                                    type='HexNumber',
+                                    value=ctx.getText())
+
+        if ctx.hexLiteral():
+            return self._createNode(ctx=ctx,
+                                    type='HexLiteral',
+                                    value=ctx.getText())
+
+    def visitAssemblySwitch(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='AssemblySwitch',
+                                expression=self.visit(ctx.assemblyExpression()),
+                                cases=[self.visit(c) for c in ctx.assemblyCase()])
+
+    def visitAssemblyCase(self, ctx):
+        value = None
+
+        if ctx.getChild(0).getText() == 'case':
+            value = self.visit(ctx.assemblyLiteral())
+
+        if value != None:
+            node = self._createNode(ctx=ctx,
+                                    type="AssemblyCase",
+                                    block=self.visit(ctx.assemblyBlock()),
+                                    value=value)
+        else:
+            node = self._createNode(ctx=ctx,
+                                    type="AssemblyCase",
+                                    block=self.visit(ctx.assemblyBlock()),
+                                    default=True)
+
+        return node
+
+    def visitAssemblyLocalDefinition(self, ctx):
+        names = ctx.assemblyIdentifierOrList()
+
+        if names.identifier():
+            names = [self.visit(names.identifier())]
+        else:
+            names = self.visit(names.assemblyIdentifierList().identifier())
+
+        return self._createNode(ctx=ctx,
+                                type='AssemblyLocalDefinition',
+                                names=names,
+                                expression=self.visit(ctx.assemblyExpression()))
+
+    def visitAssemblyFunctionDefinition(self, ctx):
+        args = ctx.assemblyIdentifierList().identifier()
+        returnArgs = ctx.assemblyFunctionReturns().assemblyIdentifierList().identifier()
+
+        return self._createNode(ctx=ctx,
+                                type='AssemblyFunctionDefinition',
+                                name=ctx.identifier().getText(),
+                                arguments=self.visit(args),
+                                returnArguments=self.visit(returnArgs),
+                                body=self.visit(ctx.assemblyBlock()))
+
+    def visitAssemblyAssignment(self, ctx):
+        names = ctx.assemblyIdentifierOrList()
+
+        if names.identifier():
+            names = [self.visit(names.identifier())]
+        else:
+            names = self.visit(names.assemblyIdentifierList().identifier())
+
+        return self._createNode(ctx=ctx,
+                                type='AssemblyAssignment',
+                                names=names,
+                                expression=self.visit(ctx.assemblyExpression()))
+
+    def visitLabelDefinition(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='LabelDefinition',
+                                name=ctx.identifier().getText())
+
+    def visitAssemblyStackAssignment(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='AssemblyStackAssignment',
+                                name=ctx.identifier().getText())
+
+    def visitAssemblyFor(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='AssemblyFor',
+                                pre=self.visit(ctx.getChild(1)),
+                                condition=self.visit(ctx.getChild(2)),
+                                post=self.visit(ctx.getChild(3)),
+                                body=self.visit(ctx.getChild(4)))
+
+    def visitAssemblyIf(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type='AssemblyIf',
+                                condition=self.visit(ctx.assemblyExpression()),
+                                body=self.visit(ctx.assemblyBlock()))
+
+    ### /***************************************************
+
+    def visitPragmaDirective(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="PragmaDirective",
+                                name=ctx.pragmaName().getText(),
+                                value=ctx.pragmaValue().getText())
+
+    def visitImportDirective(self, ctx):
+        symbol_aliases = {}
+        unit_alias = None
+
+        if len(ctx.importDeclaration()) > 0:
+            for item in ctx.importDeclaration():
+
+                try:
+                    alias = item.identifier(1).getText()
+                except:
+                    alias = None
+                symbol_aliases[item.identifier(0).getText()] = alias
+
+        elif len(ctx.children) == 7:
+            unit_alias = ctx.getChild(3).getText()
+
+        elif len(ctx.children) == 5:
+            unit_alias = ctx.getChild(3).getText()
+
+        return self._createNode(ctx=ctx,
+                                type="ImportDirective",
+                                path=ctx.importPath().getText().strip('"'),
+                                symbolAliases=symbol_aliases,
+                                unitAlias=unit_alias
+                                )
+
+    def visitContractDefinition(self, ctx):
+        self._currentContract = ctx.identifier().getText()
+        return self._createNode(ctx=ctx,
+                                type="ContractDefinition",
+                                name=ctx.identifier().getText(),
+                                baseContracts=self.visit(ctx.inheritanceSpecifier()),
+                                subNodes=self.visit(ctx.contractPart()),
+                                kind=ctx.getChild(0).getText())
+
+    def visitUserDefinedTypename(self, ctx):
+        return self._createNode(ctx=ctx,
+                                type="UserDefinedTypename",
+                                name=ctx.getText())
+
+    def visitReturnStatement(self, ctx):
+        return self.visit(ctx.expression())
+
+    def visitTerminal(self, ctx):
+        return ctx.getText()
+
+
+class _ParsedExpressionContext(SolidityParser.ExpressionContext):
+    """
+    expression subtree parsed by the precedence-climbing parser of rdparser. It has no children,
+    visiting it returns the already built ast node.
+    """
+
+    def __init__(self, parser, parent, invokingState, result, tokens, start, stop):
+        super().__init__(parser, parent, invokingState)
+        self.result = result
+        self.tokens = tokens
+        self.span = (start, stop)
+        self.start = tokens[start]
+        self.stop = tokens[stop - 1]
+
+    def accept(self, visitor):
+        return self.result
+
+    def getText(self):
+        start, stop = self.span
+        return "".join(token.text for token in self.tokens[start:stop])
+
+
+class _VisitedContext(object):
+    """
+    mixin of a parse tree context whose ast was built while parsing (see _FastPathParser.setAstVisitor()).
+    Its children are gone, visiting it returns the ast and its text is read from the token stream.
+    """
+
+    def accept(self, visitor):
+        return self.result
+
+    def getText(self):
+        tokens = self.parser.getTokenStream().tokens
+        return "".join(token.text for token in tokens[self.start.tokenIndex:self.stop.tokenIndex + 1]
+                       if token.channel == Token.DEFAULT_CHANNEL)
+
+
+class _SkippedBlockContext(SolidityParser.BlockContext):
+    """
+    function or modifier body skipped by matching braces (see _FastPathParser.skipBodies). It has
+    no children, visiting it builds a SkippedBlock node and its text is read from the token stream.
+    """
+
+    def accept(self, visitor):
+        return visitor.visitSkippedBlock(self)
+
+    getText = _VisitedContext.getText
+
+
+# rules whose visit method visits their first (and only) child, see AstVisitor.visit()
+_PASS_THROUGH_RULES = ('contractPart', 'statement', 'simpleStatement', 'assemblyExpression')
+
+_dispatch_tables = {}
+
+
+def _accept(visitor, tree):
+    # parse trees without an entry in the dispatch table (e.g. error nodes, _VisitedContext)
+    return tree.accept(visitor)
+
+
+def _visit_none(visitor, tree):
+    return None
+
+
+def _visit_first_child(visitor, ctx):
+    return visitor.visit(ctx.children[0])
+
+
+def _visit_parsed(visitor, ctx):
+    # _ParsedExpressionContext
+    return ctx.result
+
+
+def _visit_whole(method, cls):
+    """
+    :return: method visiting the context with the dispatch table of cls, i.e. without pruning
+    """
+    def visit(visitor, ctx):
+        dispatch = visitor._dispatch
+        visitor._dispatch = _dispatch_table(cls)
+        try:
+            return method(visitor, ctx)
+        finally:
+            visitor._dispatch = dispatch
+
+    return visit
+
+
+def _dispatch_table(cls, keptRules=None):
+    """
+    dispatch table of AstVisitor.visit(), built once per visitor class and set of kept rules
+
+    :param cls: AstVisitor or a subclass
+    :param keptRules: optional rule indexes to visit (see _kept_rules()), other rule contexts become None.
+                      Expressions are visited without pruning.
+    :return: dict parse tree class -> function(visitor, tree)
+    """
+    key = (cls, keptRules)
+    table = _dispatch_tables.get(key)
+    if table is not None:
+        return table
+
+    # visit method by rule index
+    names = [name[0].upper() + name[1:] for name in SolidityParser.ruleNames]
+    methods = []
+    for name in names:
+        method = getattr(cls, "visit" + name)
+        if method is getattr(SolidityVisitor, "visit" + name):
+            method = cls.visitChildren
+        elif name[0].lower() + name[1:] in _PASS_THROUGH_RULES and method is getattr(AstVisitor, "visit" + name):
+            method = _visit_first_child
+        methods.append(method)
+    parsed, skipped = _visit_parsed, cls.visitSkippedBlock
+
+    if keptRules is not None:
+        for rule in range(len(methods)):
+            if rule not in keptRules:
+                methods[rule] = _visit_none
+        if SolidityParser.RULE_expression in keptRules:
+            methods[SolidityParser.RULE_expression] = _visit_whole(methods[SolidityParser.RULE_expression], cls)
+        else:
+            parsed = _visit_none
+        if SolidityParser.RULE_block not in keptRules:
+            skipped = _visit_none
+
+    table = dict((getattr(SolidityParser, name + "Context"), method) for name, method in zip(names, methods))
+    table.update({
+        type(None): _visit_none,
+        list: cls._visit_nodes,
+        TerminalNodeImpl: cls.visitTerminal,
+        _ParsedExpressionContext: parsed,
+        _SkippedBlockContext: skipped,
+    })
+    _dispatch_tables[key] = table
+    return table
+
+
+# context class -> _VisitedContext subclass
+_VISITED_CLASSES = {}
+
+# rules whose block is skipped by _FastPathParser.skipBodies
+_BODY_PARENTS = (SolidityParser.FunctionDefinitionContext, SolidityParser.ModifierDefinitionContext)
+_BLOCK_START_STATE = SolidityParser.atn.ruleToStartState[SolidityParser.RULE_block].stateNumber
+_LBRACE = _TOKEN_TYPES['{']
+_RBRACE = _TOKEN_TYPES['}']
+
+# parents of the units built while parsing (see _FastPathParser.setAstVisitor()): their visit
+# methods use the results of their children only, not the children's own children
+_UNIT_PARENTS = (SolidityParser.SourceUnitContext, SolidityParser.ContractPartContext, SolidityParser.StatementContext)
+
+# what AstVisitor raises for constructs it does not support (e.g. some inline assembly items whose
+# visit methods read children the rule does not have). Units raising them are left as parse tree and
+# raise again when the tree is visited.
+_UNSUPPORTED = (AttributeError, IndexError, TypeError)
+
+
+class _FastPathParser(SolidityParser):
+    """
+    SolidityParser with the fast paths of the bail-out SLL stage of _parse_tree(). Any syntax error
+    is reported by the second stage, which parses without them.
+
+    Expressions: setExpressionTokens() enables parsing expression subtrees with the precedence-climbing
+    expression parser of rdparser (see RecursiveDescentParser.expression()) instead of the
+    left-recursive expression rule, which evaluates a precedence predicate and pushes a recursion
+    context for every operator. The subtrees become _ParsedExpressionContext leaves holding the same
+    nodes AstVisitor builds. Expressions the fast path does not handle are parsed by the expression
+    rule as usual.
+
+    Parse trees: setAstVisitor() turns off building the parse tree. The ast is built from rule exits
+    instead and the parse tree is only kept for the unit being parsed.
+
+    Bodies: skipBodies skips the blocks of function and modifier definitions (see block()). Unlike
+    the fast paths above it applies to both stages.
+    """
+
+    expressions = None  # RecursiveDescentParser reset to the default channel tokens, None if disabled
+    positions = None  # token index -> index in expressions.tokens
+    visitor = None  # AstVisitor building the ast while parsing, None if disabled
+    skipBodies = False  # skip the blocks of function and modifier definitions, see block()
+
+    def setAstVisitor(self, visitor):
+        """
+        build the ast while parsing instead of building a parse tree (buildParseTrees = False).
+
+        Rule contexts are added to their parent on exit, tokens to the current context. The direct
+        children of source units, contract parts and statements (i.e. top level definitions, contract
+        members and statements) are visited with visitor as soon as they are complete and lose
+        their children, so only the subtree of the unit being parsed is kept. Visiting the returned
+        tree with the same visitor completes the ast. Left-recursive rules do not exit their inner
+        contexts, their subtrees are built as parse trees.
+
+        :param visitor: AstVisitor, None to build parse trees again
+        """
+        self.visitor = visitor
+        self.buildParseTrees = visitor is None
+
+    def consume(self):
+        token = super().consume()
+        if not self.buildParseTrees:
+            self._ctx.addTokenNode(token)
+        return token
+
+    def exitRule(self):
+        ctx = self._ctx
+        super().exitRule()
+        parent = ctx.parentCtx
+        if self.buildParseTrees or parent is None or ctx.exception is not None:
+            # not building the ast (or within a subtree built as parse tree), or bailing out
+            return
+        parent.addChild(ctx)
+        if not isinstance(parent, _UNIT_PARENTS):
+            return
+
+        try:
+            result = self.visitor.visit(ctx)
+        except _UNSUPPORTED:
+            return
+        cls = ctx.__class__
+        visited = _VISITED_CLASSES.get(cls)
+        if visited is None:
+            visited = _VISITED_CLASSES[cls] = type(cls.__name__, (_VisitedContext, cls), {})
+        ctx.__class__ = visited
+        ctx.result = result
+        ctx.children = None
+
+    def setExpressionTokens(self, expressions, tokens=None):
+        """
+        :param expressions: RecursiveDescentParser for the fast path, None to disable it
+        :param tokens: all tokens of the (filled) token stream
+        """
+        if expressions is None:
+            if self.expressions is not None:
+                self.expressions.reset()
+            self.expressions = self.positions = None
+            return
+        positions = [0] * len(tokens)
+        default = []
+        for token in tokens:
+            if token.channel == Token.DEFAULT_CHANNEL:
+                positions[token.tokenIndex] = len(default)
+                default.append(token)
+        expressions.reset(default)
+        self.expressions = expressions
+        self.positions = positions
+
+    def block(self):
+        """
+        with skipBodies, the block of a function or modifier definition is skipped by matching braces
+        instead of being parsed (in both stages), it becomes a _SkippedBlockContext without children.
+        A block missing its closing brace ends at EOF, where the enclosing rules report the error.
+        """
+        stream = self._input
+        if not self.skipBodies or not isinstance(self._ctx, _BODY_PARENTS) or stream.LA(1) != _LBRACE:
+            return super().block()
+
+        localctx = _SkippedBlockContext(self, self._ctx, self.state)
+        self.enterRule(localctx, _BLOCK_START_STATE, self.RULE_block)
+        # scan the buffered tokens instead of consuming them one by one. Tokens that are not
+        # buffered yet are lexed one at a time like consume() does (lexer errors keep their order).
+        tokens = stream.tokens
+        i = stream.index
+        depth = 0
+        while True:
+            if i == len(tokens):
+                stream.sync(i)
+            ttype = tokens[i].type
+            if ttype == _LBRACE:
+                depth += 1
+            elif ttype == _RBRACE:
+                depth -= 1
+                if not depth:
+                    i += 1
+                    break
+            elif ttype == Token.EOF:
+                break
+            i += 1
+        stream.seek(i)
+        self.exitRule()
+        return localctx
+
+    def typeName(self, _p=0):
+        if not self.buildParseTrees:
+            return self._parseTree(super().typeName, _p)
+        return super().typeName(_p)
+
+    def _parseTree(self, rule, *args):
+        self.buildParseTrees = True
+        try:
+            return rule(*args)
+        finally:
+            self.buildParseTrees = False
+
+    def expression(self, _p=0):
+        if not self.buildParseTrees:
+            return self._parseTree(self.expression, _p)
+
+        expressions = self.expressions
+        if expressions is None or _p != 0:
+            # recursive calls of the rule continue the ANTLR parse
+            return super().expression(_p)
+
+        from solidity_parser.rdparser import RDSyntaxError, RDUnsupported
+
+        parent = self._ctx
+        start = expressions.pos = self.positions[self._input.LT(1).tokenIndex]
+        try:
+            result = expressions.expression()
+        except (RDSyntaxError, RDUnsupported, IndexError):
+            return super().expression(_p)
+        stop = expressions.pos
+        tokens = expressions.tokens
+        if isinstance(parent, SolidityParser.FunctionCallContext):
+            # expression '(' functionCallArguments ')': stop before the call's own arguments
+            # (SLL prediction cannot tell where, the expression rule bails out on every emit)
+            if expressions.lastCall is None or getattr(result, "type", None) != 'FunctionCall':
+                return super().expression(_p)
+            result = result["expression"]
+            stop = expressions.lastCall
+        elif parent is None and tokens[stop].type != Token.EOF:
+            # start rule: ANTLR stops at trailing tokens on its own terms
+            return super().expression(_p)
+
+        localctx = _ParsedExpressionContext(self, parent, self.state, result, tokens, start, stop)
+        if parent is not None and self.buildParseTrees:
+            parent.addChild(localctx)
+        self._input.seek(tokens[stop].tokenIndex)
+        return localctx
+
+
+def _parse_tree(parser, token_stream, start, prediction_mode, stats, expressions=None, visitor=None):
+    """
+    run the start rule on parser using the requested prediction strategy
+
+    "two-stage" first tries the cheap SLL prediction with a bail-out error strategy and only
+    re-parses with full LL if that fails (either a real syntax error or an SLL weakness).
+    SLL succeeding implies the same parse tree as LL, so the AST is identical either way.
+    "sll" bails out the same way but raises instead of re-parsing: SLL may reject valid input,
+    so a tree recovered from an SLL failure could be wrong.
+
+    :param parser: SolidityParser (_FastPathParser if expressions or visitor are given)
+    :param token_stream: the parsers token stream (rewound for the second stage)
+    :param start: name of the start rule
+    :param prediction_mode: "two-stage", "sll" or "ll"
+    :param stats: optional dict receiving the stage the parse finished in ("sll-fast" for the first
+                  "two-stage" stage with expressions or visitor, "sll" or "ll" otherwise)
+    :param expressions: optional RecursiveDescentParser parsing the expressions of the first
+                        "two-stage" stage (token_stream has to be filled)
+    :param visitor: optional AstVisitor building the ast during the first "two-stage" stage
+                    (see _FastPathParser.setAstVisitor()), the tree returned by that stage is visited with it
+    :return: parse tree
+    """
+    if prediction_mode not in ("two-stage", "sll", "ll"):
+        raise Exception("unknown prediction_mode %r (expected 'two-stage', 'sll' or 'll')" % prediction_mode)
+
+    if prediction_mode == "two-stage":
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        parser.removeErrorListeners()
+        if expressions is not None:
+            parser.setExpressionTokens(expressions, token_stream.tokens)
+        if visitor is not None:
+            parser.setAstVisitor(visitor)
+        try:
+            tree = getattr(parser, start)()
+            if stats is not None:
+                # the fast paths accept sources whose expressions plain SLL prediction rejects
+                stats["prediction_mode"] = "sll" if expressions is None and visitor is None else "sll-fast"
+            return tree
+        except ParseCancellationException:
+            # rewind and retry with full LL prediction and the default (reporting+recovering) strategy
+            if expressions is not None:
+                parser.setExpressionTokens(None)
+            token_stream.seek(0)
+            parser.reset()
+            parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+            parser._errHandler = DefaultErrorStrategy()
+        finally:
+            if visitor is not None:
+                parser.setAstVisitor(None)
+
+    if prediction_mode == "sll":
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        parser.removeErrorListeners()
+        try:
+            tree = getattr(parser, start)()
+        except ParseCancellationException:
+            token = parser.getCurrentToken()
+            raise Exception("SLL prediction failed at line %d:%d, the input has a syntax error or needs full LL "
+                            "prediction (use prediction_mode='two-stage' or 'll')" % (token.line, token.column))
+        if stats is not None:
+            stats["prediction_mode"] = "sll"
+        return tree
+
+    parser._interp.predictionMode = PredictionMode.LL
+    tree = getattr(parser, start)()
+    if stats is not None:
+        stats["prediction_mode"] = "ll"
+    return tree
+
+
+def _input_stream(text):
+    return CodePointStream(text) if isinstance(text, str) else BufferStream(text)
+
+
+def _shift_tokens(tokens, line, column, offset):
+    """
+    move tokens lexed from a part of a source to where that part starts in the source
+    """
+    for token in tokens:
+        if token._text is None:
+            token._text = token.text  # read from the input with the unshifted positions
+        if token.line == 1:
+            token.column += column
+        token.line += line - 1
+        token.start += offset
+        token.stop += offset
+
+
+# result of _Recognizers._parse_rd() for inputs left to ANTLR
+_NO_RESULT = object()
+
+
+class _SyntaxErrorCounter(ErrorListener):
+
+    def __init__(self):
+        self.count = 0
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.count += 1
+
+
+class _Recognizers(object):
+    """
+    lexer, token stream and parser of a ParserSession, reset for every input instead of rebuilt
+    """
+
+    def __init__(self):
+        self.lexers = {}  # created on first use, see lexer.LEXERS
+        self.token_stream = CommonTokenStream(None)
+        self.parser = _FastPathParser(self.token_stream)
+        self.error_strategy = DefaultErrorStrategy()
+        self.lexer_errors = _SyntaxErrorCounter()
+        self.rd_parsers = {}  # by node representation and loc, created on first use
+
+    def parse(self, text, start, prediction_mode, stats, contexts, nodes, comments, lexer, engine="antlr", bodies=True,
+              lazy_bodies=None, keep=None, origin=None, loc=False, utf8=None):
+        """
+        :param comments: keep the HIDDEN channel tokens
+        :param lexer: "antlr" or "regex"
+        :param engine: "antlr" or "rd" (recursive descent, see rdparser)
+        :param bodies: parse function and modifier bodies, skip them otherwise
+        :param lazy_bodies: optional parser._LazySource turning skipped bodies into LazyBody objects
+        :param keep: optional set of node types to build a pruned ast for (see AstVisitor)
+        :param origin: optional (line, column, offset) of text within a larger source (see parser.LazyBody),
+                       token positions are shifted to be relative to that source. Lexer errors are not
+                       reported again (parsing the source reported them), parser errors are.
+        :param loc: add location information to ast nodes (True or "lazy")
+        :param utf8: optional parser._Utf8Offsets of the source text is part of (see origin) for loc="lazy"
+        :return: (ast, number of lexer and parser syntax errors)
+        """
+        if engine not in ("antlr", "rd"):
+            raise Exception("unknown engine %r (expected 'antlr' or 'rd')" % engine)
+        if engine == "rd" and contexts is not None:
+            raise Exception("contexts are only available with engine='antlr'")
+        if engine == "rd" and keep is not None:
+            raise Exception("keep is only available with engine='antlr'")
+
+        key = (lexer, bool(comments))
+        if key not in self.lexers:
+            if key not in LEXERS:
+                raise Exception("unknown lexer %r (expected 'antlr' or 'regex')" % lexer)
+            self.lexers[key] = LEXERS[key](None)
+        lexer = self.lexers[key]
+        token_stream, parser = self.token_stream, self.parser
+
+        # a previous parse may have left other listeners/strategies behind (see _parse_tree)
+        self.lexer_errors.count = 0
+        # the rd engine and the fast paths of the two-stage strategy (see _FastPathParser) need
+        # all tokens up front. They are lexed without reporting errors first, inputs with lexer
+        # errors are lexed again and parsed by ANTLR alone, which reports all errors in their usual order.
+        fast_paths = engine == "antlr" and contexts is None and prediction_mode == "two-stage"
+        lex_first = engine == "rd" or fast_paths
+        # the parse of the whole source already reported the lexer errors of a block (see origin)
+        reporting = [ConsoleErrorListener.INSTANCE, self.lexer_errors] if origin is None else [self.lexer_errors]
+        lexer._listeners = [self.lexer_errors] if lex_first else reporting
+        if loc == "lazy":
+            # filled with the token positions once the ast is built, see parser.SourceLocation
+            loc = _TokenPositions(utf8 if origin is not None else _Utf8Offsets.of(text))
+
+        try:
+            # lexing runs the lexer's DFA as well, the caches must not be cleared before the tokens are buffered
+            with dfacache.tracked_parse():
+                lexer.inputStream = _input_stream(text)
+                token_stream.setTokenSource(lexer)
+                if lex_first:
+                    token_stream.fill()
+                    if self.lexer_errors.count:
+                        self.lexer_errors.count = 0
+                        lexer._listeners = reporting
+                        lexer.inputStream = _input_stream(text)
+                        token_stream.setTokenSource(lexer)
+                        lex_first = fast_paths = False
+                if origin is not None:
+                    token_stream.fill()
+                    _shift_tokens(token_stream.tokens, *origin)
+
+                result = _NO_RESULT
+                if engine == "rd":
+                    if lex_first:
+                        result = self._parse_rd(start, nodes, loc, bodies, lazy_bodies)
+                    if stats is not None:
+                        stats["engine"] = "rd" if result is not _NO_RESULT else "antlr"
+
+                if result is _NO_RESULT:
+                    parser._listeners = [ConsoleErrorListener.INSTANCE]
+                    parser._errHandler = self.error_strategy
+                    parser.setTokenStream(token_stream)
+                    parser.skipBodies = not bodies
+
+                    ast = AstVisitor(contexts=contexts, nodes=nodes, lazyBodies=lazy_bodies, keep=keep, loc=loc)
+                    expressions, visitor = (self._rd_parser(nodes, loc), ast) if fast_paths else (None, None)
+                    tree = _parse_tree(parser, token_stream, start, prediction_mode, stats, expressions, visitor)
+                    result = ast.visit(tree)
+                    syntax_errors = self.lexer_errors.count + parser.getNumberOfSyntaxErrors()
+                else:
+                    syntax_errors = 0
+            if isinstance(loc, _TokenPositions):
+                loc.fill(token_stream.tokens)
+
+            if stats is not None:
+                # tokens buffered (incl. EOF) and whitespace/comment tokens among them or skipped by the lexer
+                tokens = token_stream.tokens
+                stats["tokens"] = len(tokens)
+                stats["hidden_tokens"] = (sum(1 for token in tokens if token.channel != Token.DEFAULT_CHANNEL)
+                                          if comments else lexer.hidden_tokens)
+            return result, syntax_errors
+        finally:
+            if contexts is None:
+                self.release()
+
+    def _rd_parser(self, nodes, loc):
+        from solidity_parser.rdparser import RecursiveDescentParser
+
+        if isinstance(loc, _TokenPositions):
+            return RecursiveDescentParser(nodes, loc)  # its nodes refer to the positions of this parse
+        key = (nodes, bool(loc))
+        rd_parser = self.rd_parsers.get(key)
+        if rd_parser is None:
+            rd_parser = self.rd_parsers[key] = RecursiveDescentParser(nodes, loc)
+        return rd_parser
+
+    def _parse_rd(self, start, nodes, loc, bodies=True, lazy_bodies=None):
+        """
+        parse the (filled) token stream with the recursive-descent parser
+
+        :return: ast, or _NO_RESULT if ANTLR has to parse the input instead (errors or unsupported constructs)
+        """
+        from solidity_parser.rdparser import RDSyntaxError, RDUnsupported
+
+        token_stream = self.token_stream
+        tokens = [token for token in token_stream.tokens if token.channel == Token.DEFAULT_CHANNEL]
+        try:
+            return self._rd_parser(nodes, loc).parse(tokens, start, bodies, lazy_bodies)
+        except (RDSyntaxError, RDUnsupported):
+            token_stream.seek(0)
+            return _NO_RESULT
+
+    def release(self):
+        """
+        drop the last input, tokens and parse tree so they are not kept alive by a pooled instance
+        """
+        token_stream, parser = self.token_stream, self.parser
+        for lexer in self.lexers.values():
+            lexer.inputStream = None
+        token_stream.setTokenSource(None)
+        parser._interp._input = None
+        parser._interp._outerContext = None
+        parser.setExpressionTokens(None)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Persistent on-disk cache for parsed ASTs.
+
+Entries are keyed by a hash of the source text, the parse options that change the AST
+(``start``, ``loc``, ``nodes``, ``bodies``, ``keep``, ``comments``) and a fingerprint of the
+generated grammar and the modules building the AST. Regenerating ``solidity_antlr4`` (or updating this package) therefore makes
+all old entries unreachable; they are evicted like any other stale entry.
+
+    from solidity_parser import astcache, parser
+
+    cache = astcache.ASTCache("~/.cache/solidity-parser", max_size=512 * 1024 * 1024)
+    ast = parser.parse_file("contract.sol", cache=cache)
+    cache.stats()  # {'hits': ..., 'misses': ..., 'stores': ..., 'evictions': ..., 'size': ..., 'entries': ...}
+
+Entries are zlib compressed pickles. The directory is bounded by ``max_size`` bytes and the
+least recently used entries (by file modification time, updated on every hit) are evicted
+first. Several processes may share one directory.
+
+Only ASTs of sources without syntax errors are stored, sources with errors are always
+reparsed so their errors are reported every time.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+FORMAT_VERSION = 1
+
+_fingerprint = None
+
+
+def fingerprint():
+    """
+    :return: hash of the generated grammar and the modules of this package (changes whenever either is modified)
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        grammar_dir = os.path.join(package_dir, "solidity_antlr4")
+        paths = []
+        for directory in (grammar_dir, package_dir):
+            paths.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".py"))
+
+        h = hashlib.sha256(("%d" % FORMAT_VERSION).encode("utf-8"))
+        for path in paths:
+            with open(path, "rb") as f:
+                h.update(os.path.basename(path).encode("utf-8"))
+                h.update(f.read())
+        _fingerprint = h.hexdigest()
+    return _fingerprint
+
+
+class ASTCache(object):
+    """
+    size bounded LRU cache of serialized ASTs in a directory.
+
+    parse() and parse_file() use it via their ``cache`` argument. Statistics are kept per
+    instance (per process).
+    """
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024, compression_level=1):
+        """
+        :param directory: cache directory (created if missing)
+        :param max_size: maximum total size of all entries in bytes
+        :param compression_level: zlib compression level of the entries
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.compression_level = compression_level
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def __reduce__(self):
+        # e.g. sent to parse_files() workers: they open the same directory with fresh statistics
+        return self.__class__, (self.directory, self.max_size, self.compression_level)
+
+    def key(self, text, start="sourceUnit", loc=False, nodes="dict", bodies=True, keep=None, comments=False):
+        """
+        :return: cache key of parsing text with the given options (comments shift the tokenRange of SkippedBlocks)
+        """
+        h = hashlib.sha256(fingerprint().encode("utf-8"))
+        h.update(("\0%s\0%s\0%s\0%s\0%d\0" % (start, "lazy" if loc == "lazy" else int(bool(loc)), nodes, bodies,
+                                                bool(comments))).encode("utf-8"))
+        if keep is not None:
+            h.update(("%s\0" % ",".join(sorted(keep))).encode("utf-8"))
+        if isinstance(text, str):
+            text = text.encode("utf-8", "surrogatepass")
+        h.update(text)  # ASCII bytes (see parse()) hash like the equal str
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".ast")
+
+    def _entries(self):
+        """
+        :return: list of (path, size, mtime) of all entries
+        """
+        entries = []
+        for subdir in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, subdir)
+            if not os.path.isdir(subdir):
+                continue
+            for name in os.listdir(subdir):
+                if not name.endswith(".ast"):
+                    continue
+                path = os.path.join(subdir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # removed by another process
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def get(self, key):
+        """
+        :return: the cached ast or None
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            ast = pickle.loads(zlib.decompress(data))
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return ast
+
+    def put(self, key, ast):
+        """
+        store ast under key and evict least recently used entries if the cache grew too large
+        """
+        data = zlib.compress(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL), self.compression_level)
+        if len(data) > self.max_size:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size  # storing a key again replaces its entry
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self.stores += 1
+        self._size += len(data) - replaced
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        remove least recently used entries until the cache fits into max_size
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        """
+        remove all entries
+        """
+        for path, _, _ in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def stats(self):
+        """
+        :return: dict of hit/miss/store/eviction counts of this instance and the size of the cache directory
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size": sum(entry[1] for entry in entries),
+            "entries": len(entries),
+        }
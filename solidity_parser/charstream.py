@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Compact character streams for the lexer.
+
+antlr's ``InputStream`` keeps the source as a list of ints, one 8 byte pointer per character
+on top of the source string itself (and a separate int object for every character beyond
+U+00FF). The streams here keep the code points in a flat buffer instead:
+
+* ``CodePointStream(text)``: one byte per character if every character is below U+0100 (plain
+  ASCII sources), four bytes per character otherwise.
+* ``BufferStream(buffer)``: reads an ASCII only bytes-like object (``bytes``, ``mmap``, ...)
+  directly, without a decoded copy. ``parser.parse_file(..., mmap=True)`` uses it to lex a
+  memory-mapped file.
+
+Both are drop-in replacements for ``InputStream``.
+"""
+
+import re
+import sys
+
+from antlr4.InputStream import InputStream
+
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+# bytes that make a buffer unusable for BufferStream: non ASCII (multi byte utf-8) and \r, which
+# reading the file in text mode would have translated
+_NOT_PLAIN_ASCII = re.compile(b"[\\r\\x80-\\xff]")
+
+
+def code_points(text):
+    """
+    :return: indexable sequence of the code points of text (bytes or a memoryview of 4 byte ints)
+    """
+    try:
+        return text.encode("latin-1")
+    except UnicodeEncodeError:
+        # surrogatepass: lone surrogates (e.g. from surrogateescape decoding) are kept as their code point
+        return memoryview(text.encode(_UTF32, "surrogatepass")).cast("I")
+
+
+def is_plain_ascii(buffer):
+    """
+    :return: True if buffer can be lexed by BufferStream, i.e. is ASCII without carriage returns
+    """
+    return _NOT_PLAIN_ASCII.search(buffer) is None
+
+
+class CodePointStream(InputStream):
+    """
+    InputStream keeping the code points of the source in a compact buffer
+    """
+
+    def _loadString(self):
+        self._index = 0
+        self.data = code_points(self.strdata)
+        self._size = len(self.data)
+
+
+class BufferStream(InputStream):
+    """
+    InputStream reading an ASCII bytes-like object (e.g. a mmap) in place, see is_plain_ascii()
+    """
+
+    def __init__(self, buffer, name="<buffer>"):
+        self.name = name
+        self.strdata = buffer
+        self.data = buffer
+        self._index = 0
+        self._size = len(buffer)
+
+    def getText(self, start, stop):
+        if start >= self._size:
+            return ""
+        return self.data[start:min(stop, self._size - 1) + 1].decode("ascii")
+
+    def __str__(self):
+        return self.data[:].decode("ascii")
@@ -0,0 +1,515 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Persist the adaptive prediction (DFA) caches of the generated lexer and parser.
+
+ANTLR keeps the DFA states it learns while parsing on the generated classes
+(``SolidityParser.decisionsToDFA``, ``SolidityLexer.decisionsToDFA`` and its variant
+``lexer.SkipHiddenLexer.decisionsToDFA``). They start out
+empty in every new process which makes the first parses considerably slower than
+later ones. ``save_dfa_cache()`` writes the warmed states to disk and ``load_dfa_cache()``
+restores them at startup:
+
+    from solidity_parser import dfacache, parser
+
+    dfacache.load_dfa_cache("solidity.dfa")
+    ...
+    parser.parse_file("contract.sol")
+    ...
+    dfacache.save_dfa_cache("solidity.dfa")
+
+The file is tied to a hash of the serialized ATNs; a regenerated grammar (or a
+different antlr runtime) makes ``load_dfa_cache()`` ignore it.
+
+The caches only ever grow. Long running processes can bound them with a
+``DFACacheManager`` which is consulted after every parse and resets the caches
+once a ceiling is exceeded and no other parse is in flight:
+
+    dfacache.set_cache_manager(dfacache.DFACacheManager(max_dfa_states=200000,
+                                                        max_context_entries=500000))
+"""
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from antlr4.PredictionContext import PredictionContext, SingletonPredictionContext, ArrayPredictionContext
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext, Predicate, PrecedencePredicate, AND, OR
+from antlr4.dfa.DFAState import DFAState, PredPrediction
+
+from solidity_parser import grammar
+
+FORMAT_VERSION = 2
+ANTLR_RUNTIME_VERSION = grammar.ANTLR_RUNTIME_VERSION
+
+
+def grammar_hash():
+    """
+    :return: hash of the serialized lexer and parser ATNs (changes whenever the grammar is regenerated)
+    """
+    grammar.load()
+    from solidity_parser.solidity_antlr4 import SolidityLexer as lexer_module
+    from solidity_parser.solidity_antlr4 import SolidityParser as parser_module
+
+    h = hashlib.sha256()
+    h.update(lexer_module.serializedATN().encode("utf-8"))
+    h.update(parser_module.serializedATN().encode("utf-8"))
+    return h.hexdigest()
+
+
+def _recognizers():
+    """
+    :return: list of (name, recognizer class) of all classes with DFA caches
+    """
+    SolidityLexer, SolidityParser = grammar.load()
+    from solidity_parser.lexer import SkipHiddenLexer
+
+    return [("parser", SolidityParser), ("lexer", SolidityLexer), ("hidden_lexer", SkipHiddenLexer)]
+
+
+class _DFAWriter(object):
+    """
+    flattens the DFAs of one recognizer into plain (picklable) containers.
+
+    ATN states and lexer actions are stored by index, prediction contexts and semantic
+    contexts are interned into tables so shared objects stay shared after loading.
+    """
+
+    def __init__(self, atn):
+        self.atn = atn
+        self.contexts = []
+        self.semantics = []
+        self.executors = []
+        self._context_ids = {}
+        self._semantic_ids = {}
+        self._executor_ids = {}
+
+    def context(self, ctx):
+        if ctx is None:
+            return -1
+        idx = self._context_ids.get(id(ctx))
+        if idx is not None:
+            return idx
+        # contexts form a DAG that can be deep; walk it without recursion
+        stack = [ctx]
+        while stack:
+            top = stack[-1]
+            if id(top) in self._context_ids:
+                stack.pop()
+                continue
+            parents = [top.parentCtx] if isinstance(top, SingletonPredictionContext) else list(top.parents)
+            pending = [p for p in parents if p is not None and id(p) not in self._context_ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if top is PredictionContext.EMPTY:
+                entry = ("e",)
+            elif isinstance(top, SingletonPredictionContext):
+                entry = ("s", self._context_ids[id(top.parentCtx)] if top.parentCtx is not None else -1, top.returnState)
+            else:
+                entry = ("a",
+                         [self._context_ids[id(p)] if p is not None else -1 for p in top.parents],
+                         list(top.returnStates))
+            self._context_ids[id(top)] = len(self.contexts)
+            self.contexts.append(entry)
+        return self._context_ids[id(ctx)]
+
+    def semantic(self, sem):
+        idx = self._semantic_ids.get(id(sem))
+        if idx is not None:
+            return idx
+        if sem is SemanticContext.NONE:
+            entry = ("n",)
+        elif isinstance(sem, PrecedencePredicate):
+            entry = ("P", sem.precedence)
+        elif isinstance(sem, Predicate):
+            entry = ("p", sem.ruleIndex, sem.predIndex, sem.isCtxDependent)
+        elif isinstance(sem, (AND, OR)):
+            entry = ("&" if isinstance(sem, AND) else "|", [self.semantic(o) for o in sem.opnds])
+        else:
+            raise ValueError("cannot serialize semantic context %r" % sem)
+        self._semantic_ids[id(sem)] = len(self.semantics)
+        self.semantics.append(entry)
+        return self._semantic_ids[id(sem)]
+
+    def executor(self, executor):
+        if executor is None:
+            return -1
+        idx = self._executor_ids.get(id(executor))
+        if idx is not None:
+            return idx
+        actions = []
+        for action in executor.lexerActions:
+            indexes = [i for i, a in enumerate(self.atn.lexerActions) if a is action]
+            if not indexes:
+                # position dependent (indexed custom) actions are not used by the solidity lexer
+                raise ValueError("cannot serialize lexer action %r" % action)
+            actions.append(indexes[0])
+        self._executor_ids[id(executor)] = len(self.executors)
+        self.executors.append(actions)
+        return self._executor_ids[id(executor)]
+
+    def config(self, cfg):
+        entry = (cfg.state.stateNumber, cfg.alt, self.context(cfg.context), self.semantic(cfg.semanticContext),
+                 cfg.reachesIntoOuterContext, cfg.precedenceFilterSuppressed)
+        if isinstance(cfg, LexerATNConfig):
+            entry += (self.executor(cfg.lexerActionExecutor), cfg.passedThroughNonGreedyDecision)
+        return entry
+
+    def state(self, state):
+        configs = state.configs
+        edges = None
+        if state.edges is not None:
+            edges = [-1 if e is None else e.stateNumber for e in state.edges]
+        predicates = None
+        if state.predicates is not None:
+            predicates = [(self.semantic(p.pred), p.alt) for p in state.predicates]
+        return (state.stateNumber,
+                [self.config(c) for c in configs],
+                (configs.fullCtx, configs.uniqueAlt,
+                 sorted(configs.conflictingAlts) if configs.conflictingAlts is not None else None,
+                 configs.hasSemanticContext, configs.dipsIntoOuterContext),
+                edges, state.isAcceptState, state.prediction, self.executor(state.lexerActionExecutor),
+                state.requiresFullContext, predicates)
+
+    def dfa(self, dfa):
+        states = [self.state(s) for s in dfa.states]
+        if dfa.precedenceDfa:
+            s0 = ("p", [-1 if e is None else e.stateNumber for e in dfa.s0.edges])
+        else:
+            s0 = ("s", -1 if dfa.s0 is None else dfa.s0.stateNumber)
+        return (dfa.decision, dfa.precedenceDfa, s0, states)
+
+    def dump(self, dfas):
+        dfas = [self.dfa(d) for d in dfas]
+        return {"contexts": self.contexts,
+                "semantics": self.semantics,
+                "executors": self.executors,
+                "dfas": dfas}
+
+
+class _DFAReader(object):
+    """
+    rebuilds runtime DFA objects from the containers produced by _DFAWriter
+    """
+
+    def __init__(self, atn, data, context_cache=None):
+        self.atn = atn
+        self.contexts = []
+        for entry in data["contexts"]:
+            if entry[0] == "e":
+                ctx = PredictionContext.EMPTY
+            elif entry[0] == "s":
+                ctx = SingletonPredictionContext.create(self._context(entry[1]), entry[2])
+            else:
+                ctx = ArrayPredictionContext([self._context(p) for p in entry[1]], list(entry[2]))
+            if context_cache is not None:
+                ctx = context_cache.add(ctx)
+            self.contexts.append(ctx)
+        self.semantics = []
+        for entry in data["semantics"]:
+            if entry[0] == "n":
+                sem = SemanticContext.NONE
+            elif entry[0] == "P":
+                sem = PrecedencePredicate(entry[1])
+            elif entry[0] == "p":
+                sem = Predicate(entry[1], entry[2], entry[3])
+            else:
+                sem = (AND if entry[0] == "&" else OR).__new__(AND if entry[0] == "&" else OR)
+                sem.opnds = [self.semantics[i] for i in entry[1]]
+            self.semantics.append(sem)
+        self.executors = [LexerActionExecutor([atn.lexerActions[i] for i in actions])
+                          for actions in data["executors"]]
+
+    def _context(self, idx):
+        return None if idx == -1 else self.contexts[idx]
+
+    def _executor(self, idx):
+        return None if idx == -1 else self.executors[idx]
+
+    def config(self, entry):
+        state = self.atn.states[entry[0]]
+        if len(entry) > 6:
+            cfg = LexerATNConfig(state, entry[1], self._context(entry[2]), self.semantics[entry[3]],
+                                 self._executor(entry[6]))
+            cfg.passedThroughNonGreedyDecision = entry[7]
+        else:
+            cfg = ATNConfig(state, entry[1], self._context(entry[2]), self.semantics[entry[3]])
+        cfg.reachesIntoOuterContext = entry[4]
+        cfg.precedenceFilterSuppressed = entry[5]
+        return cfg
+
+    def fill(self, dfa, entry):
+        decision, precedenceDfa, s0, states = entry
+        if decision != dfa.decision or precedenceDfa != dfa.precedenceDfa:
+            raise ValueError("dfa cache does not match decision %d" % dfa.decision)
+
+        by_number = {ATNSimulator.ERROR.stateNumber: ATNSimulator.ERROR}
+        for (stateNumber, configs, flags, edges, isAcceptState, prediction, executor,
+             requiresFullContext, predicates) in states:
+            configset = ATNConfigSet(flags[0])
+            for c in configs:
+                configset.configs.append(self.config(c))
+            configset.uniqueAlt = flags[1]
+            configset.conflictingAlts = set(flags[2]) if flags[2] is not None else None
+            configset.hasSemanticContext = flags[3]
+            configset.dipsIntoOuterContext = flags[4]
+            configset.setReadonly(True)
+
+            state = DFAState(stateNumber, configset)
+            state.edges = edges
+            state.isAcceptState = isAcceptState
+            state.prediction = prediction
+            state.lexerActionExecutor = self._executor(executor)
+            state.requiresFullContext = requiresFullContext
+            if predicates is not None:
+                state.predicates = [PredPrediction(self.semantics[p], alt) for p, alt in predicates]
+            by_number[stateNumber] = state
+
+        # resolve edges once all states exist
+        for state in by_number.values():
+            if state.edges is not None and state is not ATNSimulator.ERROR:
+                state.edges = [None if e == -1 else by_number[e] for e in state.edges]
+
+        dfa._states = dict((s, s) for n, s in by_number.items() if s is not ATNSimulator.ERROR)
+        if precedenceDfa:
+            dfa.s0.edges = [None if e == -1 else by_number[e] for e in s0[1]]
+        else:
+            dfa.s0 = None if s0[1] == -1 else by_number[s0[1]]
+
+
+def save_dfa_cache(path):
+    """
+    Write the DFA states learned so far by the lexers and SolidityParser to path.
+
+    :param path: file to write (replaced atomically)
+    :return: None
+    """
+    data = {
+        "format": FORMAT_VERSION,
+        "antlr": ANTLR_RUNTIME_VERSION,
+        "grammar": grammar_hash(),
+    }
+    for name, recognizer in _recognizers():
+        data[name] = _DFAWriter(recognizer.atn).dump(recognizer.decisionsToDFA)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".dfacache-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_dfa_cache(path):
+    """
+    Replace the DFA states of the lexers and SolidityParser with the ones stored in path.
+
+    Call this at startup before parsing. Files written for a different grammar, antlr runtime
+    or cache format are ignored.
+
+    :param path: file written by save_dfa_cache()
+    :return: True if the cache was loaded, False if it does not exist or is stale
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if (not isinstance(data, dict)
+            or data.get("format") != FORMAT_VERSION
+            or data.get("antlr") != ANTLR_RUNTIME_VERSION
+            or data.get("grammar") != grammar_hash()):
+        return False
+
+    recognizers = _recognizers()
+    # check all entries before touching any DFA, a stale file must not leave a mixed cache behind
+    for name, recognizer in recognizers:
+        entries = data.get(name)
+        if not isinstance(entries, dict) or len(entries.get("dfas", ())) != len(recognizer.decisionsToDFA):
+            return False
+
+    for name, recognizer in recognizers:
+        context_cache = recognizer.sharedContextCache if name == "parser" else None
+        entries = data[name]
+        reader = _DFAReader(recognizer.atn, entries, context_cache)
+        for dfa, entry in zip(recognizer.decisionsToDFA, entries["dfas"]):
+            reader.fill(dfa, entry)
+    return True
+
+
+class DFACacheManager(object):
+    """
+    Observe and bound the class level DFA / prediction context caches.
+
+    Ceilings are expressed in cache entries (DFA states over all decisions and entries
+    of ``SolidityParser.sharedContextCache``) which is what drives their memory use.
+    When a ceiling is exceeded the caches are cleared according to policy:
+
+        "reset" ... clear all lexer and parser DFAs and the context cache
+        "evict" ... clear the largest decisions until the DFA states are at half the ceiling
+                    (and the context cache)
+    """
+
+    POLICIES = ("reset", "evict")
+
+    def __init__(self, max_dfa_states=None, max_context_entries=None, policy="reset", check_interval=1,
+                 on_snapshot=None):
+        """
+        :param max_dfa_states: ceiling for the number of parser and lexer DFA states (None = unbounded)
+        :param max_context_entries: ceiling for the number of cached prediction contexts (None = unbounded)
+        :param policy: "reset" or "evict"
+        :param check_interval: check the ceilings every n-th finished parse
+        :param on_snapshot: optional callable receiving every stats snapshot taken by snapshot()
+        """
+        if policy not in self.POLICIES:
+            raise ValueError("unknown policy %r (expected one of %s)" % (policy, ", ".join(self.POLICIES)))
+        self.max_dfa_states = max_dfa_states
+        self.max_context_entries = max_context_entries
+        self.policy = policy
+        self.check_interval = max(1, check_interval)
+        self.on_snapshot = on_snapshot
+        self.parses = 0
+        self.resets = 0
+
+    @staticmethod
+    def _states(recognizer):
+        return [len(dfa.states) for dfa in recognizer.decisionsToDFA]
+
+    def stats(self):
+        """
+        :return: dict with the current cache sizes
+        """
+        SolidityLexer, SolidityParser = grammar.load()
+        from solidity_parser.lexer import SkipHiddenLexer
+
+        parser_states = self._states(SolidityParser)
+        lexer_states = self._states(SolidityLexer) + self._states(SkipHiddenLexer)
+        return {
+            "dfa_states": sum(parser_states) + sum(lexer_states),
+            "parser_dfa_states": sum(parser_states),
+            "lexer_dfa_states": sum(lexer_states),
+            "decision_states": dict((decision, n) for decision, n in enumerate(parser_states) if n),
+            "context_cache_entries": len(SolidityParser.sharedContextCache),
+            "parses": self.parses,
+            "resets": self.resets,
+        }
+
+    def snapshot(self):
+        """
+        take a stats snapshot and hand it to the on_snapshot hook
+
+        :return: stats dict
+        """
+        stats = self.stats()
+        if self.on_snapshot is not None:
+            self.on_snapshot(stats)
+        return stats
+
+    def over_limit(self, stats):
+        if self.max_dfa_states is not None and stats["dfa_states"] > self.max_dfa_states:
+            return True
+        if self.max_context_entries is not None and stats["context_cache_entries"] > self.max_context_entries:
+            return True
+        return False
+
+    def reset(self):
+        """
+        clear the caches according to policy. Must not run while another thread is parsing,
+        use check() or let parse() trigger it instead.
+        """
+        recognizers = dict(_recognizers())
+        if self.policy == "evict" and self.max_dfa_states is not None:
+            target = self.max_dfa_states // 2
+            dfas = [dfa for recognizer in recognizers.values() for dfa in recognizer.decisionsToDFA]
+            total = sum(len(dfa.states) for dfa in dfas)
+            for dfa in sorted(dfas, key=lambda d: len(d.states), reverse=True):
+                if total <= target:
+                    break
+                total -= len(dfa.states)
+                _clear_dfa(dfa)
+        else:
+            for recognizer in recognizers.values():
+                for dfa in recognizer.decisionsToDFA:
+                    _clear_dfa(dfa)
+        recognizers["parser"].sharedContextCache.cache.clear()
+        self.resets += 1
+
+    def check(self):
+        """
+        snapshot the stats and reset the caches if they exceed a ceiling
+
+        :return: True if the caches were cleared
+        """
+        with _lock:
+            if _active_parses:
+                return False
+            return self._check()
+
+    def _check(self):
+        stats = self.snapshot()
+        if not self.over_limit(stats):
+            return False
+        self.reset()
+        return True
+
+    def _parse_finished(self, idle):
+        self.parses += 1
+        if idle and self.parses % self.check_interval == 0:
+            self._check()
+
+
+def _clear_dfa(dfa):
+    dfa.__init__(dfa.atnStartState, dfa.decision)
+
+
+_lock = threading.Lock()
+_active_parses = 0
+_manager = None
+
+
+def set_cache_manager(manager):
+    """
+    install a DFACacheManager that is consulted after each parse (None to uninstall)
+
+    :param manager: DFACacheManager or None
+    :return: previously installed manager
+    """
+    global _manager
+    with _lock:
+        previous, _manager = _manager, manager
+    return previous
+
+
+def get_cache_manager():
+    return _manager
+
+
+@contextlib.contextmanager
+def tracked_parse():
+    """
+    context manager wrapped around every parse so the installed manager only
+    clears caches while no parse is in flight
+    """
+    global _active_parses
+    with _lock:
+        _active_parses += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _active_parses -= 1
+            if _manager is not None:
+                _manager._parse_finished(_active_parses == 0)
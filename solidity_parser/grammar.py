@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Lazy loading of the generated ANTLR lexer and parser.
+
+Importing ``solidity_antlr4.SolidityLexer`` / ``SolidityParser`` deserializes their ATNs
+(``ATNDeserializer().deserialize(serializedATN())`` in the class bodies), which together
+with the antlr runtime is most of the import time of this package. ``import solidity_parser``
+therefore does not import them; ``load()`` does on first use (``parse()``, ``dfacache``, ...).
+
+Optionally the deserialized ATNs can be prebuilt into a pickle which loads faster than
+deserializing them again:
+
+    python -m solidity_parser.grammar  # writes ATN_CACHE_PATH
+
+``load()`` picks the file up automatically. It is keyed by a hash of the serialized ATNs and
+the antlr runtime version, so a regenerated grammar just ignores a stale file.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+FORMAT_VERSION = 1
+ANTLR_RUNTIME_VERSION = "4.9.3"
+
+ATN_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solidity_antlr4", "SolidityATN.pickle")
+
+_lock = threading.RLock()
+_recognizers = None
+
+
+def _singletons():
+    """
+    :return: runtime singletons the ATNs may reference, pickled by name so they stay the same objects
+    """
+    from antlr4.atn.LexerAction import LexerSkipAction, LexerMoreAction, LexerPopModeAction
+    from antlr4.atn.SemanticContext import SemanticContext
+
+    return {
+        "LexerSkipAction": LexerSkipAction.INSTANCE,
+        "LexerMoreAction": LexerMoreAction.INSTANCE,
+        "LexerPopModeAction": LexerPopModeAction.INSTANCE,
+        "SemanticContext.NONE": SemanticContext.NONE,
+    }
+
+
+def _atn_key(serialized):
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class _ATNPickler(pickle.Pickler):
+
+    def __init__(self, f):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._names = dict((id(obj), name) for name, obj in _singletons().items())
+
+    def persistent_id(self, obj):
+        return self._names.get(id(obj))
+
+
+class _ATNUnpickler(pickle.Unpickler):
+
+    def __init__(self, f):
+        super().__init__(f)
+        self._objects = _singletons()
+
+    def persistent_load(self, pid):
+        return self._objects[pid]
+
+
+def _load_atn_cache(path):
+    """
+    :return: dict of serialized ATN hash -> ATN, empty if path is missing, stale or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            data = _ATNUnpickler(f).load()
+    except Exception:
+        return {}
+    if (not isinstance(data, dict)
+            or data.get("format") != FORMAT_VERSION
+            or data.get("antlr") != ANTLR_RUNTIME_VERSION):
+        return {}
+    return data["atns"]
+
+
+def build_atn_cache(path=ATN_CACHE_PATH):
+    """
+    Deserialize the lexer and parser ATNs and pickle them to path.
+
+    :param path: file to write (replaced atomically)
+    :return: None
+    """
+    from antlr4.atn.ATNDeserializer import ATNDeserializer
+    from solidity_parser.solidity_antlr4 import SolidityLexer, SolidityParser
+
+    atns = {}
+    for module in (SolidityLexer, SolidityParser):
+        serialized = module.serializedATN()
+        atns[_atn_key(serialized)] = ATNDeserializer().deserialize(serialized)
+
+    # the ATN graph is deeply linked; pickling it recurses along the transitions
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 100000))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".atncache-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _ATNPickler(f).dump({"format": FORMAT_VERSION, "antlr": ANTLR_RUNTIME_VERSION, "atns": atns})
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def load():
+    """
+    import the generated lexer and parser (once), using the prebuilt ATNs at ATN_CACHE_PATH if available
+
+    :return: (SolidityLexer, SolidityParser) classes
+    """
+    global _recognizers
+    if _recognizers is not None:
+        return _recognizers
+
+    with _lock:
+        if _recognizers is None:
+            from antlr4.atn.ATNDeserializer import ATNDeserializer
+
+            atns = _load_atn_cache(ATN_CACHE_PATH)
+            deserialize = ATNDeserializer.deserialize
+
+            def prebuilt_deserialize(self, data):
+                atn = atns.pop(_atn_key(data), None)
+                return atn if atn is not None else deserialize(self, data)
+
+            # the generated class bodies call ATNDeserializer().deserialize(serializedATN())
+            ATNDeserializer.deserialize = prebuilt_deserialize
+            try:
+                from solidity_parser.solidity_antlr4.SolidityLexer import SolidityLexer
+                from solidity_parser.solidity_antlr4.SolidityParser import SolidityParser
+            finally:
+                ATNDeserializer.deserialize = deserialize
+            _recognizers = SolidityLexer, SolidityParser
+    return _recognizers
+
+
+if __name__ == "__main__":
+    build_atn_cache(sys.argv[1] if len(sys.argv) > 1 else ATN_CACHE_PATH)
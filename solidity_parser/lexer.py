@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Alternative lexers producing the same tokens as the generated ``SolidityLexer``.
+
+``SkipHiddenLexer`` drops comments at the source. The grammar puts comments on the HIDDEN
+channel; ``CommonTokenStream`` never hands them to the parser, but it still buffers a
+``CommonToken`` for each of them. ``SkipHiddenLexer`` runs the same ATN with the
+``channel(HIDDEN)`` actions replaced by ``skip``, so those tokens are never created. It has
+its own DFA (the cached lexer actions differ), which dfacache saves, restores and bounds
+along with the others.
+
+``RegexLexer`` (and ``SkipHiddenRegexLexer``) scan the input with one master regular
+expression instead of simulating the lexer ATN in Python, which is several times faster.
+They emit the same token types, text, channels, positions and line/column information.
+Keywords, punctuation and other fixed words are taken from the ATN; the remaining token
+rules (numbers, strings, comments, ...) are spelled out as regular expressions that mirror
+the grammar. Wherever the expression does not match (i.e. at lexer errors) they hand the
+next token over to the ATN simulation, so errors are reported and recovered from exactly
+like ``SolidityLexer`` does.
+"""
+
+import copy
+import re
+import sys
+
+from antlr4.Token import Token, CommonToken
+from antlr4.atn.ATNState import RuleStopState
+from antlr4.atn.LexerAction import LexerChannelAction, LexerSkipAction
+from antlr4.atn.Transition import AtomTransition, RangeTransition, SetTransition, NotSetTransition
+from antlr4.dfa.DFA import DFA
+
+from solidity_parser import grammar
+
+SolidityLexer, _ = grammar.load()
+
+
+class _SkipHiddenAction(LexerSkipAction):
+    """
+    skip action that counts the tokens it drops
+    """
+
+    def execute(self, lexer):
+        lexer.skip()
+        lexer.hidden_tokens += 1
+
+
+def _skip_hidden_atn(atn):
+    """
+    :return: shallow copy of the lexer atn whose channel(HIDDEN) actions skip the token instead
+    """
+    skip_hidden = _SkipHiddenAction()
+    atn = copy.copy(atn)
+    atn.lexerActions = [skip_hidden if isinstance(action, LexerChannelAction) and action.channel == Token.HIDDEN_CHANNEL
+                        else action
+                        for action in atn.lexerActions]
+    return atn
+
+
+class SkipHiddenLexer(SolidityLexer):
+    """
+    SolidityLexer that skips HIDDEN channel tokens instead of emitting them.
+    hidden_tokens counts the tokens skipped since the last reset (i.e. for the current input).
+    """
+
+    atn = _skip_hidden_atn(SolidityLexer.atn)
+
+    decisionsToDFA = [DFA(ds, i) for i, ds in enumerate(atn.decisionToState)]
+
+    def __init__(self, input=None, output=sys.stdout):
+        self.hidden_tokens = 0
+        super().__init__(input, output)
+
+    def reset(self):
+        super().reset()
+        self.hidden_tokens = 0
+
+
+# token rules that are not fixed words, spelled like the grammar
+_DIGITS = r"[0-9](?:_?[0-9])*"
+_HEX_DIGITS = r"[0-9A-Fa-f](?:_?[0-9A-Fa-f])*"
+
+# alternatives of the master expression, in the order they are tried. Earlier alternatives
+# win over later ones matching the same input only where they match more of it (e.g. a
+# comment over the '/' operator), which gives ANTLR's longest match semantics.
+_RULES = (
+    ("WS", r"[\t\n\x0c\r ]+"),
+    ("COMMENT", r"/\*[\s\S]*?\*/"),
+    ("LINE_COMMENT", r"//[^\n\r]*"),
+    ("HexLiteralFragment", r"hex(?:\"(?:%s)?\"|'(?:%s)?')" % (_HEX_DIGITS, _HEX_DIGITS)),
+    ("StringLiteralFragment", r"(?:unicode)?(?:\"(?:[^\n\r\"\\]|\\[\s\S])*\"|'(?:[^\n\r'\\]|\\[\s\S])*')"),
+    ("word", r"[A-Za-z$_][A-Za-z0-9$_]*"),
+    ("VersionLiteral", r"[0-9]+\.[0-9]+\.[0-9]+"),  # two part versions lex as DecimalNumber
+    ("HexNumber", r"0[Xx]" + _HEX_DIGITS),
+    ("DecimalNumber", r"(?:{0}(?:\.{0})?|\.{0})(?:[Ee]{0})?".format(_DIGITS)),
+    ("punctuation", None),  # literal operators of the grammar, see _regex_tables()
+)
+
+# words of the Fixed/Ufixed rules that are not a finite list
+_FIXED = re.compile(r"(u?)fixed(?:[0-9]+x[0-9]+)?")
+
+_tables = None
+
+
+def _finite_language(atn, rule, limit=10000):
+    """
+    :return: set of all strings matched by a lexer rule, None if it is not a (small) finite set
+    """
+    stop = atn.ruleToStopState[rule]
+    words = set()
+    stack = [(atn.ruleToStartState[rule], "", frozenset())]
+    while stack:
+        state, prefix, path = stack.pop()
+        if state is stop or isinstance(state, RuleStopState):
+            words.add(prefix)
+            if len(words) > limit:
+                return None
+            continue
+        if state.stateNumber in path:
+            return None  # loop
+        path = path | {state.stateNumber}
+        for t in state.transitions:
+            if t.isEpsilon:
+                if t.serializationType != t.EPSILON and t.serializationType != t.ACTION:
+                    return None  # rule references, predicates
+                stack.append((t.target, prefix, path))
+            elif isinstance(t, AtomTransition):
+                stack.append((t.target, prefix + chr(t.label_), path))
+            elif isinstance(t, (RangeTransition, SetTransition)) and not isinstance(t, NotSetTransition):
+                chars = t.label
+                if len(chars) > 64:
+                    return None
+                for c in chars:
+                    stack.append((t.target, prefix + chr(c), path))
+            else:
+                return None
+    return words
+
+
+def _regex_tables():
+    """
+    :return: (master expression source, word -> token type, punctuation -> token type), built once from the ATN
+    """
+    global _tables
+    if _tables is None:
+        atn = SolidityLexer.atn
+        word = re.compile(dict(_RULES)["word"])
+        words = {}
+        punctuation = {}
+        for rule in range(len(SolidityLexer.ruleNames)):
+            ttype = atn.ruleToTokenType[rule]
+            if ttype <= 0:
+                continue  # fragment
+            language = _finite_language(atn, rule)
+            for text in language or ():
+                # the first rule matching a text wins, like in ANTLR
+                table = words if word.fullmatch(text) else punctuation
+                table.setdefault(text, ttype)
+
+        alternatives = []
+        for name, pattern in _RULES:
+            if pattern is None:
+                pattern = "|".join(re.escape(p) for p in sorted(punctuation, key=len, reverse=True))
+            alternatives.append("(%s)" % pattern)
+        _tables = "|".join(alternatives), words, punctuation
+    return _tables
+
+
+_new_token = CommonToken.__new__
+
+
+class _RegexLexerMixin(object):
+    """
+    nextToken() of RegexLexer and SkipHiddenRegexLexer
+    """
+
+    def reset(self):
+        super().reset()
+        self._tokens = None
+
+    def nextToken(self):
+        if self._tokens is None:
+            self._tokens = self._scan()
+        return next(self._tokens)
+
+    def _scan(self):
+        source, words, punctuation = _regex_tables()
+        data = self._input.strdata
+        decode = not isinstance(data, str)
+        if decode:
+            source = source.encode("ascii")
+        match = re.compile(source).match
+        fixed = _FIXED.fullmatch
+        newline = b"\n" if decode else "\n"
+        count = getattr(data, "count", None)
+        if count is None:
+            def count(sub, start, end):  # mmap
+                return data[start:end].count(sub)
+
+        # group index -> kind, see _RULES
+        WS, COMMENT, LINE_COMMENT, HEX_LITERAL, STRING, WORD, VERSION, HEX_NUMBER, DECIMAL, PUNCTUATION = range(1, 11)
+        types = {
+            COMMENT: self.COMMENT,
+            LINE_COMMENT: self.LINE_COMMENT,
+            HEX_LITERAL: self.HexLiteralFragment,
+            STRING: self.StringLiteralFragment,
+            VERSION: self.VersionLiteral,
+            HEX_NUMBER: self.HexNumber,
+            DECIMAL: self.DecimalNumber,
+        }
+        identifier = self.Identifier
+        default_channel = Token.DEFAULT_CHANNEL
+        hidden_channel = Token.HIDDEN_CHANNEL
+        skip_hidden = self.skip_hidden
+        pair = self._tokenFactorySourcePair
+        interp = self._interp
+
+        size = len(data)
+        pos = 0
+        line = 1
+        line_start = 0  # index of the first character of the current line
+        while pos < size:
+            m = match(data, pos)
+            if m is None:
+                # no token starts here: let the ATN simulation report the error and lex the next token
+                self._input.seek(pos)
+                interp.line = line
+                interp.column = pos - line_start
+                token = super().nextToken()
+                pos = self._input.index
+                line = interp.line
+                line_start = pos - interp.column
+                yield token
+                if token.type == Token.EOF:
+                    while True:
+                        yield token
+                continue
+
+            kind = m.lastindex
+            end = m.end()
+            if kind == WS or kind == COMMENT or kind == STRING:
+                lines = count(newline, pos, end)
+                if kind == WS or (kind == COMMENT and skip_hidden):
+                    if kind == COMMENT:
+                        self.hidden_tokens += 1
+                    if lines:
+                        line += lines
+                        line_start = data.rfind(newline, pos, end) + 1
+                    pos = end
+                    continue
+            else:
+                lines = 0
+
+            text = m.group()
+            if decode:
+                text = text.decode("ascii")
+            if kind == WORD:
+                ttype = words.get(text)
+                if ttype is None:
+                    f = fixed(text)
+                    ttype = identifier if f is None else (self.Ufixed if f.group(1) else self.Fixed)
+                channel = default_channel
+            elif kind == PUNCTUATION:
+                ttype = punctuation[text]
+                channel = default_channel
+            elif kind == LINE_COMMENT:
+                if skip_hidden:
+                    self.hidden_tokens += 1
+                    pos = end
+                    continue
+                ttype = self.LINE_COMMENT
+                channel = hidden_channel
+            else:
+                ttype = types[kind]
+                channel = hidden_channel if kind == COMMENT else default_channel
+
+            token = _new_token(CommonToken)
+            token.source = pair
+            token.type = ttype
+            token.channel = channel
+            token.start = pos
+            token.stop = end - 1
+            token.tokenIndex = -1
+            token.line = line
+            token.column = pos - line_start
+            token._text = text
+            yield token
+
+            if lines:
+                line += lines
+                line_start = data.rfind(newline, pos, end) + 1
+            pos = end
+
+        self._input.seek(size)
+        interp.line = line
+        interp.column = size - line_start
+        token = self.emitEOF()
+        while True:
+            yield token
+
+
+class RegexLexer(_RegexLexerMixin, SolidityLexer):
+    """
+    SolidityLexer scanning with a regular expression (see module docstring)
+    """
+
+    skip_hidden = False
+
+    def __init__(self, input=None, output=sys.stdout):
+        self._tokens = None
+        super().__init__(input, output)
+
+
+class SkipHiddenRegexLexer(_RegexLexerMixin, SkipHiddenLexer):
+    """
+    SkipHiddenLexer scanning with a regular expression (see module docstring)
+    """
+
+    skip_hidden = True
+
+    def __init__(self, input=None, output=sys.stdout):
+        self._tokens = None
+        super().__init__(input, output)
+
+
+# lexer class by (name, keep comments)
+LEXERS = {
+    ("antlr", True): SolidityLexer,
+    ("antlr", False): SkipHiddenLexer,
+    ("regex", True): RegexLexer,
+    ("regex", False): SkipHiddenRegexLexer,
+}
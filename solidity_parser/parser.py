@@ -5,33 +5,52 @@
 # derived from https://github.com/federicobond/solidity-parser-antlr/
 #
 
+import array
+import bisect
+import collections
+import collections.abc
+import copyreg
+import functools
+import os
+import re
+import warnings
+
+
+class _NodeType(type):
+    """
+    metaclass of Node, keeps the removed Node.ENABLE_LOC switch as a deprecated no-op
+    """
 
-from antlr4 import *
-from solidity_parser.solidity_antlr4.SolidityLexer import SolidityLexer
-from solidity_parser.solidity_antlr4.SolidityParser import SolidityParser
-from solidity_parser.solidity_antlr4.SolidityVisitor import SolidityVisitor
+    @property
+    def ENABLE_LOC(cls):
+        warnings.warn("Node.ENABLE_LOC is ignored, pass loc to parse() instead", DeprecationWarning, stacklevel=2)
+        return False
 
+    @ENABLE_LOC.setter
+    def ENABLE_LOC(cls, value):
+        warnings.warn("Node.ENABLE_LOC is ignored, pass loc to parse() instead", DeprecationWarning, stacklevel=2)
 
-class Node(dict):
+
+class Node(dict, metaclass=_NodeType):
     """
     provide a dict interface and object attrib access
     """
-    ENABLE_LOC = False
     NONCHILD_KEYS = ("type","name","loc")
 
     def __init__(self, ctx, **kwargs):
         for k, v in kwargs.items():
             self[k] = v
 
-        if Node.ENABLE_LOC:
-            self["loc"] = Node._get_loc(ctx)
-
     def __getattr__(self, item):
         return self[item]  # raise exception if attribute does not exist
 
     def __setattr__(self, name, value):
         self[name] = value
 
+    def __reduce__(self):
+        # pickle as plain dict items; the default protocol looks up __getstate__ which __getattr__ turns into a KeyError
+        return copyreg.__newobj__, (self.__class__,), None, None, iter(self.items())
+
     @staticmethod
     def _get_loc(ctx):
         return {
@@ -46,1033 +65,1000 @@ class Node(dict):
         }
 
 
-class AstVisitor(SolidityVisitor):
+# fields of every node type built by AstVisitor (besides "type" and "loc"), in construction order
+NODE_FIELDS = {
+    'SourceUnit': ('children',),
+    'EnumDefinition': ('name', 'members'),
+    'EnumValue': ('name',),
+    'TypeDefinition': ('typeKeyword', 'elementaryTypeName'),
+    'CustomErrorDefinition': ('name', 'parameterList'),
+    'FileLevelConstant': ('name', 'typeName', 'ConstantKeyword'),
+    'UsingForDeclaration': ('typeName', 'libraryName'),
+    'InheritanceSpecifier': ('baseName', 'arguments'),
+    'FunctionDefinition': ('name', 'parameters', 'returnParameters', 'body', 'visibility', 'modifiers',
+                           'isConstructor', 'isFallback', 'isReceive', 'stateMutability'),
+    'ParameterList': ('parameters',),
+    'Parameter': ('typeName', 'name', 'storageLocation', 'isStateVar', 'isIndexed'),
+    'ModifierInvocation': ('name', 'arguments'),
+    'ElementaryTypeNameExpression': ('typeName',),
+    'FunctionTypeName': ('parameterTypes', 'returnTypes', 'visibility', 'stateMutability'),
+    'FunctionCall': ('expression', 'arguments', 'names'),
+    'EmitStatement': ('eventCall',),
+    'ThrowStatement': (),
+    'StructDefinition': ('name', 'members'),
+    'VariableDeclaration': ('typeName', 'name', 'storageLocation', 'isStateVar', 'isIndexed', 'expression',
+                            'visibility', 'isDeclaredConst'),
+    'WhileStatement': ('condition', 'body'),
+    'DoWhileStatement': ('condition', 'body'),
+    'IfStatement': ('condition', 'TrueBody', 'FalseBody'),
+    'TryStatement': ('expression', 'block', 'returnParameters', 'catchClause'),
+    'CatchClause': ('identifier', 'parameterList', 'block'),
+    'UserDefinedTypeName': ('namePath',),
+    'ElementaryTypeName': ('name', 'stateMutability'),
+    'Block': ('statements',),
+    'SkippedBlock': ('range', 'tokenRange'),
+    'ExpressionStatement': ('expression',),
+    'NumberLiteral': ('number', 'subdenomination'),
+    'Mapping': ('keyType', 'valueType'),
+    'ModifierDefinition': ('name', 'parameters', 'body'),
+    'UncheckedStatement': ('body',),
+    'RevertStatement': ('functionCall',),
+    'StateVariableDeclaration': ('variables', 'initialValue'),
+    'ForStatement': ('initExpression', 'conditionExpression', 'loopExpression', 'body'),
+    'Identifier': ('name',),
+    'TupleExpression': ('components', 'isArray'),
+    'VariableDeclarationStatement': ('variables', 'initialValue'),
+    'EventDefinition': ('name', 'parameters', 'isAnonymous'),
+    'InLineAssemblyStatement': ('language', 'body'),
+    'AssemblyBlock': ('operations',),
+    'AssemblyMember': ('name',),
+    'AssemblyExpression': ('functionName', 'arguments'),
+    'AssemblySwitch': ('expression', 'cases'),
+    'AssemblyLocalDefinition': ('names', 'expression'),
+    'AssemblyFunctionDefinition': ('name', 'arguments', 'returnArguments', 'body'),
+    'AssemblyAssignment': ('names', 'expression'),
+    'LabelDefinition': ('name',),
+    'AssemblyStackAssignment': ('name',),
+    'AssemblyFor': ('pre', 'condition', 'post', 'body'),
+    'AssemblyIf': ('condition', 'body'),
+    'PragmaDirective': ('name', 'value'),
+    'ImportDirective': ('path', 'symbolAliases', 'unitAlias'),
+    'ContractDefinition': ('name', 'baseContracts', 'subNodes', 'kind'),
+    'UserDefinedTypename': ('name',),
+    'ArrayTypeName': ('baseTypeName', 'length'),
+    'BooleanLiteral': ('value',),
+    'hexLiteral': ('value',),
+    'stringLiteral': ('value',),
+    'HexLiteral': ('value',),
+    'StringLiteral': ('value',),
+    'Break': (),
+    'Continue': (),
+    'DecimalNumber': ('value',),
+    'HexNumber': ('value',),
+    'AssemblyCase': ('block', 'value', 'default'),
+    'NewExpression': ('typeName',),
+    'UnaryOperation': ('operator', 'subExpression', 'isPrefix'),
+    'BinaryOperation': ('operator', 'left', 'right'),
+    'MemberAccess': ('expression', 'memberName'),
+    'IndexAccess': ('base', 'index'),
+    'Conditional': ('condition', 'TrueExpression', 'FalseExpression'),
+}
+
+
+# fields that may hold child nodes (or lists of child nodes), in visiting order. visit() only descends into these
+NODE_CHILD_FIELDS = {
+    'SourceUnit': ('children',),
+    'EnumDefinition': ('members',),
+    'EnumValue': (),
+    'TypeDefinition': ('elementaryTypeName',),
+    'CustomErrorDefinition': ('parameterList',),
+    'FileLevelConstant': ('typeName',),
+    'UsingForDeclaration': ('typeName',),
+    'InheritanceSpecifier': ('baseName', 'arguments'),
+    'FunctionDefinition': ('parameters', 'returnParameters', 'body', 'modifiers'),
+    'ParameterList': ('parameters',),
+    'Parameter': ('typeName',),
+    'ModifierInvocation': ('arguments',),
+    'ElementaryTypeNameExpression': ('typeName',),
+    'FunctionTypeName': ('parameterTypes', 'returnTypes'),
+    'FunctionCall': ('expression', 'arguments'),
+    'EmitStatement': ('eventCall',),
+    'ThrowStatement': (),
+    'StructDefinition': ('members',),
+    'VariableDeclaration': ('typeName', 'expression'),
+    'WhileStatement': ('condition', 'body'),
+    'DoWhileStatement': ('condition', 'body'),
+    'IfStatement': ('condition', 'TrueBody', 'FalseBody'),
+    'TryStatement': ('expression', 'block', 'returnParameters', 'catchClause'),
+    'CatchClause': ('identifier', 'parameterList', 'block'),
+    'UserDefinedTypeName': (),
+    'ElementaryTypeName': (),
+    'Block': ('statements',),
+    'SkippedBlock': (),
+    'ExpressionStatement': ('expression',),
+    'NumberLiteral': (),
+    'Mapping': ('keyType', 'valueType'),
+    'ModifierDefinition': ('parameters', 'body'),
+    'UncheckedStatement': ('body',),
+    'RevertStatement': ('functionCall',),
+    'StateVariableDeclaration': ('variables', 'initialValue'),
+    'ForStatement': ('initExpression', 'conditionExpression', 'loopExpression', 'body'),
+    'Identifier': (),
+    'TupleExpression': ('components',),
+    'VariableDeclarationStatement': ('variables', 'initialValue'),
+    'EventDefinition': ('parameters',),
+    'InLineAssemblyStatement': ('body',),
+    'AssemblyBlock': ('operations',),
+    'AssemblyMember': (),
+    'AssemblyExpression': ('arguments',),
+    'AssemblySwitch': ('expression', 'cases'),
+    'AssemblyLocalDefinition': ('names', 'expression'),
+    'AssemblyFunctionDefinition': ('arguments', 'returnArguments', 'body'),
+    'AssemblyAssignment': ('names', 'expression'),
+    'LabelDefinition': (),
+    'AssemblyStackAssignment': (),
+    'AssemblyFor': ('pre', 'condition', 'post', 'body'),
+    'AssemblyIf': ('condition', 'body'),
+    'PragmaDirective': (),
+    'ImportDirective': (),
+    'ContractDefinition': ('baseContracts', 'subNodes'),
+    'UserDefinedTypename': (),
+    'ArrayTypeName': ('baseTypeName', 'length'),
+    'BooleanLiteral': (),
+    'hexLiteral': (),
+    'stringLiteral': (),
+    'HexLiteral': (),
+    'StringLiteral': (),
+    'Break': (),
+    'Continue': (),
+    'DecimalNumber': (),
+    'HexNumber': (),
+    'AssemblyCase': ('block', 'value'),
+    'NewExpression': ('typeName',),
+    'UnaryOperation': ('subExpression',),
+    'BinaryOperation': ('left', 'right'),
+    'MemberAccess': ('expression',),
+    'IndexAccess': ('base', 'index'),
+    'Conditional': ('condition', 'TrueExpression', 'FalseExpression'),
+}
+
+# attribute lookup that does not fall back to SlotNode.__getattr__ for unset slots
+_get_slot = object.__getattribute__
+
+
+class SlotNode(object):
+    """
+    compact alternative to Node (parse(..., nodes="slots")).
 
-    def _mapCommasToNulls(self, children):
-        if not children or len(children) == 0:
-            return []
+    There is one generated __slots__ class per node type (see NODE_CLASSES) with the fixed set
+    of fields listed in NODE_FIELDS. Nodes provide the same dict (node["key"], .items(), .get(), ...)
+    and attribute (node.key) interface as Node. Fields that were not set for a node behave like
+    missing dict keys.
+    """
+    __slots__ = ()
+    NONCHILD_KEYS = Node.NONCHILD_KEYS
 
-        values = []
-        comma = True
+    type = None
+    _fields = ()
+    _fieldset = frozenset()
+
+    def __getattr__(self, item):
+        # only called for unset fields and unknown attributes
+        if item.startswith("__"):
+            raise AttributeError(item)
+        raise KeyError(item)  # raise exception if attribute does not exist (like Node)
+
+    def __getitem__(self, item):
+        if item not in self._fieldset:
+            raise KeyError(item)
+        try:
+            return _get_slot(self, item)
+        except AttributeError:
+            raise KeyError(item)
+
+    def __setitem__(self, key, value):
+        if key == "type" or key not in self._fieldset:
+            raise KeyError("%s nodes have no field %r" % (self.type, key))
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, item):
+        if item not in self._fieldset:
+            return False
+        try:
+            _get_slot(self, item)
+        except AttributeError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [k for k, _ in self.items()]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+    def items(self):
+        result = [("type", self.type)]
+        for k in self._fields:
+            try:
+                result.append((k, _get_slot(self, k)))
+            except AttributeError:
+                pass
+        return result
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, SlotNode)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return _restore_slot_node, (self.type, self.items())
+
+
+def _make_slot_node_class(type_name, fields):
+    fields = tuple(fields) + ("loc",)
+    return type(type_name, (SlotNode,), {
+        "__slots__": fields,
+        "__module__": __name__,
+        "type": type_name,
+        "_fields": fields,
+        "_fieldset": frozenset(fields + ("type",)),
+    })
+
+
+NODE_CLASSES = dict((type_name, _make_slot_node_class(type_name, fields))
+                    for type_name, fields in NODE_FIELDS.items())
+
+
+def _restore_slot_node(type_name, items):
+    items = [(k, v) for k, v in items if k != "type"]
+    # the shape of a node does not include its loc, like in _create_located_slot_node()
+    cls = _slot_node_class(type_name, tuple(k for k, _ in items if k != "loc"))
+    node = cls.__new__(cls)
+    for k, v in items:
+        setattr(node, k, v)
+    return node
+
+
+# (type, field order) -> class, see _slot_node_class()
+_SLOT_NODE_SHAPES = {}
 
-        for el in children:
-            if comma:
-                if el.getText() == ',':
-                    values.append(None)
-                else:
-                    values.append(el)
-                    comma = False
-            else:
-                if el.getText() != ',':
-                    raise Exception('expected comma')
 
-                comma = True
+def _slot_node_class(type_name, keys):
+    """
+    returns the SlotNode class for a node of type_name built with the fields in keys (in that order).
 
-        if comma:
-            values.append(None)
+    Some node types are built with different field orders (e.g. VariableDeclaration). These get
+    slot-less subclasses of the type's class that only differ in _fields, so that items() and
+    friends keep the same key order as Node.
+    """
+    shape = (type_name, keys)
+    try:
+        return _SLOT_NODE_SHAPES[shape]
+    except KeyError:
+        pass
+
+    cls = NODE_CLASSES.get(type_name)
+    if cls is not None and cls._fieldset.issuperset(keys):
+        fields = keys + tuple(f for f in cls._fields if f not in keys)
+        if fields != cls._fields:
+            cls = type(type_name, (cls,), {"__slots__": (), "__module__": __name__, "_fields": fields})
+    else:
+        cls = None
+    _SLOT_NODE_SHAPES[shape] = cls
+    return cls
+
+
+def _create_located_node(location, ctx, **kwargs):
+    node = Node.__new__(Node)
+    dict.update(node, kwargs)  # what Node.__init__ does
+    node["loc"] = location(ctx)
+    return node
+
+
+def _create_slot_node(ctx, type, **kwargs):
+    cls = _slot_node_class(type, tuple(kwargs))
+    if cls is None:
+        # not a known node shape, keep the generic representation
+        return Node(ctx=ctx, type=type, **kwargs)
+
+    node = cls.__new__(cls)
+    for k, v in kwargs.items():
+        setattr(node, k, v)
+    return node
+
+
+def _create_located_slot_node(location, ctx, type, **kwargs):
+    cls = _slot_node_class(type, tuple(kwargs))
+    if cls is None:
+        return _create_located_node(location, ctx=ctx, type=type, **kwargs)
+
+    node = cls.__new__(cls)
+    for k, v in kwargs.items():
+        setattr(node, k, v)
+    node.loc = location(ctx)
+    return node
+
+
+# node factories by node representation: (without loc, with loc). The factory is picked per parse
+# (see _node_factory()), so parses with different loc settings can run at the same time (e.g. on a thread pool).
+_NODE_FACTORIES = {
+    "dict": (Node, _create_located_node),
+    "slots": (_create_slot_node, _create_located_slot_node),
+}
+
+
+def _node_factory(nodes, loc):
+    """
+    :param nodes: node representation, "dict" or "slots"
+    :param loc: False, True (loc dicts) or the _TokenPositions of the parse (SourceLocation objects, loc="lazy")
+    :return: function creating the nodes of a parse, called like Node(ctx=ctx, type=..., **fields)
+    """
+    if nodes not in _NODE_FACTORIES:
+        raise Exception("unknown node representation %r (expected 'dict' or 'slots')" % nodes)
+    create, create_located = _NODE_FACTORIES[nodes]
+    if isinstance(loc, _TokenPositions):
+        return functools.partial(create_located, loc.location)
+    if loc:
+        return functools.partial(create_located, Node._get_loc)
+    return create
 
-        return values
 
-    def _createNode(self, **kwargs):
-        ## todo: add loc!
-        return Node(**kwargs)
+class _Utf8Offsets(object):
+    """
+    maps the character offsets of a source with non-ASCII characters to the offsets of its utf-8 encoding
+    """
+    __slots__ = ("_positions", "_extra")
+
+    def __init__(self, text):
+        positions = self._positions = []
+        extra = self._extra = []  # bytes beyond one per character up to and including the one at positions[i]
+        total = 0
+        for m in re.finditer("[^\x00-\x7f]", text):
+            total += len(m.group().encode("utf-8", "surrogatepass")) - 1
+            positions.append(m.start())
+            extra.append(total)
 
-    def visit(self, tree):
+    @staticmethod
+    def of(text):
+        """
+        :return: _Utf8Offsets of text, None if its character and byte offsets are the same
         """
-        override the default visit to optionally accept a range of children nodes
+        if isinstance(text, str) and not text.isascii():
+            return _Utf8Offsets(text)
+        return None
+
+    def __call__(self, offset):
+        i = bisect.bisect_left(self._positions, offset)
+        return offset + (self._extra[i - 1] if i else 0)
+
+
+class _TokenPositions(object):
+    """
+    line, column and character offsets of the tokens of a parse, indexed by token index (parse(..., loc="lazy")).
 
-        :param tree:
-        :return:
+    Nodes only store the indexes of their first and last token in a SourceLocation. The positions
+    are copied from the token stream once the parse is complete, which does not keep the tokens alive.
+    """
+    __slots__ = ("lines", "columns", "starts", "stops", "utf8")
+
+    def __init__(self, utf8=None):
         """
-        if tree is None:
-            return None
-        elif isinstance(tree, list):
-            return self._visit_nodes(tree)
-        else:
-            return super().visit(tree)
+        :param utf8: _Utf8Offsets of the source, None if it is ASCII
+        """
+        self.lines = self.columns = self.starts = self.stops = None
+        self.utf8 = utf8
+
+    def location(self, ctx):
+        return SourceLocation(self, ctx.start.tokenIndex, ctx.stop.tokenIndex)
 
-    def _visit_nodes(self, nodes):
+    def fill(self, tokens):
+        """
+        :param tokens: all tokens of the parse, in token index order
         """
-        modified version of visitChildren() that returns an array of results
+        self.lines = array.array("l", [token.line for token in tokens])
+        self.columns = array.array("l", [token.column for token in tokens])
+        self.starts = array.array("l", [token.start for token in tokens])
+        self.stops = array.array("l", [token.stop for token in tokens])
 
-        :param nodes:
-        :return:
+
+class SourceLocation(collections.abc.Mapping):
+    """
+    location of a node built with parse(..., loc="lazy").
+
+    It stores the indexes of the node's first and last token and reads like the loc dict built by
+    loc=True ({'start': {'line': .., 'column': ..}, 'end': {...}}); the dicts are built on access.
+    Use dict(loc) where a real dict is required (e.g. for json.dumps()). range is the first and
+    last character offset of the node like the "range" of SkippedBlock nodes, src() the location
+    in solc's "start:length:fileIndex" format with utf-8 byte offsets.
+    """
+    __slots__ = ("_positions", "_first", "_last")
+
+    def __init__(self, positions, first, last):
         """
-        allresults = []
-        result = self.defaultResult()
-        for c in nodes:
-            childResult = c.accept(self)
-            result = self.aggregateResult(result, childResult)
-            allresults.append(result)
-        return allresults
-
-    # ********************************************************
-
-    def visitSourceUnit(self, ctx):
-        return Node(ctx=ctx,
-                    type="SourceUnit",
-                    children=self.visit(ctx.children[:-1]))  # skip EOF
-
-    def visitEnumDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type="EnumDefinition",
-                    name=ctx.identifier().getText(),
-                    members=self.visit(ctx.enumValue()))
-
-    def visitEnumValue(self, ctx):
-        return Node(ctx=ctx,
-                    type="EnumValue",
-                    name=ctx.identifier().getText())
-
-    def visitTypeDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type="TypeDefinition",
-                    typeKeyword=ctx.TypeKeyword().getText(),
-                    elementaryTypeName=self.visit(ctx.elementaryTypeName()))
-
-
-    def visitCustomErrorDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type="CustomErrorDefinition",
-                    name=self.visit(ctx.identifier()),
-                    parameterList=self.visit(ctx.parameterList()))
-
-    def visitFileLevelConstant(self, ctx):
-        return Node(ctx=ctx,
-                    type="FileLevelConstant",
-                    name=self.visit(ctx.identifier()),
-                    typeName=self.visit(ctx.typeName()),
-                    ConstantKeyword=self.visit(ctx.ConstantKeyword()))
-
-
-    def visitUsingForDeclaration(self, ctx: SolidityParser.UsingForDeclarationContext):
-        typename = None
-        if ctx.getChild(3) != '*':
-            typename = self.visit(ctx.getChild(3))
-
-        return Node(ctx=ctx,
-                    type="UsingForDeclaration",
-                    typeName=typename,
-                    libraryName=ctx.identifier().getText())
-
-    def visitInheritanceSpecifier(self, ctx: SolidityParser.InheritanceSpecifierContext):
-        return Node(ctx=ctx,
-                    type="InheritanceSpecifier",
-                    baseName=self.visit(ctx.userDefinedTypeName()),
-                    arguments=self.visit(ctx.expressionList()))
-
-    def visitContractPart(self, ctx: SolidityParser.ContractPartContext):
-        return self.visit(ctx.children[0])
-
-
-    def visitFunctionDefinition(self, ctx: SolidityParser.FunctionDefinitionContext):
-        isConstructor = isFallback =isReceive = False
-
-        fd = ctx.functionDescriptor()
-        if fd.ConstructorKeyword():
-            name = fd.ConstructorKeyword().getText()
-            isConstructor = True
-        elif fd.FallbackKeyword():
-            name = fd.FallbackKeyword().getText()
-            isFallback = True
-        elif fd.ReceiveKeyword():
-            name = fd.ReceiveKeyword().getText()
-            isReceive = True
-        elif fd.identifier():
-            name = fd.identifier().getText()
-        else:
-            name = ctx.getText()
-
-        parameters = self.visit(ctx.parameterList())
-        returnParameters = self.visit(ctx.returnParameters()) if ctx.returnParameters() else []
-        block = self.visit(ctx.block()) if ctx.block() else []
-        modifiers = [self.visit(i) for i in ctx.modifierList().modifierInvocation()]
-
-        if ctx.modifierList().ExternalKeyword(0):
-            visibility = "external"
-        elif ctx.modifierList().InternalKeyword(0):
-            visibility = "internal"
-        elif ctx.modifierList().PublicKeyword(0):
-            visibility = "public"
-        elif ctx.modifierList().PrivateKeyword(0):
-            visibility = "private"
+        :param positions: _TokenPositions of the parse
+        :param first: index of the node's first token
+        :param last: index of the node's last token
+        """
+        self._positions = positions
+        self._first = first
+        self._last = last
+
+    def __getitem__(self, key):
+        if key == "start":
+            i = self._first
+        elif key == "end":
+            i = self._last
         else:
-            visibility = 'default'
+            raise KeyError(key)
+        positions = self._positions
+        return {'line': positions.lines[i], 'column': positions.columns[i]}
 
-        if ctx.modifierList().stateMutability(0):
-            stateMutability = ctx.modifierList().stateMutability(0).getText()
-        else:
-            stateMutability = None
-
-        return Node(ctx=ctx,
-                    type="FunctionDefinition",
-                    name=name,
-                    parameters=parameters,
-                    returnParameters=returnParameters,
-                    body=block,
-                    visibility=visibility,
-                    modifiers=modifiers,
-                    isConstructor=isConstructor,
-                    isFallback=isFallback,
-                    isReceive=isReceive,
-                    stateMutability=stateMutability)
-
-    def visitReturnParameters(self, ctx: SolidityParser.ReturnParametersContext):
-        return self.visit(ctx.parameterList())
-
-    def visitParameterList(self, ctx: SolidityParser.ParameterListContext):
-        parameters = [self.visit(p) for p in ctx.parameter()]
-        return Node(ctx=ctx,
-                    type="ParameterList",
-                    parameters=parameters)
-
-    def visitParameter(self, ctx: SolidityParser.ParameterContext):
-
-        storageLocation = ctx.storageLocation().getText() if ctx.storageLocation() else None
-        name = ctx.identifier().getText() if ctx.identifier() else None
-
-        return Node(ctx=ctx,
-                    type="Parameter",
-                    typeName=self.visit(ctx.typeName()),
-                    name=name,
-                    storageLocation=storageLocation,
-                    isStateVar=False,
-                    isIndexed=False
-                    )
-
-    def visitModifierInvocation(self, ctx):
-        exprList = ctx.expressionList()
-
-        if exprList is not None:
-            args = self.visit(exprList.expression())
-        else:
-            args = []
-
-        return Node(ctx=ctx,
-                    type='ModifierInvocation',
-                    name=ctx.identifier().getText(),
-                    arguments=args)
-
-    def visitElementaryTypeNameExpression(self, ctx):
-        return Node(ctx=ctx,
-                    type='ElementaryTypeNameExpression',
-                    typeName=self.visit(ctx.elementaryTypeName()))
-
-    def visitTypeName(self, ctx):
-        if len(ctx.children) > 2:
-            length = None
-            if len(ctx.children) == 4:
-                length = self.visit(ctx.getChild(2))
-
-            return Node(ctx=ctx,
-                        type='ArrayTypeName',
-                        baseTypeName=self.visit(ctx.getChild(0)),
-                        length=length)
-
-        if len(ctx.children) == 2:
-            return Node(ctx=ctx,
-                        type='ElementaryTypeName',
-                        name=ctx.getChild(0).getText(),
-                        stateMutability=ctx.getChild(1).getText())
-
-        return self.visit(ctx.getChild(0))
-
-    def visitFunctionTypeName(self, ctx):
-        parameterTypes = [self.visit(p) for p in ctx.functionTypeParameterList(0).functionTypeParameter()]
-        returnTypes = []
-
-        if ctx.functionTypeParameterList(1):
-            returnTypes = [self.visit(p) for p in ctx.functionTypeParameterList(1).functionTypeParameter()]
-
-        visibility = 'default'
-        if ctx.InternalKeyword(0):
-            visibility = 'internal'
-        elif ctx.ExternalKeyword(0):
-            visibility = 'external'
-
-        stateMutability = None
-        if ctx.stateMutability(0):
-            stateMutability = ctx.stateMutability(0).getText()
-
-        return Node(ctx=ctx,
-                    type='FunctionTypeName',
-                    parameterTypes=parameterTypes,
-                    returnTypes=returnTypes,
-                    visibility=visibility,
-                    stateMutability=stateMutability)
-
-    def visitFunctionCall(self, ctx):
-        args = []
-        names = []
-
-        ctxArgs = ctx.functionCallArguments()
-
-        if ctxArgs.expressionList():
-            args = [self.visit(a) for a in ctxArgs.expressionList().expression()]
-
-        elif ctxArgs.nameValueList():
-            for nameValue in ctxArgs.nameValueList().nameValue():
-                args.append(self.visit(nameValue.expression()))
-                names.append(nameValue.identifier().getText())
-
-        return Node(ctx=ctx,
-                    type='FunctionCall',
-                    expression=self.visit(ctx.expression()),
-                    arguments=args,
-                    names=names)
-
-    def visitEmitStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='EmitStatement',
-                    eventCall=self.visit(ctx.getChild(1)))
-
-    def visitThrowStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='ThrowStatement')
-
-    def visitStructDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type='StructDefinition',
-                    name=ctx.identifier().getText(),
-                    members=self.visit(ctx.variableDeclaration()))
-
-    def visitVariableDeclaration(self, ctx):
-        storageLocation = None
-
-        if ctx.storageLocation():
-            storageLocation = ctx.storageLocation().getText()
-
-        return Node(ctx=ctx,
-                    type='VariableDeclaration',
-                    typeName=self.visit(ctx.typeName()),
-                    name=ctx.identifier().getText(),
-                    storageLocation=storageLocation)
-
-    def visitEventParameter(self, ctx):
-        storageLocation = None
-
-        # TODO: fixme
-
-        # if (ctx.storageLocation(0)):
-        #    storageLocation = ctx.storageLocation(0).getText()
-
-        return Node(ctx=ctx,
-                    type='VariableDeclaration',
-                    typeName=self.visit(ctx.typeName()),
-                    name=ctx.identifier().getText(),
-                    storageLocation=storageLocation,
-                    isStateVar=False,
-                    isIndexed=not not ctx.IndexedKeyword())
-
-    def visitFunctionTypeParameter(self, ctx):
-        storageLocation = None
-
-        if ctx.storageLocation():
-            storageLocation = ctx.storageLocation().getText()
-
-        return Node(ctx=ctx,
-                    type='VariableDeclaration',
-                    typeName=self.visit(ctx.typeName()),
-                    name=None,
-                    storageLocation=storageLocation,
-                    isStateVar=False,
-                    isIndexed=False)
-
-    def visitWhileStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='WhileStatement',
-                    condition=self.visit(ctx.expression()),
-                    body=self.visit(ctx.statement()))
-
-    def visitDoWhileStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='DoWhileStatement',
-                    condition=self.visit(ctx.expression()),
-                    body=self.visit(ctx.statement()))
-
-    def visitIfStatement(self, ctx):
-
-        TrueBody = self.visit(ctx.statement(0))
-
-        FalseBody = None
-        if len(ctx.statement()) > 1:
-            FalseBody = self.visit(ctx.statement(1))
-
-        return Node(ctx=ctx,
-                    type='IfStatement',
-                    condition=self.visit(ctx.expression()),
-                    TrueBody=TrueBody,
-                    FalseBody=FalseBody)
-
-    def visitTryStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='TryStatement',
-                    expression=self.visit(ctx.expression()),
-                    block=self.visit(ctx.block()),
-                    returnParameters=self.visit(ctx.returnParameters()),
-                    catchClause=self.visit(ctx.catchClause()))
-
-    def visitCatchClause(self, ctx):
-        return Node(ctx=ctx,
-                    type='CatchClause',
-                    identifier=self.visit(ctx.identifier()),
-                    parameterList=self.visit(ctx.parameterList()),
-                    block=self.visit(ctx.block()))
-
-    def visitUserDefinedTypeName(self, ctx):
-        return Node(ctx=ctx,
-                    type='UserDefinedTypeName',
-                    namePath=ctx.getText())
-
-    def visitElementaryTypeName(self, ctx):
-        return Node(ctx=ctx,
-                    type='ElementaryTypeName',
-                    name=ctx.getText())
-
-    def visitBlock(self, ctx):
-        return Node(ctx=ctx,
-                    type='Block',
-                    statements=self.visit(ctx.statement()))
-
-    def visitExpressionStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='ExpressionStatement',
-                    expression=self.visit(ctx.expression()))
-
-    def visitNumberLiteral(self, ctx):
-        number = ctx.getChild(0).getText()
-        subdenomination = None
-
-        if len(ctx.children) == 2:
-            subdenomination = ctx.getChild(1).getText()
-
-        return Node(ctx=ctx,
-                    type='NumberLiteral',
-                    number=number,
-                    subdenomination=subdenomination)
-
-    def visitMapping(self, ctx):
-        return Node(ctx=ctx,
-                    type='Mapping',
-                    keyType=self.visit(ctx.mappingKey()),
-                    valueType=self.visit(ctx.typeName()))
-
-    def visitModifierDefinition(self, ctx):
-        parameters = []
-
-        if ctx.parameterList():
-            parameters = self.visit(ctx.parameterList())
-
-        return Node(ctx=ctx,
-                    type='ModifierDefinition',
-                    name=ctx.identifier().getText(),
-                    parameters=parameters,
-                    body=self.visit(ctx.block()))
-
-    def visitStatement(self, ctx):
-        return self.visit(ctx.getChild(0))
-
-    def visitSimpleStatement(self, ctx):
-        return self.visit(ctx.getChild(0))
-
-    def visitUncheckedStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='UncheckedStatement',
-                    body=self.visit(ctx.block())) 
-
-    def visitRevertStatement(self, ctx):
-        return Node(ctx=ctx,
-                    type='RevertStatement',
-                    functionCall=self.visit(ctx.functionCall()))
-
-    def visitExpression(self, ctx):
-
-        children_length = len(ctx.children)
-        if children_length == 1:
-            return self.visit(ctx.getChild(0))
-
-        elif children_length == 2:
-            op = ctx.getChild(0).getText()
-            if op == 'new':
-                return Node(ctx=ctx,
-                            type='NewExpression',
-                            typeName=self.visit(ctx.typeName()))
-
-            if op in ['+', '-', '++', '--', '!', '~', 'after', 'delete']:
-                return Node(ctx=ctx,
-                            type='UnaryOperation',
-                            operator=op,
-                            subExpression=self.visit(ctx.getChild(1)),
-                            isPrefix=True)
-
-            op = ctx.getChild(1).getText()
-            if op in ['++', '--']:
-                return Node(ctx=ctx,
-                            type='UnaryOperation',
-                            operator=op,
-                            subExpression=self.visit(ctx.getChild(0)),
-                            isPrefix=False)
-        elif children_length == 3:
-            if ctx.getChild(0).getText() == '(' and ctx.getChild(2).getText() == ')':
-                return Node(ctx=ctx,
-                            type='TupleExpression',
-                            components=[self.visit(ctx.getChild(1))],
-                            isArray=False)
-
-            op = ctx.getChild(1).getText()
-
-            if op == ',':
-                return Node(ctx=ctx,
-                            type='TupleExpression',
-                            components=[
-                                self.visit(ctx.getChild(0)),
-                                self.visit(ctx.getChild(2))
-                            ],
-                            isArray=False)
-
-
-            elif op == '.':
-                expression = self.visit(ctx.getChild(0))
-                memberName = ctx.getChild(2).getText()
-                return Node(ctx=ctx,
-                            type='MemberAccess',
-                            expression=expression,
-                            memberName=memberName)
-
-            binOps = [
-                '+',
-                '-',
-                '*',
-                '/',
-                '**',
-                '%',
-                '<<',
-                '>>',
-                '&&',
-                '||',
-                '&',
-                '|',
-                '^',
-                '<',
-                '>',
-                '<=',
-                '>=',
-                '==',
-                '!=',
-                '=',
-                '|=',
-                '^=',
-                '&=',
-                '<<=',
-                '>>=',
-                '+=',
-                '-=',
-                '*=',
-                '/=',
-                '%='
-            ]
-
-            if op in binOps:
-                return Node(ctx=ctx,
-                            type='BinaryOperation',
-                            operator=op,
-                            left=self.visit(ctx.getChild(0)),
-                            right=self.visit(ctx.getChild(2)))
-
-        elif children_length == 4:
-
-            if ctx.getChild(1).getText() == '(' and ctx.getChild(3).getText() == ')':
-                args = []
-                names = []
-
-                ctxArgs = ctx.functionCallArguments()
-                if ctxArgs.expressionList():
-                    args = [self.visit(a) for a in ctxArgs.expressionList().expression()]
-                elif ctxArgs.nameValueList():
-                    for nameValue in ctxArgs.nameValueList().nameValue():
-                        args.append(self.visit(nameValue.expression()))
-                        names.append(nameValue.identifier().getText())
-
-                return Node(ctx=ctx,
-                            type='FunctionCall',
-                            expression=self.visit(ctx.getChild(0)),
-                            arguments=args,
-                            names=names)
-
-            if ctx.getChild(1).getText() == '[' and ctx.getChild(3).getText() == ']':
-                return Node(ctx=ctx,
-                            type='IndexAccess',
-                            base=self.visit(ctx.getChild(0)),
-                            index=self.visit(ctx.getChild(2)))
-
-        elif children_length == 5:
-            # ternary
-            if ctx.getChild(1).getText() == '?' and ctx.getChild(3).getText() == ':':
-                return Node(ctx=ctx,
-                            type='Conditional',
-                            condition=self.visit(ctx.getChild(0)),
-                            TrueExpression=self.visit(ctx.getChild(2)),
-                            FalseExpression=self.visit(ctx.getChild(4)))
-
-        return self.visit(list(ctx.getChildren()))
-
-
-    def visitStateVariableDeclaration(self, ctx):
-        type = self.visit(ctx.typeName())
-        iden = ctx.identifier()
-        name = iden.getText()
-
-        expression = None
-
-        if ctx.expression():
-            expression = self.visit(ctx.expression())
-
-        visibility = 'default'
-
-        if ctx.InternalKeyword(0):
-            visibility = 'internal'
-        elif ctx.PublicKeyword(0):
-            visibility = 'public'
-        elif ctx.PrivateKeyword(0):
-            visibility = 'private'
-
-        isDeclaredConst = False
-        if ctx.ConstantKeyword(0):
-            isDeclaredConst = True
-
-        decl = self._createNode(
-            ctx=ctx,
-            type='VariableDeclaration',
-            typeName=type,
-            name=name,
-            expression=expression,
-            visibility=visibility,
-            isStateVar=True,
-            isDeclaredConst=isDeclaredConst,
-            isIndexed=False)
-
-        return Node(ctx=ctx,
-                    type='StateVariableDeclaration',
-                    variables=[decl],
-                    initialValue=expression)
-
-    def visitForStatement(self, ctx):
-        conditionExpression = self.visit(ctx.expressionStatement()) if ctx.expressionStatement() else None
-
-        if conditionExpression:
-            conditionExpression = conditionExpression.expression
-
-        return Node(ctx=ctx,
-                    type='ForStatement',
-                    initExpression=self.visit(ctx.simpleStatement()),
-                    conditionExpression=conditionExpression,
-                    loopExpression=Node(ctx=ctx,
-                        type='ExpressionStatement',
-                        expression=self.visit(ctx.expression())),
-                    body=self.visit(ctx.statement())
-                    )
-
-    def visitPrimaryExpression(self, ctx):
-        if ctx.BooleanLiteral():
-            return Node(ctx=ctx,
-                        type='BooleanLiteral',
-                        value=ctx.BooleanLiteral().getText() == 'true')
-
-        if ctx.hexLiteral():
-            return Node(ctx=ctx,
-                        type='hexLiteral',
-                        value=ctx.hexLiteral().getText())
-
-        if ctx.stringLiteral():
-            text = ctx.getText()
-            return Node(ctx=ctx,
-                        type='stringLiteral',
-                        value=text[1: len(text) - 1])
-
-        if len(ctx.children) == 3 and ctx.getChild(1).getText() == '[' and ctx.getChild(2).getText() == ']':
-            node = self.visit(ctx.getChild(0))
-            if node.type == 'Identifier':
-                node = Node(ctx=ctx,
-                            type='UserDefinedTypeName',
-                            namePath=node.name)
-            else:
-                node = Node(ctx=ctx,
-                            type='ElementaryTypeName',
-                            name=ctx.getChild(0).getText())
-
-            return Node(ctx=ctx,
-                        type='ArrayTypeName',
-                        baseTypeName=node,
-                        length=None)
-
-        return self.visit(ctx.getChild(0))
-
-    def visitIdentifier(self, ctx):
-        return Node(ctx=ctx,
-                    type="Identifier",
-                    name=ctx.getText())
-
-    def visitTupleExpression(self, ctx):
-        children = ctx.children[1:-1]
-        components = [None if e is None else self.visit(e) for e in self._mapCommasToNulls(children)]
-
-        return Node(ctx=ctx,
-                    type='TupleExpression',
-                    components=components,
-                    isArray=ctx.getChild(0).getText() == '[')
-
-    def visitIdentifierList(self, ctx: SolidityParser.IdentifierListContext):
-        children = ctx.children[1:-1]
-
-        result = []
-        for iden in self._mapCommasToNulls(children):
-            if iden == None:
-                result.append(None)
-            else:
-                result.append(self._createNode(ctx=ctx,
-                                               type="VariableDeclaration",
-                                               name=iden.getText(),
-                                               isStateVar=False,
-                                               isIndexed=False,
-                                               iden=iden))
+    def __iter__(self):
+        return iter(("start", "end"))
 
-        return result
+    def __len__(self):
+        return 2
 
-    def visitVariableDeclarationList(self, ctx: SolidityParser.VariableDeclarationListContext):
-        result = []
-        for decl in self._mapCommasToNulls(ctx.children):
-            if decl == None:
-                return None
+    @property
+    def range(self):
+        positions = self._positions
+        return [positions.starts[self._first], positions.stops[self._last]]
 
-            result.append(self._createNode(ctx=ctx,
-                                           type='VariableDeclaration',
-                                           name=decl.identifier().getText(),
-                                           typeName=self.visit(decl.typeName()),
-                                           isStateVar=False,
-                                           isIndexed=False,
-                                           decl=decl))
+    def src(self, fileIndex=0):
+        """
+        :param fileIndex: index of the source file, as in solc's sourceList
+        :return: "start:length:fileIndex" with the offset and length of the node in the utf-8 encoded source
+        """
+        start, stop = self.range
+        utf8 = self._positions.utf8
+        if utf8 is not None:
+            start, stop = utf8(start), utf8(stop + 1) - 1
+        return "%d:%d:%d" % (start, stop - start + 1, fileIndex)
 
-        return result
+    def __repr__(self):
+        return repr(dict(self))
 
-    def visitVariableDeclarationStatement(self, ctx):
-
-        if ctx.variableDeclaration():
-            variables = [self.visit(ctx.variableDeclaration())]
-        elif ctx.identifierList():
-            variables = self.visit(ctx.identifierList())
-        elif ctx.variableDeclarationList():
-            variables = self.visit(ctx.variableDeclarationList())
-
-        initialValue = None
-
-        if ctx.expression():
-            initialValue = self.visit(ctx.expression())
-
-        return Node(ctx=ctx,
-                    type='VariableDeclarationStatement',
-                    variables=variables,
-                    initialValue=initialValue)
-
-    def visitEventDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type='EventDefinition',
-                    name=ctx.identifier().getText(),
-                    parameters=self.visit(ctx.eventParameterList()),
-                    isAnonymous=not not ctx.AnonymousKeyword())
-
-    def visitEventParameterList(self, ctx):
-        parameters = []
-        for paramCtx in ctx.eventParameter():
-            type = self.visit(paramCtx.typeName())
-            name = None
-            if paramCtx.identifier():
-                name = paramCtx.identifier().getText()
-
-            parameters.append(self._createNode(ctx=ctx,
-                type='VariableDeclaration',
-                typeName=type,
-                name=name,
-                isStateVar=False,
-                isIndexed=not not paramCtx.IndexedKeyword()))
-
-        return Node(ctx=ctx,
-                    type='ParameterList',
-                    parameters=parameters)
-
-    def visitInlineAssemblyStatement(self, ctx):
-        language = None
-
-        if ctx.StringLiteralFragment():
-            language = ctx.StringLiteralFragment().getText()
-            language = language[1: len(language) - 1]
-
-        return Node(ctx=ctx,
-                    type='InLineAssemblyStatement',
-                    language=language,
-                    body=self.visit(ctx.assemblyBlock()))
-
-    def visitAssemblyBlock(self, ctx):
-        operations = [self.visit(it) for it in ctx.assemblyItem()]
-
-        return Node(ctx=ctx,
-                    type='AssemblyBlock',
-                    operations=operations)
-
-    def visitAssemblyItem(self, ctx):
-
-        if ctx.hexLiteral():
-            return Node(ctx=ctx,
-                        type='HexLiteral',
-                        value=ctx.hexLiteral().getText())
-
-        if ctx.stringLiteral():
-            text = ctx.stringLiteral().getText()
-            return Node(ctx=ctx,
-                        type='StringLiteral',
-                        value=text[1: len(text) - 1])
-
-        if ctx.BreakKeyword():
-            return Node(ctx=ctx,
-                        type='Break')
-
-        if ctx.ContinueKeyword():
-            return Node(ctx=ctx,
-                        type='Continue')
-
-        return self.visit(ctx.getChild(0))
-
-    def visitAssemblyExpression(self, ctx):
-        return self.visit(ctx.getChild(0))
-
-    def visitAssemblyMember(self, ctx):
-        return Node(ctx=ctx,
-                    type='AssemblyMember',
-                    name=ctx.identifier().getText())
-
-    def visitAssemblyCall(self, ctx):
-        functionName = ctx.getChild(0).getText()
-        args = [self.visit(arg) for arg in ctx.assemblyExpression()]
-
-        return Node(ctx=ctx,
-                    type='AssemblyExpression',
-                    functionName=functionName,
-                    arguments=args)
-
-    def visitAssemblyLiteral(self, ctx):
-
-        if ctx.stringLiteral():
-            text = ctx.getText()
-            return Node(ctx=ctx,
-                        type='StringLiteral',
-                        value=text[1: len(text) - 1])
-
-        if ctx.DecimalNumber():
-            return Node(ctx=ctx,
-                        type='DecimalNumber',
-                        value=ctx.getText())
-
-        if ctx.HexNumber():
-            return Node(ctx=ctx,
-                        type='HexNumber',
-                        value=ctx.getText())
-
-        if ctx.hexLiteral():
-            return Node(ctx=ctx,
-                        type='HexLiteral',
-                        value=ctx.getText())
-
-    def visitAssemblySwitch(self, ctx):
-        return Node(ctx=ctx,
-                    type='AssemblySwitch',
-                    expression=self.visit(ctx.assemblyExpression()),
-                    cases=[self.visit(c) for c in ctx.assemblyCase()])
-
-    def visitAssemblyCase(self, ctx):
-        value = None
-
-        if ctx.getChild(0).getText() == 'case':
-            value = self.visit(ctx.assemblyLiteral())
-
-        if value != None:
-            node = Node(ctx=ctx,
-                        type="AssemblyCase",
-                        block=self.visit(ctx.assemblyBlock()),
-                        value=value)
-        else:
-            node = Node(ctx=ctx,
-                        type="AssemblyCase",
-                        block=self.visit(ctx.assemblyBlock()),
-                        default=True)
 
-        return node
+class LazyBody(object):
+    """
+    body of a function or modifier that is parsed on first access (parse(..., bodies="lazy")).
 
-    def visitAssemblyLocalDefinition(self, ctx):
-        names = ctx.assemblyIdentifierOrList()
+    It only stores where the block is in the source. Reading any field other than "type" (which
+    is always "Block") parses the block with start="block" and the options of the original parse,
+    and delegates to the resulting Block node from then on; its loc is the same as with a full parse.
+    Syntax errors within the block are reported when it is materialized. materialize() returns the
+    node, visit() and objectify() materialize bodies unless told not to.
+    """
+    __slots__ = ("_source", "_start", "_stop", "_line", "_column", "_node")
+    NONCHILD_KEYS = Node.NONCHILD_KEYS
 
-        if names.identifier():
-            names = [self.visit(names.identifier())]
-        else:
-            names = self.visit(names.assemblyIdentifierList().identifier())
+    type = "Block"
+
+    def __init__(self, source, start, stop, line, column):
+        """
+        :param source: _LazySource of the parse
+        :param start: offset of the block's '{' in the source
+        :param stop: offset of the block's '}' in the source
+        :param line: line of the '{'
+        :param column: column of the '{'
+        """
+        self._source = source
+        self._start = start
+        self._stop = stop
+        self._line = line
+        self._column = column
+        self._node = None
+
+    @property
+    def materialized(self):
+        return self._node is not None
+
+    def materialize(self):
+        """
+        :return: the Block node, parsed on the first call
+        """
+        if self._node is None:
+            self._node = self._source.parse(self._start, self._stop, self._line, self._column)
+        return self._node
 
-        return Node(ctx=ctx,
-                    type='AssemblyLocalDefinition',
-                    names=names,
-                    expression=self.visit(ctx.assemblyExpression()))
+    def __getattr__(self, item):
+        # only called for attributes that are not defined above
+        if item.startswith("__"):
+            raise AttributeError(item)
+        return getattr(self.materialize(), item)
 
-    def visitAssemblyFunctionDefinition(self, ctx):
-        args = ctx.assemblyIdentifierList().identifier()
-        returnArgs = ctx.assemblyFunctionReturns().assemblyIdentifierList().identifier()
+    def __getitem__(self, item):
+        if item == "type":
+            return self.type
+        return self.materialize()[item]
 
-        return Node(ctx=ctx,
-                    type='AssemblyFunctionDefinition',
-                    name=ctx.identifier().getText(),
-                    arguments=self.visit(args),
-                    returnArguments=self.visit(returnArgs),
-                    body=self.visit(ctx.assemblyBlock()))
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
 
-    def visitAssemblyAssignment(self, ctx):
-        names = ctx.assemblyIdentifierOrList()
+    def __delitem__(self, key):
+        del self.materialize()[key]
 
-        if names.identifier():
-            names = [self.visit(names.identifier())]
-        else:
-            names = self.visit(names.assemblyIdentifierList().identifier())
-
-        return Node(ctx=ctx,
-                    type='AssemblyAssignment',
-                    names=names,
-                    expression=self.visit(ctx.assemblyExpression()))
-
-    def visitLabelDefinition(self, ctx):
-        return Node(ctx=ctx,
-                    type='LabelDefinition',
-                    name=ctx.identifier().getText())
-
-    def visitAssemblyStackAssignment(self, ctx):
-        return Node(ctx=ctx,
-                    type='AssemblyStackAssignment',
-                    name=ctx.identifier().getText())
-
-    def visitAssemblyFor(self, ctx):
-        return Node(ctx=ctx,
-                    type='AssemblyFor',
-                    pre=self.visit(ctx.getChild(1)),
-                    condition=self.visit(ctx.getChild(2)),
-                    post=self.visit(ctx.getChild(3)),
-                    body=self.visit(ctx.getChild(4)))
-
-    def visitAssemblyIf(self, ctx):
-        return Node(ctx=ctx,
-                    type='AssemblyIf',
-                    condition=self.visit(ctx.assemblyExpression()),
-                    body=self.visit(ctx.assemblyBlock()))
-
-    ### /***************************************************
-
-    def visitPragmaDirective(self, ctx):
-        return Node(ctx=ctx,
-                    type="PragmaDirective",
-                    name=ctx.pragmaName().getText(),
-                    value=ctx.pragmaValue().getText())
-
-    def visitImportDirective(self, ctx):
-        symbol_aliases = {}
-        unit_alias = None
-
-        if len(ctx.importDeclaration()) > 0:
-            for item in ctx.importDeclaration():
+    def __contains__(self, item):
+        return item in self.materialize()
+
+    def get(self, key, default=None):
+        return self.materialize().get(key, default)
+
+    def keys(self):
+        return self.materialize().keys()
+
+    def values(self):
+        return self.materialize().values()
+
+    def items(self):
+        return self.materialize().items()
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyBody):
+            other = other.materialize()
+        return self.materialize() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self._node is None:
+            return "LazyBody(line=%d, column=%d)" % (self._line, self._column)
+        return repr(self._node)
+
+    def __reduce__(self):
+        if self._node is not None:
+            return self._node.__reduce__()
+        return LazyBody, (self._source, self._start, self._stop, self._line, self._column)
+
+
+class _LazySource(object):
+    """
+    source text and parse options shared by the LazyBody objects of a parse
+    """
+
+    def __init__(self, text, options, session=None):
+        """
+        :param text: source (str or bytes, other bytes-like objects such as a mmap are copied)
+        :param options: keyword arguments of ParserSession._parse_block()
+        :param session: ParserSession materializing the bodies (default session if None)
+        """
+        self.text = text if isinstance(text, (str, bytes)) else bytes(text)
+        self.options = options
+        self.session = session
+        # byte offsets within a block depend on the characters before it (see SourceLocation.src())
+        self.utf8 = _Utf8Offsets.of(self.text) if options.get("loc") == "lazy" else None
+
+    def body(self, first, last):
+        """
+        :return: LazyBody of the block from the token first to the token last
+        """
+        return LazyBody(self, first.start, last.stop, first.line, first.column)
+
+    def parse(self, start, stop, line, column):
+        session = self.session if self.session is not None else _default_session()
+        return session._parse_block(self.text[start:stop + 1], (line, column, start), utf8=self.utf8, **self.options)
+
+    def __reduce__(self):
+        # the session stays behind, unpickled bodies use the default session
+        return _LazySource, (self.text, self.options)
+
+# names that used to be defined here and now live in astbuilder, which loads the grammar
+_ASTBUILDER_NAMES = ("AstVisitor", "SolidityParser", "SolidityVisitor")
+
+
+def __getattr__(name):
+    if name == "SolidityLexer":
+        from solidity_parser import grammar
+        return grammar.load()[0]
+    if name in _ASTBUILDER_NAMES:
+        from solidity_parser import astbuilder
+        return getattr(astbuilder, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+class ParserSession(object):
+    """
+    Reuses lexer, token stream and parser instances for many parses.
+
+    Building them is a noticeable part of parsing small sources (e.g. single expressions with
+    start="expression"); a session resets them for every input instead. Each thread gets its own
+    instances, so one session can be shared by threads. parse() and parse_file() use a default session.
 
+        session = ParserSession()
+        for snippet in snippets:
+            ast = session.parse(snippet, start="expression")
+    """
+
+    def __init__(self):
+        import threading
+
+        self._local = threading.local()
+
+    def _acquire(self):
+        free = getattr(self._local, "free", None)
+        if free:
+            return free.pop()
+
+        from solidity_parser.astbuilder import _Recognizers  # loads the grammar on first use
+        return _Recognizers()
+
+    def _release(self, recognizers):
+        free = getattr(self._local, "free", None)
+        if free is None:
+            free = self._local.free = []
+        free.append(recognizers)
+
+    def parse(self, text, start="sourceUnit", loc=False, strict=False, prediction_mode="two-stage", stats=None,
+              contexts=None, nodes="dict", cache=None, comments=None, lexer="antlr", engine="antlr", bodies=True,
+              keep=None):
+        """
+        parse solidity source text into an AST, see parse() for the arguments
+        """
+        if bodies not in (True, False, "lazy"):
+            raise Exception("unknown bodies %r (expected True, False or 'lazy')" % (bodies,))
+        if bodies == "lazy" and contexts is not None:
+            raise Exception("contexts are not available with bodies='lazy'")
+
+        if comments is None:
+            comments = contexts is not None
+        key = None
+        if cache is not None and contexts is None:
+            key = cache.key(text, start=start, loc=loc, nodes=nodes, bodies=bodies, keep=keep, comments=comments)
+            cached = cache.get(key)
+            if stats is not None:
+                stats["cache"] = "miss" if cached is None else "hit"
+            if cached is not None:
+                return cached
+
+        # taken from this thread's free instances (a nested parse on the same thread gets new ones)
+        lazy_bodies = None
+        if bodies == "lazy":
+            lazy_bodies = _LazySource(text, dict(loc=loc, prediction_mode=prediction_mode, nodes=nodes, lexer=lexer,
+                                                 engine=engine, keep=keep), self)
+        recognizers = self._acquire()
+        try:
+            result, syntax_errors = recognizers.parse(text, start, prediction_mode, stats, contexts, nodes, comments,
+                                                      lexer, engine, bodies is True, lazy_bodies, keep=keep, loc=loc)
+        finally:
+            # the contexts reach the parser and its token stream (ctx.parser), those instances are not reused
+            if contexts is None:
+                self._release(recognizers)
+
+        if key is not None and not syntax_errors:
+            # sources with syntax errors are not cached, they are reparsed to report their errors again
+            cache.put(key, result)
+        return result
+
+    def _parse_block(self, text, origin, loc, prediction_mode, nodes, lexer, engine, keep=None, utf8=None):
+        """
+        parse the block of a LazyBody
+
+        :param text: the block
+        :param origin: (line, column, offset) of the block in its source
+        :param utf8: _Utf8Offsets of the source for loc="lazy", None if it is ASCII
+        :return: Block node
+        """
+        recognizers = self._acquire()
+        try:
+            result, _ = recognizers.parse(text, "block", prediction_mode, None, None, nodes, False, lexer, engine,
+                                          keep=keep, origin=origin, loc=loc, utf8=utf8)
+        finally:
+            self._release(recognizers)
+        return result
+
+    def parse_file(self, path, start="sourceUnit", loc=False, strict=False, prediction_mode="two-stage", stats=None,
+                   contexts=None, nodes="dict", cache=None, comments=None, lexer="antlr", engine="antlr", mmap=False,
+                   bodies=True, keep=None):
+        """
+        parse a solidity source file into an AST, see parse_file() for the arguments
+        """
+        kwargs = dict(start=start, loc=loc, strict=strict, prediction_mode=prediction_mode, stats=stats,
+                      contexts=contexts, nodes=nodes, cache=cache, comments=comments, lexer=lexer, engine=engine,
+                      bodies=bodies, keep=keep)
+        if mmap:
+            from mmap import mmap as _mmap, ACCESS_READ
+            from solidity_parser.charstream import is_plain_ascii
+
+            with open(path, 'rb') as f:
+                try:
+                    mapped = _mmap(f.fileno(), 0, access=ACCESS_READ)
+                except ValueError:
+                    mapped = None  # empty file
+            if mapped is not None and is_plain_ascii(mapped):
                 try:
-                    alias = item.identifier(1).getText()
-                except:
-                    alias = None
-                symbol_aliases[item.identifier(0).getText()] = alias
+                    return self.parse(mapped, **kwargs)
+                finally:
+                    if contexts is None:
+                        mapped.close()  # otherwise the tokens of the contexts still read from it
+            if mapped is not None:
+                mapped.close()
+
+        with open(path, 'r', encoding="utf-8") as f:
+            return self.parse(f.read(), **kwargs)
+
+
+_session = None
+
+
+def _default_session():
+    global _session
+    if _session is None:
+        _session = ParserSession()
+    return _session
+
 
-        elif len(ctx.children) == 7:
-            unit_alias = ctx.getChild(3).getText()
+def parse(text, start="sourceUnit", loc=False, strict=False, prediction_mode="two-stage", stats=None, contexts=None,
+          nodes="dict", cache=None, comments=None, lexer="antlr", engine="antlr", bodies=True, keep=None):
+    """
+    parse solidity source text into an AST
+
+    :param text: solidity source (str, or an ASCII bytes-like object such as bytes or a mmap)
+    :param start: grammar rule to start parsing from
+    :param loc: add location information to ast nodes. loc=True adds a "loc" dict to every node,
+                loc="lazy" a compact SourceLocation that builds the same dicts on access and also provides
+                the character range and solc-style src of the node
+    :param strict: unused
+    :param prediction_mode: "two-stage" (SLL with LL fallback, default), "sll" or "ll". The SLL stage of
+                            "two-stage" parses expressions with a precedence-climbing parser and builds
+                            the ast while parsing (see astbuilder._FastPathParser), "sll" and "ll" run
+                            ANTLR's expression rule and build the whole parse tree first. "sll" does not
+                            fall back to LL: it raises an exception if SLL prediction fails, which
+                            happens for syntax errors but also for some valid sources (e.g. samples/simple.sol)
+    :param stats: optional dict that is filled with parse statistics
+                  (e.g. {"prediction_mode": "sll-fast", "tokens": 812, "hidden_tokens": 1530}). The
+                  prediction_mode is the stage the parse finished in: "sll-fast" for the SLL stage of
+                  "two-stage" with its fast paths, "sll" for plain SLL prediction (also the SLL stage of
+                  "two-stage" if contexts are requested), "ll" for full LL
+    :param contexts: optional dict that is filled with id(node) -> ANTLR parse tree context for every ast node.
+                     The ast itself never references parse tree objects; only pass this if the contexts are
+                     really needed as they keep the whole parse tree and token stream alive.
+    :param nodes: "dict" (default) builds Node objects, "slots" builds compact per type SlotNode objects
+    :param cache: optional astcache.ASTCache to look the ast up in (and store it in). Not used if contexts are requested.
+    :param comments: keep comment tokens in the token stream. The ast never contains them, they
+                     are only reachable through contexts (ctx.parser.getTokenStream()). By default they are kept
+                     if contexts are requested and otherwise dropped by the lexer without creating tokens.
+    :param lexer: "antlr" (default) runs the generated SolidityLexer, "regex" a much faster lexer built on a
+                  regular expression that produces the same tokens (see lexer.RegexLexer)
+    :param engine: "antlr" (default) parses with the generated SolidityParser, "rd" with a much faster hand-written
+                   recursive-descent parser building the same AST (see rdparser). Inputs the rd engine cannot parse,
+                   e.g. because of syntax errors, are parsed with ANTLR, which reports the errors as usual.
+                   Does not support contexts.
+    :param bodies: parse function and modifier bodies (default). bodies=False skips them by matching braces,
+                   which is much faster if only the outline is needed (everything objectify() collects except
+                   the identifiers and declarations within bodies). The "body" of functions and modifiers is
+                   then a SkippedBlock node with the "range" (first and last character offset) and "tokenRange"
+                   (first and last token index) of the block. The token indexes are those of the parse's token
+                   stream, which only counts comment tokens with comments=True (whitespace is never a token).
+                   Syntax errors within skipped bodies are not reported.
+                   bodies="lazy" skips them as well, but the "body" is a LazyBody that parses the block on first
+                   access (and keeps the source text alive until then). Does not support contexts.
+    :param keep: optional set of node types (e.g. {"ImportDirective", "PragmaDirective"}) to build a pruned ast
+                 for. Subtrees that cannot contain any of these types are not built, fields holding them are None
+                 (also within lists). Nodes of other types are only built on the way to the kept ones, and
+                 expressions are always built as a whole. Only supported by engine="antlr".
+    :return: ast
+    """
+    return _default_session().parse(text, start=start, loc=loc, strict=strict, prediction_mode=prediction_mode,
+                                    stats=stats, contexts=contexts, nodes=nodes, cache=cache, comments=comments,
+                                    lexer=lexer, engine=engine, bodies=bodies, keep=keep)
 
-        elif len(ctx.children) == 5:
-            unit_alias = ctx.getChild(3).getText()
 
-        return Node(ctx=ctx,
-                    type="ImportDirective",
-                    path=ctx.importPath().getText().strip('"'),
-                    symbolAliases=symbol_aliases,
-                    unitAlias=unit_alias
-                    )
+def parse_file(path, start="sourceUnit", loc=False, strict=False, prediction_mode="two-stage", stats=None,
+               contexts=None, nodes="dict", cache=None, comments=None, lexer="antlr", engine="antlr", mmap=False,
+               bodies=True, keep=None):
+    """
+    parse a solidity source file (utf-8) into an AST, see parse() for the arguments
 
-    def visitContractDefinition(self, ctx):
-        self._currentContract = ctx.identifier().getText()
-        return Node(ctx=ctx,
-                    type="ContractDefinition",
-                    name=ctx.identifier().getText(),
-                    baseContracts=self.visit(ctx.inheritanceSpecifier()),
-                    subNodes=self.visit(ctx.contractPart()),
-                    kind=ctx.getChild(0).getText())
+    :param mmap: memory-map the file and lex it in place instead of reading it into memory. Only used
+                 for ASCII files without carriage returns, other files are read as usual.
+    :return: ast
+    """
+    return _default_session().parse_file(path, start=start, loc=loc, strict=strict, prediction_mode=prediction_mode,
+                                         stats=stats, contexts=contexts, nodes=nodes, cache=cache, comments=comments,
+                                         lexer=lexer, engine=engine, mmap=mmap, bodies=bodies, keep=keep)
 
-    def visitUserDefinedTypename(self, ctx):
-        return Node(ctx=ctx,
-                    type="UserDefinedTypename",
-                    name=ctx.getText())
 
-    def visitReturnStatement(self, ctx):
-        return self.visit(ctx.expression())
+ParseFileResult = collections.namedtuple("ParseFileResult", ("path", "ast", "error"))
 
-    def visitTerminal(self, ctx):
-        return ctx.getText()
 
+def _init_parse_files_worker(dfa_cache):
+    if dfa_cache:
+        from solidity_parser import dfacache
+        dfacache.load_dfa_cache(dfa_cache)
 
-def parse(text, start="sourceUnit", loc=False, strict=False):
-    from antlr4.InputStream import InputStream
-    from antlr4 import FileStream, CommonTokenStream
 
-    input_stream = InputStream(text)
+def _parse_files_error(e):
+    import pickle
 
-    lexer = SolidityLexer(input_stream)
-    token_stream = CommonTokenStream(lexer)
-    parser = SolidityParser(token_stream)
-    ast = AstVisitor()
+    try:
+        pickle.dumps(e)
+        return e
+    except Exception:
+        # e.g. antlr exceptions referencing the parser
+        return Exception("%s: %s" % (type(e).__name__, e))
 
-    Node.ENABLE_LOC = loc
 
-    return ast.visit(getattr(parser, start)())
+def _parse_files_task(path, kwargs):
+    import pickle
 
+    try:
+        # pickle here so that an AST that fails to pickle only fails its own file, not the whole chunk
+        return path, pickle.dumps(parse_file(path, **kwargs), pickle.HIGHEST_PROTOCOL), None
+    except Exception as e:
+        return path, None, _parse_files_error(e)
 
-def parse_file(path, start="sourceUnit", loc=False, strict=False):
-    with open(path, 'r', encoding="utf-8") as f:
-        return parse(f.read(), start=start, loc=loc, strict=strict)
 
+def _parse_files_chunk(args):
+    paths, kwargs = args
+    return [_parse_files_task(path, kwargs) for path in paths]
 
-def visit(node, callback_object):
+
+def parse_files(paths, start="sourceUnit", loc=False, strict=False, prediction_mode="two-stage", nodes="dict",
+                workers=None, ordered=True, chunksize=None, dfa_cache=None, cache=None, lexer="antlr", engine="antlr",
+                bodies=True, keep=None):
+    """
+    Parse many files with a pool of worker processes.
+
+    Workers stay alive for the whole batch and keep their warmed up ANTLR DFA caches. Paths are
+    dispatched in chunks to reduce IPC overhead. A file that fails to parse does not stop the batch,
+    its result carries the exception instead.
+
+    :param paths: iterable of source file paths
+    :param start: see parse()
+    :param loc: see parse()
+    :param strict: see parse()
+    :param prediction_mode: see parse()
+    :param nodes: see parse()
+    :param workers: number of worker processes (default: os.cpu_count()). 0 or 1 parses in this process.
+    :param ordered: yield results in the order of paths (default) or as soon as they are completed
+    :param chunksize: number of paths sent to a worker at once (default: spread over ~4 chunks per worker)
+    :param dfa_cache: optional path of a file written by dfacache.save_dfa_cache() that every worker loads first
+    :param cache: optional astcache.ASTCache shared by all workers (each worker counts its own hits and misses)
+    :param lexer: see parse()
+    :param engine: see parse()
+    :param bodies: see parse()
+    :param keep: see parse()
+    :return: generator of ParseFileResult(path, ast, error) tuples, error is None on success
     """
+    paths = list(paths)
+    kwargs = dict(start=start, loc=loc, strict=strict, prediction_mode=prediction_mode, nodes=nodes, cache=cache,
+                  lexer=lexer, engine=engine, bodies=bodies, keep=keep)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(paths) <= 1:
+        _init_parse_files_worker(dfa_cache)
+        for path in paths:
+            try:
+                yield ParseFileResult(path, parse_file(path, **kwargs), None)
+            except Exception as e:
+                yield ParseFileResult(path, None, e)
+        return
+
+    if chunksize is None:
+        chunksize, extra = divmod(len(paths), workers * 4)
+        if extra:
+            chunksize += 1
+    chunks = [(paths[i:i + chunksize], kwargs) for i in range(0, len(paths), chunksize)]
+
+    import multiprocessing
+    import pickle
+
+    with multiprocessing.Pool(workers, initializer=_init_parse_files_worker, initargs=(dfa_cache,)) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for results in imap(_parse_files_chunk, chunks):
+            for path, ast, error in results:
+                yield ParseFileResult(path, pickle.loads(ast) if error is None else None, error)
+
+
+def _hook_names(node_type):
+    try:
+        return _HOOK_NAMES[node_type]
+    except KeyError:
+        names = _HOOK_NAMES[node_type] = ("visit" + node_type, "leave" + node_type)
+        return names
+
 
-    Walks the AST produced by parse/parse_file and calls callback_object.visit<Node.type>
+_HOOK_NAMES = {}
+
+
+def visit(node, callback_object, materialize=True):
+    """
+
+    Walks the AST produced by parse/parse_file and calls callback_object.visit<Node.type> when entering
+    and callback_object.leave<Node.type> after all children of a node were walked
+
+    The walk uses an explicit stack (no recursion limit for deeply nested expressions), only descends
+    into the child fields of each node type (NODE_CHILD_FIELDS) and looks callbacks up once per node type.
 
     :param node: ASTNode returned from parse()
     :param callback: an object implementing the visitor pattern
+    :param materialize: parse and walk the LazyBody bodies of parse(..., bodies="lazy"). If False, only
+                        bodies that were already materialized are walked.
     :return:
     """
 
-    if node is None or not isinstance(node, Node):
+    if isinstance(node, LazyBody) and (materialize or node.materialized):
+        node = node.materialize()
+    if node is None or not isinstance(node, (Node, SlotNode)):
         return node
 
-    # call callback if it is available
-    if hasattr(callback_object, "visit"+node.type):
-        getattr(callback_object, "visit"+node.type)(node)
+    hooks = {}  # node type -> (enter, leave) callbacks of callback_object
+    stack = [node]
+    push = stack.append
+    pop = stack.pop
 
-    for k,v in node.items():
-        if k in node.NONCHILD_KEYS:
-            # skip non child items
+    while stack:
+        node = pop()
+        if node.__class__ is tuple:
+            # (leave callback, node) pushed below the node's children
+            node[0](node[1])
             continue
 
-        # item is array?
-        if isinstance(v, list):
-            [visit(child, callback_object) for child in v]
+        node_type = node["type"] if isinstance(node, dict) else node.type
+
+        try:
+            enter, leave = hooks[node_type]
+        except KeyError:
+            enter_name, leave_name = _hook_names(node_type)
+            enter, leave = hooks[node_type] = (getattr(callback_object, enter_name, None),
+                                               getattr(callback_object, leave_name, None))
+
+        # call callback if it is available
+        if enter is not None:
+            enter(node)
+        if leave is not None:
+            push((leave, node))
+
+        child_fields = NODE_CHILD_FIELDS.get(node_type)
+        if child_fields is None:
+            # unknown node type, every item except the non child keys may hold children
+            children = [v for k, v in node.items() if k not in node.NONCHILD_KEYS]
         else:
-            visit(v, callback_object)
+            children = [node.get(k) for k in child_fields]
+
+        # push in reverse so children are walked in field order
+        for v in reversed(children):
+            if isinstance(v, list):
+                for child in reversed(v):
+                    if isinstance(child, (Node, SlotNode)):
+                        push(child)
+            elif isinstance(v, (Node, SlotNode)):
+                push(v)
+            elif isinstance(v, LazyBody) and (materialize or v.materialized):
+                push(v.materialize())
 
 
-def objectify(start_node):
+def objectify(start_node, materialize=True):
     """
     Create an OOP like structure from the tree for easy access of most common information
 
@@ -1088,12 +1074,11 @@ def objectify(start_node):
            .
 
     :param tree:
+    :param materialize: see visit(). Without it, the identifiers and declarations of the LazyBody bodies of
+                        parse(..., bodies="lazy") that were not materialized yet are not collected.
     :return:
     """
 
-    current_contract = None
-    current_function = None
-
     class ObjectifyContractVisitor(object):
 
         def __init__(self, node):
@@ -1112,154 +1097,163 @@ def objectify(start_node):
             self.constructor = None
             self.inherited_names = {}
 
+    class EventFunctionVisitor(object):
+        def __init__(self, node):
+            self.arguments = {}
+            self.declarations = {}
+            self._node = node
 
-        def visitEnumDefinition(self, _node):
-            self.enums[_node.name]=_node
-            self.names[_node.name]=_node
-
-        def visitStructDefinition(self, _node):
-            self.structs[_node.name]=_node
-            self.names[_node.name]=_node
-
-        def visitStateVariableDeclaration(self, _node):
-
-            class VarDecVisitor(object):
-
-                def __init__(self, current_contract):
-                    self._current_contract = current_contract
-
-                def visitVariableDeclaration(self, __node):
-                    self._current_contract.stateVars[__node.name] = __node
-                    self._current_contract.names[__node.name] = __node
-
-            visit(_node, VarDecVisitor(self))
-
-        def visitEventDefinition(self, _node):
-
-            class EventFunctionVisitor(object):
-                def __init__(self, node):
-                    self.arguments = {}
-                    self.declarations = {}
-                    self._node = node
-
-                def visitVariableDeclaration(self, __node):
-                    self.arguments[__node.name] = __node
-                    self.declarations[__node.name] = __node
+    class FunctionObject(object):
 
-            current_function = EventFunctionVisitor(_node)
-            visit(_node, current_function)
-            self.names[_node.name] = current_function
-            self.events[_node.name] = current_function
+        def __init__(self, node):
+            self._node = node
+            if(node.type=="FunctionDefinition"):
+                self.visibility = node.visibility
+                self.stateMutability = node.stateMutability
+                self.isConstructor = node.isConstructor
+                self.isFallback = node.isFallback
+                self.isReceive = node.isReceive
+            self.arguments = {}
+            self.returns = {}
+            self.declarations = {}
+            self.identifiers = []
+
+    class IdentifierDecVisitor(object):
+
+        def __init__(self):
+            self.idents = []
 
+    class ObjectifySourceUnitVisitor(object):
+        """
+        collects everything in a single walk. The callbacks below track the enclosing contract, event,
+        state variable declaration and function (and which part of the function: parameters,
+        returnParameters or body) of the current node.
+        """
 
-        def visitFunctionDefinition(self, _node, _definition_type=None):
+        def __init__(self, node):
+            self._node = node
+            self.imports = []
+            self.pragmas = []
+            self.contracts = {}
 
-            class FunctionObject(object):
+            self._current_contract = None
+            self._contract = None  # contract being walked (_current_contract keeps the last one)
+            self._current_event = None
+            self._in_state_variable_declaration = False
+            self._current_function = None
+            self._function_sections = {}  # id(node) -> "arguments", "returns" or "body" of the current function
+            self._current_section = None
 
-                def __init__(self, node):
-                    self._node = node
-                    if(node.type=="FunctionDefinition"):
-                        self.visibility = node.visibility
-                        self.stateMutability = node.stateMutability
-                        self.isConstructor = node.isConstructor
-                        self.isFallback = node.isFallback
-                        self.isReceive = node.isReceive
-                    self.arguments = {}
-                    self.returns = {}
-                    self.declarations = {}
-                    self.identifiers = []
-                    
-                    
+        def visitPragmaDirective(self, node):
+            self.pragmas.append(node)
 
-            class FunctionArgumentVisitor(object):
+        def visitImportDirective(self, node):
+            self.imports.append(node)
 
-                def __init__(self):
-                    self.parameters = {}
+        def visitContractDefinition(self, node):
+            self.contracts[node.name] = ObjectifyContractVisitor(node)
+            self._current_contract = self._contract = self.contracts[node.name]
 
-                def visitParameter(self, __node):
-                    self.parameters[__node.name] = __node
+        def leaveContractDefinition(self, node):
+            self._contract = None
 
-            class VarDecVisitor(object):
+        def visitEnumDefinition(self, node):
+            if self._contract is not None:
+                self._contract.enums[node.name] = node
+                self._contract.names[node.name] = node
 
-                def __init__(self):
-                    self.variable_declarations = {}
+        def visitStructDefinition(self, node):
+            if self._contract is not None:
+                self._contract.structs[node.name] = node
+                self._contract.names[node.name] = node
 
-                def visitVariableDeclaration(self, __node):
-                    self.variable_declarations[__node.name] = __node
+        def visitStateVariableDeclaration(self, node):
+            self._in_state_variable_declaration = self._contract is not None
 
-            class IdentifierDecVisitor(object):
+        def leaveStateVariableDeclaration(self, node):
+            self._in_state_variable_declaration = False
 
-                def __init__(self):
-                    self.idents = []
+        def visitEventDefinition(self, node):
+            if self._contract is not None:
+                self._current_event = EventFunctionVisitor(node)
+                self._contract.names[node.name] = self._current_event
+                self._contract.events[node.name] = self._current_event
 
-                def visitIdentifier(self, __node):
-                    self.idents.append(__node)
+        def leaveEventDefinition(self, node):
+            self._current_event = None
 
-                def visitAssemblyCall(self, __node):
-                    self.idents.append(__node)
+        def visitFunctionDefinition(self, node, _definition_type=None):
+            contract = self._contract
+            if contract is None:
+                # functions outside of contracts are not collected
+                return
 
-            current_function = FunctionObject(_node)
-            self.names[_node.name] = current_function
+            current_function = FunctionObject(node)
+            contract.names[node.name] = current_function
             if _definition_type=="ModifierDefinition":
-                self.modifiers[_node.name] = current_function
+                contract.modifiers[node.name] = current_function
             else:
-                self.functions[_node.name] = current_function
+                contract.functions[node.name] = current_function
                 if current_function.isConstructor:
-                    self.constructor = current_function
-
-            ## get parameters
-            funcargvisitor = FunctionArgumentVisitor()
-            visit(_node.parameters, funcargvisitor)
-            current_function.arguments = funcargvisitor.parameters
-            current_function.declarations.update(current_function.arguments)
+                    contract.constructor = current_function
 
+            current_function.identifiers = IdentifierDecVisitor()
+            self._current_function = current_function
 
-            ## get returnParams
-            if _node.get("returnParameters"):
+            body = node.body
+            if isinstance(body, LazyBody) and (materialize or body.materialized):
+                body = body.materialize()  # the node visit() walks
+            self._function_sections = {id(node.parameters): "arguments", id(body): "body"}
+            if node.get("returnParameters"):
                 # because modifiers dont
-                funcargvisitor = FunctionArgumentVisitor()
-                visit(_node.returnParameters, funcargvisitor)
-                current_function.returns = funcargvisitor.parameters
-                current_function.declarations.update(current_function.returns)
-
-
-            ## get vardecs in body
-            vardecs = VarDecVisitor()
-            visit(_node.body, vardecs)
-            current_function.declarations.update(vardecs.variable_declarations)
-
-            ## get all identifiers
-            idents = IdentifierDecVisitor()
-            visit(_node, idents)
-            current_function.identifiers = idents
-
-        def visitModifierDefinition(self, _node):
-            return self.visitFunctionDefinition(_node, "ModifierDefinition")
-
-
-    class ObjectifySourceUnitVisitor(object):
-
-        def __init__(self, node):
-            self._node = node
-            self.imports = []
-            self.pragmas = []
-            self.contracts = {}
-
-            self._current_contract = None
-
-        def visitPragmaDirective(self, node):
-            self.pragmas.append(node)
-
-        def visitImportDirective(self, node):
-            self.imports.append(node)
-
-        def visitContractDefinition(self, node):
-            self.contracts[node.name] = ObjectifyContractVisitor(node)
-            self._current_contract = self.contracts[node.name]
-
-            # subparse the contracts //slightly inefficient but more readable :)
-            visit(node, self.contracts[node.name])
+                self._function_sections[id(node.returnParameters)] = "returns"
+
+        def leaveFunctionDefinition(self, node):
+            self._current_function = None
+            self._function_sections = {}
+
+        def visitModifierDefinition(self, node):
+            return self.visitFunctionDefinition(node, "ModifierDefinition")
+
+        def leaveModifierDefinition(self, node):
+            return self.leaveFunctionDefinition(node)
+
+        def _enterSection(self, node):
+            section = self._function_sections.get(id(node))
+            if section is not None:
+                self._current_section = section
+
+        def _leaveSection(self, node):
+            if id(node) in self._function_sections:
+                self._current_section = None
+
+        visitParameterList = visitBlock = _enterSection
+        leaveParameterList = leaveBlock = _leaveSection
+
+        def visitParameter(self, node):
+            # parameters and returnParameters
+            if self._current_section == "arguments":
+                self._current_function.arguments[node.name] = node
+                self._current_function.declarations[node.name] = node
+            elif self._current_section == "returns":
+                self._current_function.returns[node.name] = node
+                self._current_function.declarations[node.name] = node
+
+        def visitVariableDeclaration(self, node):
+            if self._in_state_variable_declaration:
+                self._contract.stateVars[node.name] = node
+                self._contract.names[node.name] = node
+            if self._current_event is not None:
+                self._current_event.arguments[node.name] = node
+                self._current_event.declarations[node.name] = node
+            if self._current_section == "body":
+                # vardecs in body
+                self._current_function.declarations[node.name] = node
+
+        def visitIdentifier(self, node):
+            if self._current_function is not None:
+                self._current_function.identifiers.idents.append(node)
 
     objectified_source_unit = ObjectifySourceUnitVisitor(start_node)
-    visit(start_node, objectified_source_unit)
+    visit(start_node, objectified_source_unit, materialize)
     return objectified_source_unit
@@ -0,0 +1,1639 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# part of https://github.com/ConsenSys/python-solidity-parser
+#
+"""
+Hand-written recursive-descent parser building the same AST as ``AstVisitor``.
+
+``parse(..., engine="rd")`` uses it instead of ANTLR's ``SolidityParser``. It reads the tokens of
+the usual lexers and builds the nodes directly, without prediction DFAs, parse tree contexts or a
+visitor pass. Every rule method is named like its grammar rule and returns what ``AstVisitor``
+returns for that rule's context, including its quirks (e.g. ``break;`` visits to ``';'``, slices
+visit to a list of their children). Node locations are the first and last token of the rule,
+exactly like ``ctx.start`` and ``ctx.stop``.
+
+Decisions the grammar leaves to ANTLR's adaptive prediction are made with a few tokens of
+lookahead or by trying the alternatives in grammar order. The parser does not report or recover
+from errors: it raises ``RDSyntaxError`` at the first token it cannot handle, and for the few
+constructs where ``AstVisitor`` itself raises (e.g. Yul member access) it raises ``RDUnsupported``.
+The caller then parses the input with ANTLR instead, which reports the errors (or raises) as usual.
+"""
+
+from antlr4.Token import Token
+
+from solidity_parser.astbuilder import _TOKEN_TYPES
+from solidity_parser.parser import _node_factory
+from solidity_parser.solidity_antlr4.SolidityParser import SolidityParser
+
+
+class RDSyntaxError(Exception):
+    """
+    the input is not valid for the recursive-descent parser (it stops at the first error)
+    """
+
+
+class RDUnsupported(Exception):
+    """
+    the input uses a construct that AstVisitor cannot build an AST for
+    """
+
+
+def _first_tokens(rule):
+    """
+    :return: frozenset of the token types that can start the grammar rule
+    """
+    atn = SolidityParser.atn
+    return frozenset(t for interval in atn.nextTokens(atn.ruleToStartState[rule]).intervals for t in interval)
+
+
+def _types(*literals):
+    return frozenset(_TOKEN_TYPES[literal] for literal in literals)
+
+
+_IDENTIFIER = _first_tokens(SolidityParser.RULE_identifier)
+_ELEMENTARY_TYPE = _first_tokens(SolidityParser.RULE_elementaryTypeName)
+_STORAGE_LOCATION = _first_tokens(SolidityParser.RULE_storageLocation)
+_STATE_MUTABILITY = _first_tokens(SolidityParser.RULE_stateMutability)
+_VERSION_OPERATOR = _first_tokens(SolidityParser.RULE_versionOperator)
+_CONTRACT_KIND = _types('contract', 'interface', 'library')
+
+_EOF = Token.EOF
+_BOOLEAN_LITERAL = SolidityParser.BooleanLiteral
+_DECIMAL_NUMBER = SolidityParser.DecimalNumber
+_HEX_NUMBER = SolidityParser.HexNumber
+_NUMBER_UNIT = SolidityParser.NumberUnit
+_HEX_LITERAL = SolidityParser.HexLiteralFragment
+_STRING_LITERAL = SolidityParser.StringLiteralFragment
+_VERSION_LITERAL = SolidityParser.VersionLiteral
+
+_SEMI = _TOKEN_TYPES[';']
+_COMMA = _TOKEN_TYPES[',']
+_DOT = _TOKEN_TYPES['.']
+_COLON = _TOKEN_TYPES[':']
+_ASSIGN = _TOKEN_TYPES['=']
+_LPAREN = _TOKEN_TYPES['(']
+_RPAREN = _TOKEN_TYPES[')']
+_LBRACK = _TOKEN_TYPES['[']
+_RBRACK = _TOKEN_TYPES[']']
+_LBRACE = _TOKEN_TYPES['{']
+_RBRACE = _TOKEN_TYPES['}']
+_QUESTION = _TOKEN_TYPES['?']
+_OR = _TOKEN_TYPES['||']
+_STAR = _TOKEN_TYPES['*']
+_ARROW = _TOKEN_TYPES['=>']
+_YUL_ASSIGN = _TOKEN_TYPES[':=']
+_YUL_STACK_ASSIGN = _TOKEN_TYPES['=:']
+_YUL_RETURNS = _TOKEN_TYPES['->']
+_K = _TOKEN_TYPES  # keywords, e.g. _K['function']
+
+_ADDRESS = _K['address']
+_PAYABLE = _K['payable']
+_FUNCTION = _K['function']
+_MAPPING = _K['mapping']
+_OVERRIDE = _K['override']
+_VISIBILITY = _types('external', 'public', 'internal', 'private')
+
+# expression: precedence of the binary (left associative) operators, see SolidityParser.expression()
+_BINARY_PRECEDENCE = dict(
+    [(_K[op], 14) for op in ('**',)] +
+    [(_K[op], 13) for op in ('*', '/', '%')] +
+    [(_K[op], 12) for op in ('+', '-')] +
+    [(_K[op], 11) for op in ('<<', '>>')] +
+    [(_K[op], 10) for op in ('&',)] +
+    [(_K[op], 9) for op in ('^',)] +
+    [(_K[op], 8) for op in ('|',)] +
+    [(_K[op], 7) for op in ('<', '>', '<=', '>=')] +
+    [(_K[op], 6) for op in ('==', '!=')] +
+    [(_K[op], 5) for op in ('&&',)] +
+    [(_K[op], 4) for op in ('||',)] +
+    [(_K[op], 2) for op in ('=', '|=', '^=', '&=', '<<=', '>>=', '+=', '-=', '*=', '/=', '%=')]
+)
+_TERNARY_PRECEDENCE = 3
+# prefix operators and the precedence their operand is parsed with
+_PREFIX_PRECEDENCE = dict(
+    [(_K[op], 19) for op in ('++', '--')] +
+    [(_K[op], 18) for op in ('+', '-')] +
+    [(_K[op], 17) for op in ('after', 'delete')] +
+    [(_K['!'], 16), (_K['~'], 15)]
+)
+_POSTFIX = _types('++', '--')
+
+# tokens following the name of a declared variable or parameter, see typeName()
+_DECLARATION_END = _types('=', ';')
+_LIST_ITEM_END = _types(',', ')')
+
+# lookahead padding after EOF
+_PADDING = 4
+
+
+class _Span(object):
+    """
+    first and last token of a node, what Node._get_loc() reads from a parse tree context
+    """
+    __slots__ = ("start", "stop")
+
+    def __init__(self, start, stop):
+        self.start = start
+        self.stop = stop
+
+
+_FAILED = object()
+
+
+class RecursiveDescentParser(object):
+    """
+    builds the ast from a list of (default channel) tokens ending with EOF
+    """
+
+    def __init__(self, nodes="dict", loc=False):
+        """
+        :param nodes: node representation, see AstVisitor
+        :param loc: add location information to ast nodes, see AstVisitor
+        """
+        self._nodeFactory = _node_factory(nodes, loc)
+        self._loc = bool(loc)
+        self.tokens = None
+        self.types = None
+        self.pos = 0
+        self.lastCall = None
+        self.bodies = True
+        self.lazyBodies = None
+
+    def parse(self, tokens, start="sourceUnit", bodies=True, lazyBodies=None):
+        """
+        :param tokens: default channel tokens, the last one is EOF
+        :param start: grammar rule to start parsing from
+        :param bodies: parse function and modifier bodies, skip them otherwise (see _body())
+        :param lazyBodies: optional parser._LazySource, skipped bodies become its LazyBody objects
+        :return: ast
+        :raises RDSyntaxError: for invalid input (or a start rule that is not implemented here)
+        :raises RDUnsupported: for input that AstVisitor fails on
+        """
+        rule = getattr(self, start, None) if not start.startswith("_") else None
+        if rule is None:
+            raise RDSyntaxError("start rule %r is not supported" % start)
+
+        self.reset(tokens)
+        self.bodies = bodies
+        self.lazyBodies = lazyBodies
+        try:
+            result = rule()
+            if self.types[self.pos] != _EOF and start != "sourceUnit":
+                # ANTLR stops at trailing garbage instead, leave those inputs to it
+                raise RDSyntaxError("unexpected trailing tokens")
+            return result
+        except IndexError:
+            raise RDSyntaxError("unexpected end of input")
+        finally:
+            self.reset()
+            self.bodies = True
+            self.lazyBodies = None
+
+    def reset(self, tokens=None):
+        """
+        start parsing tokens (default channel tokens, the last one is EOF) at their first one,
+        e.g. to call a rule method like expression() directly. Without tokens, drop the last input.
+        """
+        self.tokens = tokens
+        self.types = None if tokens is None else [t.type for t in tokens] + [_EOF] * _PADDING
+        self.pos = 0
+
+    # ********************************************************
+
+    def _node(self, start, type, **kwargs):
+        """
+        create a node spanning the tokens from start up to the last consumed one
+        """
+        span = _Span(self.tokens[start], self.tokens[self.pos - 1]) if self._loc else None
+        return self._nodeFactory(ctx=span, type=type, **kwargs)
+
+    def _error(self):
+        token = self.tokens[min(self.pos, len(self.tokens) - 1)]
+        return RDSyntaxError("unexpected %r at %d:%d" % (token.text, token.line, token.column))
+
+    def _match(self, ttype):
+        if self.types[self.pos] != ttype:
+            raise self._error()
+        self.pos += 1
+
+    def _text(self, start):
+        """
+        :return: text of the tokens from start up to the last consumed one (ctx.getText())
+        """
+        return "".join(t.text for t in self.tokens[start:self.pos])
+
+    def _try(self, rule):
+        """
+        :return: result of rule, or _FAILED (with the position restored) if it does not match
+        """
+        pos = self.pos
+        try:
+            return rule()
+        except RDSyntaxError:
+            self.pos = pos
+            return _FAILED
+
+    def _first(self, *rules):
+        """
+        :return: result of the first of rules that matches (ordered choice)
+        """
+        for rule in rules[:-1]:
+            result = self._try(rule)
+            if result is not _FAILED:
+                return result
+        return rules[-1]()
+
+    def _identifierText(self):
+        if self.types[self.pos] not in _IDENTIFIER:
+            raise self._error()
+        self.pos += 1
+        return self.tokens[self.pos - 1].text
+
+    # ********************************************************
+
+    def sourceUnit(self):
+        start = self.pos
+        types = self.types
+        children = []
+        while types[self.pos] != _EOF:
+            t = types[self.pos]
+            if t == _K['pragma']:
+                children.append(self.pragmaDirective())
+            elif t == _K['import']:
+                children.append(self.importDirective())
+            elif t == _K['abstract'] or t in _CONTRACT_KIND:
+                children.append(self.contractDefinition())
+            elif t == _K['enum']:
+                children.append(self.enumDefinition())
+            elif t == _K['struct']:
+                children.append(self.structDefinition())
+            elif t == _FUNCTION or t == _K['constructor'] or t == _K['fallback'] or t == _K['receive']:
+                children.append(self._first(self.functionDefinition, self.fileLevelConstant))
+            elif t == _K['error']:
+                children.append(self._first(self.fileLevelConstant, self.customErrorDefinition))
+            elif t == _K['type']:
+                children.append(self.typeDefinition())
+            else:
+                children.append(self.fileLevelConstant())
+        # matching EOF does not consume it, the unit ends with the token before
+        if self._loc and self.pos == 0:
+            raise RDUnsupported("location of an empty source unit")
+        return self._node(start, "SourceUnit", children=children)
+
+    def pragmaDirective(self):
+        start = self.pos
+        self._match(_K['pragma'])
+        name = self._identifierText()
+        value_start = self.pos
+        if self._try(self._version) is _FAILED or self.types[self.pos] != _SEMI:
+            self.pos = value_start
+            self.expression()
+        value = self._text(value_start)
+        self._match(_SEMI)
+        return self._node(start, "PragmaDirective", name=name, value=value)
+
+    def _version(self):
+        self._versionConstraint()
+        types = self.types
+        while True:
+            t = types[self.pos]
+            if t == _OR:
+                self.pos += 1
+                self._versionConstraint()
+            elif t in _VERSION_OPERATOR or t == _VERSION_LITERAL or t == _DECIMAL_NUMBER:
+                self._versionConstraint()
+            else:
+                return True
+
+    def _versionConstraint(self):
+        if self.types[self.pos] in _VERSION_OPERATOR:
+            self.pos += 1
+        if self.types[self.pos] not in (_VERSION_LITERAL, _DECIMAL_NUMBER):
+            raise self._error()
+        self.pos += 1
+
+    def importDirective(self):
+        start = self.pos
+        types = self.types
+        self._match(_K['import'])
+        symbol_aliases = {}
+        unit_alias = None
+
+        if types[self.pos] == _STRING_LITERAL:
+            path = self.tokens[self.pos].text
+            self.pos += 1
+            if types[self.pos] == _K['as']:
+                self.pos += 1
+                unit_alias = self._identifierText()
+        elif types[self.pos] == _LBRACE:
+            self.pos += 1
+            while True:
+                name = self._identifierText()
+                alias = None
+                if types[self.pos] == _K['as']:
+                    self.pos += 1
+                    alias = self._identifierText()
+                symbol_aliases[name] = alias
+                if types[self.pos] != _COMMA:
+                    break
+                self.pos += 1
+            self._match(_RBRACE)
+            self._match(_K['from'])
+            path = self._importPath()
+        else:
+            if types[self.pos] == _STAR:
+                self.pos += 1
+            else:
+                self._identifierText()
+            if types[self.pos] == _K['as']:
+                self.pos += 1
+                unit_alias = self._identifierText()
+            self._match(_K['from'])
+            path = self._importPath()
+            if unit_alias is None:
+                # AstVisitor takes the 4th child, which is the path here
+                unit_alias = path
+        self._match(_SEMI)
+        return self._node(start, "ImportDirective",
+                          path=path.strip('"'),
+                          symbolAliases=symbol_aliases,
+                          unitAlias=unit_alias)
+
+    def _importPath(self):
+        self._match(_STRING_LITERAL)
+        return self.tokens[self.pos - 1].text
+
+    def contractDefinition(self):
+        start = self.pos
+        types = self.types
+        kind = self.tokens[self.pos].text
+        if types[self.pos] == _K['abstract']:
+            self.pos += 1
+        if types[self.pos] not in _CONTRACT_KIND:
+            raise self._error()
+        self.pos += 1
+        name = self._identifierText()
+
+        baseContracts = []
+        if types[self.pos] == _K['is']:
+            self.pos += 1
+            baseContracts.append(self.inheritanceSpecifier())
+            while types[self.pos] == _COMMA:
+                self.pos += 1
+                baseContracts.append(self.inheritanceSpecifier())
+
+        self._match(_LBRACE)
+        subNodes = []
+        while types[self.pos] != _RBRACE:
+            subNodes.append(self.contractPart())
+        self.pos += 1
+        return self._node(start, "ContractDefinition",
+                          name=name,
+                          baseContracts=baseContracts,
+                          subNodes=subNodes,
+                          kind=kind)
+
+    def inheritanceSpecifier(self):
+        start = self.pos
+        baseName = self.userDefinedTypeName()
+        arguments = None
+        if self.types[self.pos] == _LPAREN:
+            self.pos += 1
+            if self.types[self.pos] != _RPAREN:
+                # AstVisitor visits the expressionList context: the result of its last child
+                arguments = self.expressionList()[-1]
+            self._match(_RPAREN)
+        return self._node(start, "InheritanceSpecifier", baseName=baseName, arguments=arguments)
+
+    def contractPart(self):
+        t = self.types[self.pos]
+        if t == _K['using']:
+            return self.usingForDeclaration()
+        if t == _K['struct']:
+            return self.structDefinition()
+        if t == _K['modifier']:
+            return self.modifierDefinition()
+        if t == _K['event']:
+            return self.eventDefinition()
+        if t == _K['enum']:
+            return self.enumDefinition()
+        if t == _K['type']:
+            return self.typeDefinition()
+        if t == _FUNCTION:
+            if self.types[self.pos + 1] == _LPAREN:
+                return self._first(self.stateVariableDeclaration, self.functionDefinition)
+            return self.functionDefinition()
+        if t == _K['fallback']:
+            return self.functionDefinition()
+        if t == _K['constructor'] or t == _K['receive']:
+            return self._first(self.stateVariableDeclaration, self.functionDefinition)
+        if t == _K['error']:
+            return self._first(self.stateVariableDeclaration, self.customErrorDefinition)
+        return self.stateVariableDeclaration()
+
+    def stateVariableDeclaration(self):
+        start = self.pos
+        types = self.types
+        typeName = self.typeName(_DECLARATION_END)
+        keywords = set()
+        while True:
+            t = types[self.pos]
+            if t in _VISIBILITY or t == _K['constant'] or t == _K['immutable']:
+                keywords.add(t)
+                self.pos += 1
+            elif t == _OVERRIDE:
+                self.overrideSpecifier()
+            else:
+                break
+        name = self._identifierText()
+        expression = None
+        if types[self.pos] == _ASSIGN:
+            self.pos += 1
+            expression = self.expression()
+        self._match(_SEMI)
+
+        visibility = 'default'
+        if _K['internal'] in keywords:
+            visibility = 'internal'
+        elif _K['public'] in keywords:
+            visibility = 'public'
+        elif _K['private'] in keywords:
+            visibility = 'private'
+
+        decl = self._node(start, 'VariableDeclaration',
+                          typeName=typeName,
+                          name=name,
+                          expression=expression,
+                          visibility=visibility,
+                          isStateVar=True,
+                          isDeclaredConst=_K['constant'] in keywords,
+                          isIndexed=False)
+        return self._node(start, 'StateVariableDeclaration', variables=[decl], initialValue=expression)
+
+    def overrideSpecifier(self):
+        self._match(_OVERRIDE)
+        if self.types[self.pos] == _LPAREN:
+            self.pos += 1
+            self.userDefinedTypeName()
+            while self.types[self.pos] == _COMMA:
+                self.pos += 1
+                self.userDefinedTypeName()
+            self._match(_RPAREN)
+
+    def fileLevelConstant(self):
+        start = self.pos
+        typeName = self.typeName()
+        self._match(_K['constant'])
+        name = self.identifier()
+        self._match(_ASSIGN)
+        self.expression()  # not part of the ast
+        self._match(_SEMI)
+        return self._node(start, "FileLevelConstant", name=name, typeName=typeName, ConstantKeyword='constant')
+
+    def customErrorDefinition(self):
+        start = self.pos
+        self._match(_K['error'])
+        name = self.identifier()
+        parameterList = self.parameterList()
+        self._match(_SEMI)
+        return self._node(start, "CustomErrorDefinition", name=name, parameterList=parameterList)
+
+    def typeDefinition(self):
+        start = self.pos
+        self._match(_K['type'])
+        self._identifierText()
+        self._match(_K['is'])
+        elementaryTypeName = self.elementaryTypeName()
+        self._match(_SEMI)
+        return self._node(start, "TypeDefinition", typeKeyword='type', elementaryTypeName=elementaryTypeName)
+
+    def usingForDeclaration(self):
+        start = self.pos
+        self._match(_K['using'])
+        libraryName = self._identifierText()
+        self._match(_K['for'])
+        if self.types[self.pos] == _STAR:
+            self.pos += 1
+            typeName = '*'
+        else:
+            typeName = self.typeName()
+        self._match(_SEMI)
+        return self._node(start, "UsingForDeclaration", typeName=typeName, libraryName=libraryName)
+
+    def structDefinition(self):
+        start = self.pos
+        self._match(_K['struct'])
+        name = self._identifierText()
+        self._match(_LBRACE)
+        members = []
+        while self.types[self.pos] != _RBRACE:
+            members.append(self.variableDeclaration((_SEMI,)))
+            self._match(_SEMI)
+        self.pos += 1
+        return self._node(start, 'StructDefinition', name=name, members=members)
+
+    def modifierDefinition(self):
+        start = self.pos
+        types = self.types
+        self._match(_K['modifier'])
+        name = self._identifierText()
+        parameters = []
+        if types[self.pos] == _LPAREN:
+            parameters = self.parameterList()
+        while True:
+            if types[self.pos] == _K['virtual']:
+                self.pos += 1
+            elif types[self.pos] == _OVERRIDE:
+                self.overrideSpecifier()
+            else:
+                break
+        body = None
+        if types[self.pos] == _SEMI:
+            self.pos += 1
+        else:
+            body = self._body()
+        return self._node(start, 'ModifierDefinition', name=name, parameters=parameters, body=body)
+
+    def functionDefinition(self):
+        start = self.pos
+        types = self.types
+        isConstructor = isFallback = isReceive = False
+        t = types[self.pos]
+        name = None
+        if t == _FUNCTION:
+            self.pos += 1
+            if types[self.pos] in _IDENTIFIER:
+                name = self._identifierText()
+        elif t == _K['constructor']:
+            isConstructor = True
+        elif t == _K['fallback']:
+            isFallback = True
+        elif t == _K['receive']:
+            isReceive = True
+        else:
+            raise self._error()
+        if t != _FUNCTION:
+            name = self.tokens[self.pos].text
+            self.pos += 1
+
+        parameters = self.parameterList()
+
+        # modifierList
+        visibilities = set()
+        stateMutability = None
+        modifiers = []
+        while True:
+            t = types[self.pos]
+            if t in _VISIBILITY:
+                visibilities.add(t)
+                self.pos += 1
+            elif t == _K['virtual']:
+                self.pos += 1
+            elif t in _STATE_MUTABILITY:
+                if stateMutability is None:
+                    stateMutability = self.tokens[self.pos].text
+                self.pos += 1
+            elif t in _IDENTIFIER:
+                modifiers.append(self.modifierInvocation())
+            elif t == _OVERRIDE:
+                self.overrideSpecifier()
+            else:
+                break
+
+        returnParameters = []
+        if types[self.pos] == _K['returns']:
+            returnParameters = self.returnParameters()
+        if types[self.pos] == _SEMI:
+            self.pos += 1
+            block = []
+        else:
+            block = self._body()
+
+        if name is None:
+            name = self._text(start)
+
+        if _K['external'] in visibilities:
+            visibility = "external"
+        elif _K['internal'] in visibilities:
+            visibility = "internal"
+        elif _K['public'] in visibilities:
+            visibility = "public"
+        elif _K['private'] in visibilities:
+            visibility = "private"
+        else:
+            visibility = 'default'
+
+        return self._node(start, "FunctionDefinition",
+                          name=name,
+                          parameters=parameters,
+                          returnParameters=returnParameters,
+                          body=block,
+                          visibility=visibility,
+                          modifiers=modifiers,
+                          isConstructor=isConstructor,
+                          isFallback=isFallback,
+                          isReceive=isReceive,
+                          stateMutability=stateMutability)
+
+    def modifierInvocation(self):
+        start = self.pos
+        name = self._identifierText()
+        args = []
+        if self.types[self.pos] == _LPAREN:
+            self.pos += 1
+            if self.types[self.pos] != _RPAREN:
+                args = self.expressionList()
+            self._match(_RPAREN)
+        return self._node(start, 'ModifierInvocation', name=name, arguments=args)
+
+    def returnParameters(self):
+        self._match(_K['returns'])
+        return self.parameterList()
+
+    def parameterList(self):
+        start = self.pos
+        self._match(_LPAREN)
+        parameters = []
+        if self.types[self.pos] != _RPAREN:
+            parameters.append(self.parameter())
+            while self.types[self.pos] == _COMMA:
+                self.pos += 1
+                parameters.append(self.parameter())
+        self._match(_RPAREN)
+        return self._node(start, "ParameterList", parameters=parameters)
+
+    def parameter(self):
+        start = self.pos
+        types = self.types
+        typeName = self.typeName(_LIST_ITEM_END)
+        storageLocation = name = None
+        if types[self.pos] in _STORAGE_LOCATION:
+            storageLocation = self.tokens[self.pos].text
+            self.pos += 1
+        if types[self.pos] in _IDENTIFIER:
+            name = self._identifierText()
+        return self._node(start, "Parameter",
+                          typeName=typeName,
+                          name=name,
+                          storageLocation=storageLocation,
+                          isStateVar=False,
+                          isIndexed=False)
+
+    def eventDefinition(self):
+        start = self.pos
+        self._match(_K['event'])
+        name = self._identifierText()
+        parameters = self.eventParameterList()
+        isAnonymous = False
+        if self.types[self.pos] == _K['anonymous']:
+            self.pos += 1
+            isAnonymous = True
+        self._match(_SEMI)
+        return self._node(start, 'EventDefinition', name=name, parameters=parameters, isAnonymous=isAnonymous)
+
+    def eventParameterList(self):
+        start = self.pos
+        types = self.types
+        self._match(_LPAREN)
+        items = []
+        if types[self.pos] != _RPAREN:
+            while True:
+                typeName = self.typeName(_LIST_ITEM_END)
+                isIndexed = False
+                if types[self.pos] == _K['indexed']:
+                    self.pos += 1
+                    isIndexed = True
+                name = None
+                if types[self.pos] in _IDENTIFIER:
+                    name = self._identifierText()
+                items.append((typeName, name, isIndexed))
+                if types[self.pos] != _COMMA:
+                    break
+                self.pos += 1
+        self._match(_RPAREN)
+
+        # AstVisitor creates the parameters with the context of the whole list
+        parameters = [self._node(start, 'VariableDeclaration',
+                                 typeName=typeName,
+                                 name=name,
+                                 isStateVar=False,
+                                 isIndexed=isIndexed)
+                      for typeName, name, isIndexed in items]
+        return self._node(start, 'ParameterList', parameters=parameters)
+
+    def enumDefinition(self):
+        start = self.pos
+        self._match(_K['enum'])
+        name = self._identifierText()
+        self._match(_LBRACE)
+        members = []
+        if self.types[self.pos] in _IDENTIFIER:
+            members.append(self.enumValue())
+        while self.types[self.pos] == _COMMA:
+            self.pos += 1
+            members.append(self.enumValue())
+        self._match(_RBRACE)
+        return self._node(start, "EnumDefinition", name=name, members=members)
+
+    def enumValue(self):
+        start = self.pos
+        return self._node(start, "EnumValue", name=self._identifierText())
+
+    def variableDeclaration(self, nameFollow=_DECLARATION_END):
+        start = self.pos
+        typeName = self.typeName(nameFollow)
+        storageLocation = None
+        if self.types[self.pos] in _STORAGE_LOCATION and self.types[self.pos + 1] in _IDENTIFIER:
+            storageLocation = self.tokens[self.pos].text
+            self.pos += 1
+        name = self._identifierText()
+        return self._node(start, 'VariableDeclaration',
+                          typeName=typeName,
+                          name=name,
+                          storageLocation=storageLocation)
+
+    # ********************************************************
+
+    def typeName(self, nameFollow=()):
+        """
+        :param nameFollow: tokens that may follow the variable name if the type name is followed by one.
+                           'address' 'payable' followed by one of them is the type 'address' and the name 'payable'
+                           (ANTLR resolves the ambiguity to the first alternative).
+        """
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+        if t == _ADDRESS and types[self.pos + 1] == _PAYABLE and types[self.pos + 2] not in nameFollow:
+            self.pos += 2
+            node = self._node(start, 'ElementaryTypeName', name='address', stateMutability='payable')
+        elif t in _ELEMENTARY_TYPE:
+            node = self.elementaryTypeName()
+        elif t in _IDENTIFIER:
+            node = self.userDefinedTypeName()
+        elif t == _MAPPING:
+            node = self.mapping()
+        elif t == _FUNCTION:
+            node = self.functionTypeName()
+        else:
+            raise self._error()
+
+        while types[self.pos] == _LBRACK:
+            self.pos += 1
+            length = None
+            if types[self.pos] != _RBRACK:
+                length = self.expression()
+            self._match(_RBRACK)
+            node = self._node(start, 'ArrayTypeName', baseTypeName=node, length=length)
+        return node
+
+    def elementaryTypeName(self):
+        start = self.pos
+        if self.types[self.pos] not in _ELEMENTARY_TYPE:
+            raise self._error()
+        self.pos += 1
+        return self._node(start, 'ElementaryTypeName', name=self.tokens[start].text)
+
+    def userDefinedTypeName(self):
+        start = self.pos
+        types = self.types
+        self._identifierText()
+        while types[self.pos] == _DOT and types[self.pos + 1] in _IDENTIFIER:
+            self.pos += 2
+        return self._node(start, 'UserDefinedTypeName', namePath=self._text(start))
+
+    def mapping(self):
+        start = self.pos
+        self._match(_MAPPING)
+        self._match(_LPAREN)
+        if self.types[self.pos] in _ELEMENTARY_TYPE:
+            keyType = self.elementaryTypeName()
+        else:
+            keyType = self.userDefinedTypeName()
+        self._match(_ARROW)
+        valueType = self.typeName()
+        self._match(_RPAREN)
+        return self._node(start, 'Mapping', keyType=keyType, valueType=valueType)
+
+    def functionTypeName(self):
+        start = self.pos
+        types = self.types
+        self._match(_FUNCTION)
+        parameterTypes = self._functionTypeParameterList()
+        visibility = None
+        stateMutability = None
+        while True:
+            t = types[self.pos]
+            if t == _K['internal'] or t == _K['external']:
+                if visibility != 'internal':
+                    visibility = 'internal' if t == _K['internal'] else 'external'
+                self.pos += 1
+            elif t in _STATE_MUTABILITY:
+                if stateMutability is None:
+                    stateMutability = self.tokens[self.pos].text
+                self.pos += 1
+            else:
+                break
+        returnTypes = []
+        if types[self.pos] == _K['returns']:
+            self.pos += 1
+            returnTypes = self._functionTypeParameterList()
+        return self._node(start, 'FunctionTypeName',
+                          parameterTypes=parameterTypes,
+                          returnTypes=returnTypes,
+                          visibility=visibility or 'default',
+                          stateMutability=stateMutability)
+
+    def _functionTypeParameterList(self):
+        self._match(_LPAREN)
+        parameters = []
+        if self.types[self.pos] != _RPAREN:
+            parameters.append(self._functionTypeParameter())
+            while self.types[self.pos] == _COMMA:
+                self.pos += 1
+                parameters.append(self._functionTypeParameter())
+        self._match(_RPAREN)
+        return parameters
+
+    def _functionTypeParameter(self):
+        start = self.pos
+        typeName = self.typeName()
+        storageLocation = None
+        if self.types[self.pos] in _STORAGE_LOCATION:
+            storageLocation = self.tokens[self.pos].text
+            self.pos += 1
+        return self._node(start, 'VariableDeclaration',
+                          typeName=typeName,
+                          name=None,
+                          storageLocation=storageLocation,
+                          isStateVar=False,
+                          isIndexed=False)
+
+    # ********************************************************
+
+    def block(self):
+        start = self.pos
+        self._match(_LBRACE)
+        statements = []
+        types = self.types
+        while types[self.pos] != _RBRACE:
+            statements.append(self.statement())
+        self.pos += 1
+        return self._node(start, 'Block', statements=statements)
+
+    def _body(self):
+        """
+        block of a function or modifier definition. Without bodies it is skipped by matching braces
+        and becomes a SkippedBlock node or LazyBody (see AstVisitor.visitSkippedBlock()).
+        """
+        if self.bodies:
+            return self.block()
+        start = self.pos
+        self._match(_LBRACE)
+        types = self.types
+        depth = 1
+        while depth:
+            t = types[self.pos]
+            if t == _LBRACE:
+                depth += 1
+            elif t == _RBRACE:
+                depth -= 1
+            elif t == _EOF:
+                raise self._error()
+            self.pos += 1
+        first, last = self.tokens[start], self.tokens[self.pos - 1]
+        if self.lazyBodies is not None:
+            return self.lazyBodies.body(first, last)
+        return self._node(start, 'SkippedBlock',
+                          range=[first.start, last.stop],
+                          tokenRange=[first.tokenIndex, last.tokenIndex])
+
+    def statement(self):
+        t = self.types[self.pos]
+        if t == _K['if']:
+            return self.ifStatement()
+        if t == _K['try']:
+            return self.tryStatement()
+        if t == _K['while']:
+            return self.whileStatement()
+        if t == _K['for']:
+            return self.forStatement()
+        if t == _LBRACE:
+            return self.block()
+        if t == _K['assembly']:
+            return self.inlineAssemblyStatement()
+        if t == _K['do']:
+            return self.doWhileStatement()
+        if t == _K['continue'] or t == _K['break']:
+            # no visit method: the result of the last child, the ';'
+            self.pos += 1
+            self._match(_SEMI)
+            return ';'
+        if t == _K['return']:
+            return self.returnStatement()
+        if t == _K['throw']:
+            start = self.pos
+            self.pos += 1
+            self._match(_SEMI)
+            return self._node(start, 'ThrowStatement')
+        if t == _K['emit']:
+            return self.emitStatement()
+        if t == _K['unchecked']:
+            start = self.pos
+            self.pos += 1
+            return self._node(start, 'UncheckedStatement', body=self.block())
+        if t == _K['revert']:
+            return self._first(self.simpleStatement, self.revertStatement)
+        return self.simpleStatement()
+
+    def simpleStatement(self):
+        if self._isDeclaration():
+            return self._first(self.variableDeclarationStatement, self.expressionStatement)
+        return self.expressionStatement()
+
+    def _isDeclaration(self):
+        """
+        :return: True if the statement at the current position may be a variable declaration
+        """
+        types = self.types
+        t = types[self.pos]
+        if t == _K['var'] or t == _MAPPING or t == _FUNCTION or t == _LPAREN:
+            return True
+        i = self.pos + 1
+        if t in _ELEMENTARY_TYPE:
+            pass
+        elif t in _IDENTIFIER:
+            while types[i] == _DOT and types[i + 1] in _IDENTIFIER:
+                i += 2
+        else:
+            return False
+        # array dimensions
+        while types[i] == _LBRACK:
+            depth = 0
+            while True:
+                t = types[i]
+                if t == _LBRACK:
+                    depth += 1
+                elif t == _RBRACK:
+                    depth -= 1
+                    if not depth:
+                        break
+                elif t == _EOF:
+                    return False
+                i += 1
+            i += 1
+        return types[i] in _IDENTIFIER or types[i] in _STORAGE_LOCATION
+
+    def variableDeclarationStatement(self):
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+        if t == _K['var'] and types[self.pos + 1] == _LPAREN:
+            self.pos += 1
+            variables = self.identifierList()
+        elif t == _LPAREN:
+            self.pos += 1
+            variables = self.variableDeclarationList()
+            self._match(_RPAREN)
+        else:
+            variables = [self.variableDeclaration()]
+        initialValue = None
+        if types[self.pos] == _ASSIGN:
+            self.pos += 1
+            initialValue = self.expression()
+        self._match(_SEMI)
+        return self._node(start, 'VariableDeclarationStatement', variables=variables, initialValue=initialValue)
+
+    def identifierList(self):
+        start = self.pos
+        types = self.types
+        self._match(_LPAREN)
+        slots = [None]
+        empty = True
+        while types[self.pos] != _RPAREN:
+            empty = False
+            if types[self.pos] == _COMMA:
+                slots.append(None)
+                self.pos += 1
+            elif slots[-1] is None:
+                slots[-1] = self._identifierText()
+            else:
+                raise self._error()
+        self.pos += 1
+        if empty:
+            return []
+        return [None if name is None else self._node(start, "VariableDeclaration",
+                                                     name=name,
+                                                     isStateVar=False,
+                                                     isIndexed=False)
+                for name in slots]
+
+    def variableDeclarationList(self):
+        start = self.pos
+        types = self.types
+        slots = [None]
+        empty = True
+        while True:
+            t = types[self.pos]
+            if t == _COMMA:
+                slots.append(None)
+                self.pos += 1
+                empty = False
+            elif t == _RPAREN:
+                break
+            elif slots[-1] is None:
+                slots[-1] = self._listedVariableDeclaration()
+                empty = False
+            else:
+                raise self._error()
+        if empty:
+            return []
+        if None in slots:
+            return None
+        return [self._node(start, 'VariableDeclaration',
+                           name=name,
+                           typeName=typeName,
+                           isStateVar=False,
+                           isIndexed=False)
+                for typeName, name in slots]
+
+    def _listedVariableDeclaration(self):
+        typeName = self.typeName(_LIST_ITEM_END)
+        if self.types[self.pos] in _STORAGE_LOCATION and self.types[self.pos + 1] in _IDENTIFIER:
+            self.pos += 1
+        return typeName, self._identifierText()
+
+    def expressionStatement(self):
+        start = self.pos
+        expression = self.expression()
+        self._match(_SEMI)
+        return self._node(start, 'ExpressionStatement', expression=expression)
+
+    def ifStatement(self):
+        start = self.pos
+        self._match(_K['if'])
+        self._match(_LPAREN)
+        condition = self.expression()
+        self._match(_RPAREN)
+        TrueBody = self.statement()
+        FalseBody = None
+        if self.types[self.pos] == _K['else']:
+            self.pos += 1
+            FalseBody = self.statement()
+        return self._node(start, 'IfStatement', condition=condition, TrueBody=TrueBody, FalseBody=FalseBody)
+
+    def tryStatement(self):
+        start = self.pos
+        self._match(_K['try'])
+        expression = self.expression()
+        returnParameters = None
+        if self.types[self.pos] == _K['returns']:
+            returnParameters = self.returnParameters()
+        block = self.block()
+        catchClause = [self.catchClause()]
+        while self.types[self.pos] == _K['catch']:
+            catchClause.append(self.catchClause())
+        return self._node(start, 'TryStatement',
+                          expression=expression,
+                          block=block,
+                          returnParameters=returnParameters,
+                          catchClause=catchClause)
+
+    def catchClause(self):
+        start = self.pos
+        self._match(_K['catch'])
+        identifier = parameterList = None
+        if self.types[self.pos] != _LBRACE:
+            if self.types[self.pos] in _IDENTIFIER:
+                identifier = self.identifier()
+            parameterList = self.parameterList()
+        block = self.block()
+        return self._node(start, 'CatchClause', identifier=identifier, parameterList=parameterList, block=block)
+
+    def whileStatement(self):
+        start = self.pos
+        self._match(_K['while'])
+        self._match(_LPAREN)
+        condition = self.expression()
+        self._match(_RPAREN)
+        body = self.statement()
+        return self._node(start, 'WhileStatement', condition=condition, body=body)
+
+    def doWhileStatement(self):
+        start = self.pos
+        self._match(_K['do'])
+        body = self.statement()
+        self._match(_K['while'])
+        self._match(_LPAREN)
+        condition = self.expression()
+        self._match(_RPAREN)
+        self._match(_SEMI)
+        return self._node(start, 'DoWhileStatement', condition=condition, body=body)
+
+    def forStatement(self):
+        start = self.pos
+        types = self.types
+        self._match(_K['for'])
+        self._match(_LPAREN)
+        initExpression = None
+        if types[self.pos] == _SEMI:
+            self.pos += 1
+        else:
+            initExpression = self.simpleStatement()
+        conditionExpression = None
+        if types[self.pos] == _SEMI:
+            self.pos += 1
+        else:
+            conditionExpression = self.expressionStatement().expression
+        loopExpression = None
+        if types[self.pos] != _RPAREN:
+            loopExpression = self.expression()
+        self._match(_RPAREN)
+        body = self.statement()
+        return self._node(start, 'ForStatement',
+                          initExpression=initExpression,
+                          conditionExpression=conditionExpression,
+                          loopExpression=self._node(start, 'ExpressionStatement', expression=loopExpression),
+                          body=body)
+
+    def inlineAssemblyStatement(self):
+        start = self.pos
+        self._match(_K['assembly'])
+        language = None
+        if self.types[self.pos] == _STRING_LITERAL:
+            language = self.tokens[self.pos].text[1:-1]
+            self.pos += 1
+        return self._node(start, 'InLineAssemblyStatement', language=language, body=self.assemblyBlock())
+
+    def returnStatement(self):
+        # AstVisitor returns the expression (or None) instead of a node
+        self._match(_K['return'])
+        expression = None
+        if self.types[self.pos] != _SEMI:
+            expression = self.expression()
+        self._match(_SEMI)
+        return expression
+
+    def emitStatement(self):
+        start = self.pos
+        self._match(_K['emit'])
+        eventCall = self.functionCall()
+        self._match(_SEMI)
+        return self._node(start, 'EmitStatement', eventCall=eventCall)
+
+    def revertStatement(self):
+        start = self.pos
+        self._match(_K['revert'])
+        functionCall = self.functionCall()
+        self._match(_SEMI)
+        return self._node(start, 'RevertStatement', functionCall=functionCall)
+
+    def functionCall(self):
+        # expression '(' functionCallArguments ')': the expression without its last call, which
+        # builds the same FunctionCall node as visiting the functionCall context
+        node = self.expression()
+        if self.lastCall is None or getattr(node, "type", None) != 'FunctionCall':
+            raise self._error()
+        return node
+
+    # ********************************************************
+
+    def expression(self, precedence=0):
+        """
+        expression with operators binding at least as tight as precedence, see SolidityParser.expression().
+        Afterwards lastCall is the position of the '(' of the expression's own call if it ends with
+        one (e.g. the second '(' of f(a)(b)), None otherwise.
+        """
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+
+        if t == _K['new']:
+            self.pos += 1
+            node = self._node(start, 'NewExpression', typeName=self.typeName())
+        elif t == _LPAREN:
+            node = self.tupleExpression()
+        elif t in _PREFIX_PRECEDENCE:
+            self.pos += 1
+            operand = self.expression(_PREFIX_PRECEDENCE[t])
+            node = self._node(start, 'UnaryOperation',
+                              operator=self.tokens[start].text,
+                              subExpression=operand,
+                              isPrefix=True)
+        else:
+            node = self.primaryExpression()
+
+        lastCall = None
+        while True:
+            t = types[self.pos]
+            op = _BINARY_PRECEDENCE.get(t)
+            if op is not None:
+                if op < precedence:
+                    break
+                operator = self.tokens[self.pos].text
+                self.pos += 1
+                right = self.expression(op + 1)
+                node = self._node(start, 'BinaryOperation', operator=operator, left=node, right=right)
+                lastCall = None
+                continue
+            if t == _LPAREN:
+                lastCall = self.pos
+                self.pos += 1
+                args, names = self._functionCallArguments()
+                self._match(_RPAREN)
+                node = self._node(start, 'FunctionCall', expression=node, arguments=args, names=names)
+                continue
+            if t == _DOT:
+                self.pos += 1
+                memberName = self._identifierText()
+                node = self._node(start, 'MemberAccess', expression=node, memberName=memberName)
+            elif t == _LBRACK:
+                node = self._indexOrSlice(start, node)
+            elif t == _QUESTION:
+                if _TERNARY_PRECEDENCE < precedence:
+                    break
+                self.pos += 1
+                trueExpression = self.expression()
+                self._match(_COLON)
+                falseExpression = self.expression(_TERNARY_PRECEDENCE + 1)
+                node = self._node(start, 'Conditional',
+                                  condition=node,
+                                  TrueExpression=trueExpression,
+                                  FalseExpression=falseExpression)
+            elif t in _POSTFIX:
+                self.pos += 1
+                node = self._node(start, 'UnaryOperation',
+                                  operator=self.tokens[self.pos - 1].text,
+                                  subExpression=node,
+                                  isPrefix=False)
+            elif t == _LBRACE and types[self.pos + 1] in _IDENTIFIER and types[self.pos + 2] == _COLON:
+                # call options: AstVisitor has no case for the 4 children and visits them to a list
+                self.pos += 1
+                _, values, trailingComma = self.nameValueList()
+                self._match(_RBRACE)
+                node = [node, '{', ',' if trailingComma else values[-1], '}']
+            else:
+                break
+            lastCall = None
+
+        self.lastCall = lastCall
+        return node
+
+    def primaryExpression(self):
+        start = self.pos
+        types = self.types
+        tokens = self.tokens
+        t = types[self.pos]
+
+        if t == _BOOLEAN_LITERAL:
+            self.pos += 1
+            return self._node(start, 'BooleanLiteral', value=tokens[start].text == 'true')
+        if t == _DECIMAL_NUMBER or t == _HEX_NUMBER:
+            return self.numberLiteral()
+        if t == _HEX_LITERAL:
+            while types[self.pos] == _HEX_LITERAL:
+                self.pos += 1
+            return self._node(start, 'hexLiteral', value=self._text(start))
+        if t == _STRING_LITERAL:
+            while types[self.pos] == _STRING_LITERAL:
+                self.pos += 1
+            text = self._text(start)
+            return self._node(start, 'stringLiteral', value=text[1: len(text) - 1])
+        if t in _IDENTIFIER:
+            i = self.pos + 1
+            while types[i] == _DOT and types[i + 1] in _IDENTIFIER:
+                i += 2
+            if i > self.pos + 1 and types[i] == _LBRACK and types[i + 1] == _RBRACK:
+                # typeNameExpression '[' ']' with a user defined type name
+                self.pos = i
+                name = self._text(start)
+                self.pos += 2
+                return self._arrayTypeName(start, 'ElementaryTypeName', name=name)
+            self.pos += 1
+            name = tokens[start].text
+            if types[self.pos] == _LBRACK and types[self.pos + 1] == _RBRACK:
+                self.pos += 2
+                return self._arrayTypeName(start, 'UserDefinedTypeName', namePath=name)
+            return self._node(start, "Identifier", name=name)
+        if t == _K['type']:
+            # visits to the terminal's text
+            self.pos += 1
+            return 'type'
+        if t == _LPAREN or t == _LBRACK:
+            return self.tupleExpression()
+        if t in _ELEMENTARY_TYPE:
+            node = self.elementaryTypeName()
+            if types[self.pos] == _LBRACK and types[self.pos + 1] == _RBRACK:
+                self.pos += 2
+                return self._arrayTypeName(start, 'ElementaryTypeName', name=tokens[start].text)
+            return node
+        raise self._error()
+
+    def _arrayTypeName(self, start, type, **kwargs):
+        """
+        primaryExpression of a type name followed by '[' ']'
+        """
+        return self._node(start, 'ArrayTypeName', baseTypeName=self._node(start, type, **kwargs), length=None)
+
+    def numberLiteral(self):
+        start = self.pos
+        if self.types[self.pos] != _DECIMAL_NUMBER and self.types[self.pos] != _HEX_NUMBER:
+            raise self._error()
+        self.pos += 1
+        subdenomination = None
+        if self.types[self.pos] == _NUMBER_UNIT:
+            subdenomination = self.tokens[self.pos].text
+            self.pos += 1
+        return self._node(start, 'NumberLiteral', number=self.tokens[start].text, subdenomination=subdenomination)
+
+    def identifier(self):
+        start = self.pos
+        return self._node(start, "Identifier", name=self._identifierText())
+
+    def tupleExpression(self):
+        start = self.pos
+        types = self.types
+        if types[self.pos] == _LBRACK:
+            self.pos += 1
+            components = []
+            if types[self.pos] != _RBRACK:
+                components = self.expressionList()
+            self._match(_RBRACK)
+            return self._node(start, 'TupleExpression', components=components, isArray=True)
+
+        self._match(_LPAREN)
+        components = [None]
+        empty = True
+        while types[self.pos] != _RPAREN:
+            empty = False
+            if types[self.pos] == _COMMA:
+                components.append(None)
+                self.pos += 1
+            elif components[-1] is None:
+                components[-1] = self.expression()
+            else:
+                raise self._error()
+        self.pos += 1
+        return self._node(start, 'TupleExpression', components=[] if empty else components, isArray=False)
+
+    def _indexOrSlice(self, start, node):
+        types = self.types
+        self._match(_LBRACK)
+        children = [node, '[']
+        if types[self.pos] != _COLON:
+            index = self.expression()
+            if types[self.pos] == _RBRACK:
+                self.pos += 1
+                return self._node(start, 'IndexAccess', base=node, index=index)
+            children.append(index)
+        self._match(_COLON)
+        children.append(':')
+        if types[self.pos] != _RBRACK:
+            children.append(self.expression())
+        self._match(_RBRACK)
+        children.append(']')
+        if len(children) == 4:
+            # AstVisitor takes base[:] for an index access with the ':' as index
+            return self._node(start, 'IndexAccess', base=node, index=':')
+        # no case for the other slices, visited to the list of children
+        return children
+
+    def expressionList(self):
+        expressions = [self.expression()]
+        while self.types[self.pos] == _COMMA:
+            self.pos += 1
+            expressions.append(self.expression())
+        return expressions
+
+    def nameValueList(self):
+        """
+        :return: (names, expressions, True if there is a trailing comma)
+        """
+        names = []
+        values = []
+        types = self.types
+        while True:
+            names.append(self._identifierText())
+            self._match(_COLON)
+            values.append(self.expression())
+            if types[self.pos] != _COMMA:
+                return names, values, False
+            self.pos += 1
+            if types[self.pos] == _RBRACE:
+                return names, values, True
+
+    def _functionCallArguments(self):
+        """
+        :return: (arguments, names)
+        """
+        types = self.types
+        t = types[self.pos]
+        if t == _LBRACE:
+            self.pos += 1
+            names, args = [], []
+            if types[self.pos] != _RBRACE:
+                names, args, _ = self.nameValueList()
+            self._match(_RBRACE)
+            return args, names
+        if t == _RPAREN:
+            return [], []
+        return self.expressionList(), []
+
+    # ********************************************************
+
+    def assemblyBlock(self):
+        start = self.pos
+        self._match(_LBRACE)
+        operations = []
+        while self.types[self.pos] != _RBRACE:
+            operations.append(self.assemblyItem())
+        self.pos += 1
+        return self._node(start, 'AssemblyBlock', operations=operations)
+
+    def assemblyItem(self):
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+        if t in _IDENTIFIER:
+            n = types[self.pos + 1]
+            if n == _YUL_ASSIGN:
+                return self.assemblyAssignment()
+            if n == _COLON:
+                self.pos += 2
+                return self._node(start, 'LabelDefinition', name=self.tokens[start].text)
+            if n == _LPAREN:
+                return self.assemblyCall()
+            if n == _DOT and types[self.pos + 2] in _IDENTIFIER:
+                raise RDUnsupported("assembly member access")
+            return self.identifier()
+        if t == _LBRACE:
+            return self.assemblyBlock()
+        if t == _K['let']:
+            return self.assemblyLocalDefinition()
+        if t == _LPAREN:
+            return self.assemblyAssignment()
+        if t == _YUL_STACK_ASSIGN:
+            self.pos += 1
+            return self._node(start, 'AssemblyStackAssignment', name=self._identifierText())
+        if t == _K['switch']:
+            return self.assemblySwitch()
+        if t == _FUNCTION:
+            return self.assemblyFunctionDefinition()
+        if t == _K['for']:
+            return self.assemblyFor()
+        if t == _K['if']:
+            return self.assemblyIf()
+        if t == _K['break']:
+            self.pos += 1
+            return self._node(start, 'Break')
+        if t == _K['continue']:
+            self.pos += 1
+            return self._node(start, 'Continue')
+        if t == _K['assembly']:
+            # subAssembly: no visit method, the result of its last child
+            self.pos += 1
+            self._identifierText()
+            return self.assemblyBlock()
+        if (t == _DECIMAL_NUMBER or t == _HEX_NUMBER) and types[self.pos + 1] == _NUMBER_UNIT:
+            return self.numberLiteral()
+        return self.assemblyExpression()
+
+    def assemblyExpression(self):
+        types = self.types
+        t = types[self.pos]
+        if t in _IDENTIFIER:
+            if types[self.pos + 1] == _DOT and types[self.pos + 2] in _IDENTIFIER:
+                raise RDUnsupported("assembly member access")
+            return self.assemblyCall()
+        if t == _K['return'] or t == _ADDRESS or t == _K['byte']:
+            return self.assemblyCall()
+        return self.assemblyLiteral()
+
+    def assemblyCall(self):
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+        if not (t in _IDENTIFIER or t == _K['return'] or t == _ADDRESS or t == _K['byte']):
+            raise self._error()
+        self.pos += 1
+        args = []
+        if types[self.pos] == _LPAREN:
+            self.pos += 1
+            if types[self.pos] != _RPAREN and types[self.pos] != _COMMA:
+                args.append(self.assemblyExpression())
+            while types[self.pos] == _COMMA:
+                self.pos += 1
+                args.append(self.assemblyExpression())
+            self._match(_RPAREN)
+        return self._node(start, 'AssemblyExpression', functionName=self.tokens[start].text, arguments=args)
+
+    def assemblyLiteral(self):
+        start = self.pos
+        types = self.types
+        t = types[self.pos]
+        if t == _STRING_LITERAL:
+            while types[self.pos] == _STRING_LITERAL:
+                self.pos += 1
+            text = self._text(start)
+            return self._node(start, 'StringLiteral', value=text[1: len(text) - 1])
+        if t == _DECIMAL_NUMBER:
+            self.pos += 1
+            return self._node(start, 'DecimalNumber', value=self.tokens[start].text)
+        if t == _HEX_NUMBER:
+            self.pos += 1
+            return self._node(start, 'HexNumber', value=self.tokens[start].text)
+        if t == _HEX_LITERAL:
+            while types[self.pos] == _HEX_LITERAL:
+                self.pos += 1
+            return self._node(start, 'HexLiteral', value=self._text(start))
+        raise self._error()
+
+    def _assemblyIdentifierOrList(self):
+        types = self.types
+        if types[self.pos] == _LPAREN:
+            self.pos += 1
+            names = self._assemblyIdentifierList()
+            self._match(_RPAREN)
+            return names
+        if types[self.pos + 1] == _DOT and types[self.pos + 2] in _IDENTIFIER:
+            raise RDUnsupported("assembly member access")
+        return [self.identifier()]
+
+    def _assemblyIdentifierList(self):
+        names = [self.identifier()]
+        while self.types[self.pos] == _COMMA:
+            self.pos += 1
+            names.append(self.identifier())
+        return names
+
+    def assemblyLocalDefinition(self):
+        start = self.pos
+        self._match(_K['let'])
+        names = self._assemblyIdentifierOrList()
+        expression = None
+        if self.types[self.pos] == _YUL_ASSIGN:
+            self.pos += 1
+            expression = self.assemblyExpression()
+        return self._node(start, 'AssemblyLocalDefinition', names=names, expression=expression)
+
+    def assemblyAssignment(self):
+        start = self.pos
+        names = self._assemblyIdentifierOrList()
+        self._match(_YUL_ASSIGN)
+        return self._node(start, 'AssemblyAssignment', names=names, expression=self.assemblyExpression())
+
+    def assemblySwitch(self):
+        start = self.pos
+        self._match(_K['switch'])
+        expression = self.assemblyExpression()
+        cases = []
+        while self.types[self.pos] in (_K['case'], _K['default']):
+            cases.append(self.assemblyCase())
+        return self._node(start, 'AssemblySwitch', expression=expression, cases=cases)
+
+    def assemblyCase(self):
+        start = self.pos
+        if self.types[self.pos] == _K['case']:
+            self.pos += 1
+            value = self.assemblyLiteral()
+            return self._node(start, "AssemblyCase", block=self.assemblyBlock(), value=value)
+        self._match(_K['default'])
+        return self._node(start, "AssemblyCase", block=self.assemblyBlock(), default=True)
+
+    def assemblyFunctionDefinition(self):
+        start = self.pos
+        types = self.types
+        self._match(_FUNCTION)
+        name = self._identifierText()
+        self._match(_LPAREN)
+        arguments = returnArguments = None
+        if types[self.pos] != _RPAREN:
+            arguments = self._assemblyIdentifierList()
+        self._match(_RPAREN)
+        if types[self.pos] == _YUL_RETURNS:
+            self.pos += 1
+            returnArguments = self._assemblyIdentifierList()
+        body = self.assemblyBlock()
+        if arguments is None or returnArguments is None:
+            # AstVisitor fails on functions without arguments or return values
+            raise RDUnsupported("assembly function without arguments or return values")
+        return self._node(start, 'AssemblyFunctionDefinition',
+                          name=name,
+                          arguments=arguments,
+                          returnArguments=returnArguments,
+                          body=body)
+
+    def assemblyFor(self):
+        start = self.pos
+        self._match(_K['for'])
+        pre = self.assemblyBlock() if self.types[self.pos] == _LBRACE else self.assemblyExpression()
+        condition = self.assemblyExpression()
+        post = self.assemblyBlock() if self.types[self.pos] == _LBRACE else self.assemblyExpression()
+        body = self.assemblyBlock()
+        return self._node(start, 'AssemblyFor', pre=pre, condition=condition, post=post, body=body)
+
+    def assemblyIf(self):
+        start = self.pos
+        self._match(_K['if'])
+        condition = self.assemblyExpression()
+        return self._node(start, 'AssemblyIf', condition=condition, body=self.assemblyBlock())
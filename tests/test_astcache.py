@@ -0,0 +1,105 @@
+"""
+ASTCache: keys, hit/miss statistics, size accounting, LRU eviction and invalidation
+"""
+import os
+
+import pytest
+
+from solidity_parser import astcache, parser
+
+SOURCE = "contract C { function f() public { uint x = 1; } }"
+
+
+def _entry_size(tmp_path, ast):
+    cache = astcache.ASTCache(str(tmp_path / "size"))
+    cache.put("00size", ast)
+    return cache.stats()["size"]
+
+
+@pytest.mark.parametrize("option", [
+    {"start": "contractDefinition"},
+    {"loc": True},
+    {"loc": "lazy"},
+    {"nodes": "slots"},
+    {"bodies": False},
+    {"bodies": "lazy"},
+    {"keep": {"ContractDefinition"}},
+    {"comments": True},
+])
+def test_key_depends_on_options(tmp_path, option):
+    cache = astcache.ASTCache(str(tmp_path))
+    assert cache.key(SOURCE, **option) != cache.key(SOURCE)
+    assert cache.key(SOURCE, **option) == cache.key(SOURCE, **option)
+
+
+def test_key_depends_on_text(tmp_path):
+    cache = astcache.ASTCache(str(tmp_path))
+    assert cache.key(SOURCE) != cache.key(SOURCE + " ")
+    assert cache.key(SOURCE) == cache.key(SOURCE.encode("ascii"))  # ASCII bytes hash like the equal str
+    assert cache.key(SOURCE, keep={"A", "B"}) == cache.key(SOURCE, keep={"B", "A"})
+
+
+def test_hits_and_misses(tmp_path):
+    cache = astcache.ASTCache(str(tmp_path))
+    stats = {}
+    ast = parser.parse(SOURCE, cache=cache, stats=stats)
+    assert stats["cache"] == "miss"
+    assert parser.parse(SOURCE, cache=cache, stats=stats) == ast
+    assert stats["cache"] == "hit"
+    parser.parse(SOURCE, loc=True, cache=cache, stats=stats)
+    assert stats["cache"] == "miss"
+    assert cache.stats() == dict(hits=1, misses=2, stores=2, evictions=0, size=cache._size, entries=2)
+
+
+def test_syntax_errors_are_not_stored(tmp_path, capsys):
+    cache = astcache.ASTCache(str(tmp_path))
+    for _ in range(2):
+        stats = {}
+        parser.parse("contract C { uint private = 1; }", cache=cache, stats=stats)
+        assert stats["cache"] == "miss"
+        assert "extraneous input '='" in capsys.readouterr().err
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("entries", [1, 10])
+def test_put_same_key_again(tmp_path, monkeypatch, entries):
+    ast = parser.parse(SOURCE)
+    size = _entry_size(tmp_path, ast)
+    cache = astcache.ASTCache(str(tmp_path / "cache"), max_size=entries * size + size // 2)
+    evictions = []
+    monkeypatch.setattr(cache, "evict", lambda: evictions.append(1))
+    key = cache.key(SOURCE)
+    for _ in range(3):
+        cache.put(key, ast)
+    assert cache._size == size == cache.stats()["size"]
+    assert evictions == []
+    assert cache.get(key) == ast
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    asts = {name: parser.parse("contract %s { uint x; }" % name) for name in "ABC"}
+    size = max(_entry_size(tmp_path, ast) for ast in asts.values())
+    cache = astcache.ASTCache(str(tmp_path / "cache"), max_size=2 * size + size // 2)
+    cache.put("a", asts["A"])
+    cache.put("b", asts["B"])
+    os.utime(cache._path("a"), (1000, 1000))
+    os.utime(cache._path("b"), (2000, 2000))
+    assert cache.get("a") == asts["A"]  # now the most recently used
+
+    cache.put("c", asts["C"])
+    assert cache.evictions == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == asts["A"] and cache.get("c") == asts["C"]
+    assert cache._size == cache.stats()["size"] <= cache.max_size
+
+
+def test_fingerprint_change_invalidates(tmp_path, monkeypatch):
+    cache = astcache.ASTCache(str(tmp_path))
+    parser.parse(SOURCE, cache=cache)
+    key = cache.key(SOURCE)
+    monkeypatch.setattr(astcache, "_fingerprint", "regenerated grammar")
+    assert cache.key(SOURCE) != key
+    stats = {}
+    parser.parse(SOURCE, cache=cache, stats=stats)
+    assert stats["cache"] == "miss"
+    assert cache.stats()["entries"] == 2
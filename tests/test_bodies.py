@@ -0,0 +1,67 @@
+"""
+bodies=False: the ast of a parse with bodies, the function and modifier bodies replaced by SkippedBlock nodes
+"""
+import os
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+EXTRA = """
+contract D {
+    modifier only() { require(msg.sender == owner, "}"); _; }
+    function f(uint a) external only returns (uint s) {
+        /* } */ if (a > 1) { s = a; } else { unchecked { s = a * 2; } }
+        assembly { let x := add(1, 2) switch x case 1 { x := 0 } default { } }
+        // {
+    }
+    function g() public;
+    constructor() { uint[] memory a = new uint[](2); }
+}
+interface I { function h() external; }
+"""
+
+
+def _sources():
+    with open(SAMPLE) as f:
+        return [f.read(), EXTRA]
+
+
+def _offset(text, position):
+    lines = text.split("\n")
+    return sum(len(line) + 1 for line in lines[:position["line"] - 1]) + position["column"]
+
+
+def _skip_bodies(full, outline, text):
+    """
+    replace the bodies of full by those of outline after checking that they are the skipped blocks
+
+    :return: number of replaced bodies
+    """
+    replaced = 0
+    for node, skipped in zip(full["children"], outline["children"]):
+        if node["type"] != "ContractDefinition":
+            continue
+        for member, skipped_member in zip(node["subNodes"], skipped["subNodes"]):
+            if member["type"] not in ("FunctionDefinition", "ModifierDefinition") or member["body"] == []:
+                continue
+            block, body = member["body"], skipped_member["body"]
+            assert block["type"] == "Block" and body["type"] == "SkippedBlock"
+            assert body["loc"] == block["loc"]
+            first, last = body["range"]
+            assert text[first] == "{" and text[last] == "}"
+            assert (first, last) == (_offset(text, block["loc"]["start"]), _offset(text, block["loc"]["end"]))
+            member["body"] = body
+            replaced += 1
+    return replaced
+
+
+@pytest.mark.parametrize("engine", ["antlr", "rd"])
+@pytest.mark.parametrize("text", _sources(), ids=["simple.sol", "extra"])
+def test_bodies_are_skipped(text, engine):
+    full = parser.parse(text, loc=True, engine=engine)
+    outline = parser.parse(text, loc=True, engine=engine, bodies=False)
+    assert _skip_bodies(full, outline, text) > 2
+    assert outline == full
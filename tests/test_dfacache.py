@@ -0,0 +1,146 @@
+"""
+saving and loading the DFA cache, bounding it with a DFACacheManager
+"""
+import os
+import pickle
+
+import pytest
+
+from solidity_parser import dfacache, parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+
+@pytest.fixture
+def text():
+    with open(SAMPLE) as f:
+        return f.read()
+
+
+def _dfas():
+    return [dfa for name, recognizer in dfacache._recognizers() for dfa in recognizer.decisionsToDFA]
+
+
+def _clear():
+    for dfa in _dfas():
+        dfacache._clear_dfa(dfa)
+
+
+def _states():
+    return sum(len(dfa.states) for dfa in _dfas())
+
+
+def test_round_trip(tmp_path, text):
+    ast = parser.parse(text, loc=True)
+    path = str(tmp_path / "solidity.dfa")
+    dfacache.save_dfa_cache(path)
+    states = _states()
+
+    _clear()
+    assert _states() == 0
+    assert dfacache.load_dfa_cache(path)
+    assert _states() == states > 0
+    assert parser.parse(text, loc=True) == ast
+    assert _states() == states  # nothing left to learn
+
+
+@pytest.mark.parametrize("damage", ["missing", "count"])
+def test_mismatch_leaves_dfas_untouched(tmp_path, text, damage):
+    parser.parse(text)
+    path = str(tmp_path / "solidity.dfa")
+    dfacache.save_dfa_cache(path)
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    # the parser is filled first, so a bad lexer entry must be detected before that
+    if damage == "missing":
+        del data["hidden_lexer"]
+    else:
+        data["lexer"]["dfas"].pop()
+    with open(path, "wb") as f:
+        pickle.dump(data, f)
+
+    before = [dfa._states for dfa in _dfas()]
+    assert not dfacache.load_dfa_cache(path)
+    assert all(dfa._states is states for dfa, states in zip(_dfas(), before))
+
+
+def test_missing_file(tmp_path):
+    assert not dfacache.load_dfa_cache(str(tmp_path / "missing.dfa"))
+
+
+@pytest.fixture
+def install():
+    installed = []
+
+    def install(manager):
+        installed.append(dfacache.set_cache_manager(manager))
+        return manager
+
+    yield install
+    if installed:
+        dfacache.set_cache_manager(installed[0])
+
+
+def test_reset_policy(install, text):
+    ast = parser.parse(text)
+    snapshots = []
+    manager = install(dfacache.DFACacheManager(max_dfa_states=10, on_snapshot=snapshots.append))
+    assert parser.parse(text) == ast
+    assert manager.parses == manager.resets == 1
+    assert len(snapshots) == 1 and snapshots[0]["dfa_states"] > 10 and snapshots[0]["context_cache_entries"] > 0
+    stats = manager.stats()
+    assert stats["dfa_states"] == stats["context_cache_entries"] == 0
+
+    # the cleared caches are learned again
+    assert parser.parse(text) == ast
+    assert manager.resets == 2
+
+
+def test_evict_policy(install, text):
+    ast = parser.parse(text)
+    states = dfacache.DFACacheManager().stats()["dfa_states"]
+    manager = install(dfacache.DFACacheManager(max_dfa_states=states - 1, policy="evict"))
+    assert parser.parse(text) == ast
+    assert manager.resets == 1
+    # the largest decisions are cleared down to half the ceiling, the smaller ones are kept
+    stats = manager.stats()
+    assert 0 < stats["dfa_states"] <= (states - 1) // 2
+    assert stats["context_cache_entries"] == 0
+
+
+def test_context_ceiling(install, text):
+    manager = install(dfacache.DFACacheManager(max_context_entries=1))
+    manager.reset()  # a cold parse adds prediction contexts
+    parser.parse(text)
+    assert manager.resets == 2
+    assert manager.stats()["context_cache_entries"] == 0
+
+
+def test_check_interval(install, text):
+    parser.parse(text)
+    snapshots = []
+    manager = install(dfacache.DFACacheManager(max_context_entries=10 ** 6, check_interval=3,
+                                               on_snapshot=snapshots.append))
+    for _ in range(7):
+        parser.parse(text)
+    assert manager.parses == 7 and len(snapshots) == 2 and manager.resets == 0
+
+    manager.max_dfa_states = 10
+    assert manager.check()
+    assert len(snapshots) == 3 and manager.stats()["dfa_states"] == 0
+
+
+def test_tracked_parse(install, text):
+    parser.parse(text)
+    manager = install(dfacache.DFACacheManager(max_dfa_states=10))
+    with dfacache.tracked_parse():
+        # another parse finishing or an explicit check must not clear the caches in use
+        parser.parse("contract C {}")
+        assert not manager.check()
+        assert manager.parses == 1 and manager.resets == 0
+    assert manager.parses == 2 and manager.resets == 1
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="unknown policy 'lru'"):
+        dfacache.DFACacheManager(policy="lru")
@@ -0,0 +1,107 @@
+"""
+keep={...}: every node of a kept type is in the pruned ast, with the fields of the full ast apart from the
+pruned subtrees
+"""
+import os
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+EXTRA = """
+pragma solidity ^0.8.0;
+import {A as B, C} from "./a.sol";
+contract D is B {
+    using L for uint;
+    struct S { uint a; mapping(uint => bool) m; }
+    enum E { X, Y }
+    event Ev(address indexed a, uint b);
+    error Err(uint code);
+    modifier only() { require(msg.sender == owner, "no"); _; }
+    function f(uint[] calldata a) external only returns (uint s) {
+        for (uint i = 0; i < a.length; i++) { s += a[i]; }
+        try this.g() returns (uint v) { s = v; } catch Error(string memory) { revert Err(1); }
+        unchecked { s = s * 2 > 3 ? s : new uint[](1).length; }
+        assembly { let x := add(1, 2) switch x case 1 { x := 0 } default { } }
+        emit Ev(msg.sender, s);
+        do { s--; } while (s > 10);
+        (bool ok, ) = address(this).call("");
+    }
+}
+"""
+
+
+def _nodes(ast):
+    """
+    :return: all nodes of ast in pre-order
+    """
+    found = []
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict) and "type" in node:
+            found.append(node)
+            stack.extend(reversed([value for key, value in node.items() if key != "loc"]))
+    return found
+
+
+def _own_fields(node):
+    """
+    :return: the fields of node that do not hold nodes (the subtrees of kept nodes are pruned too)
+    """
+    def is_tree(value):
+        if isinstance(value, list):
+            return any(is_tree(item) for item in value)
+        return value is None or isinstance(value, dict) and "type" in value
+
+    return dict((key, value) for key, value in node.items() if not is_tree(value))
+
+
+def _sources():
+    with open(SAMPLE) as f:
+        return [f.read(), EXTRA]
+
+
+@pytest.mark.parametrize("text", _sources(), ids=["simple.sol", "extra"])
+def test_kept_types_are_complete(text):
+    full = _nodes(parser.parse(text, loc=True))
+    types = sorted(set(node["type"] for node in full))
+    assert len(types) > 20
+    for node_type in types:
+        pruned = _nodes(parser.parse(text, loc=True, keep={node_type}))
+        expected = [_own_fields(node) for node in full if node["type"] == node_type]
+        assert [_own_fields(node) for node in pruned if node["type"] == node_type] == expected, node_type
+
+
+def test_pruned_nodes():
+    ast = parser.parse(EXTRA, keep={"ImportDirective", "PragmaDirective"})
+    assert [node["type"] for node in ast["children"][:2]] == ["PragmaDirective", "ImportDirective"]
+    assert ast["children"][0]["value"] == "^0.8.0"
+    assert ast["children"][1]["symbolAliases"] == {"A": "B", "C": None}
+    assert ast["children"][2] is None  # cannot contain a kept type
+
+    ast = parser.parse(EXTRA, keep={"EmitStatement"})
+    contract = ast["children"][2]
+    # built on the way to the kept type (also the modifier, its body could contain one), other members are None
+    assert contract["type"] == "ContractDefinition" and contract["baseContracts"] == [None]
+    assert [node and node["type"] for node in contract["subNodes"]] == [None] * 5 + ["ModifierDefinition",
+                                                                                      "FunctionDefinition"]
+    assert contract["subNodes"][5]["body"]["statements"] == [None, None]
+    statements = contract["subNodes"][6]["body"]["statements"]
+    assert [node and node["type"] for node in statements] == ["ForStatement", "TryStatement", "UncheckedStatement",
+                                                              None, "EmitStatement", "DoWhileStatement", None]
+    assert statements[4]["eventCall"] is None
+
+
+def test_unknown_types():
+    with pytest.raises(Exception, match="unknown node type\\(s\\) in keep: Contract, Function"):
+        parser.parse(EXTRA, keep={"ContractDefinition", "Function", "Contract"})
+
+
+def test_rd_engine():
+    with pytest.raises(Exception, match="keep is only available with engine='antlr'"):
+        parser.parse(EXTRA, engine="rd", keep={"ContractDefinition"})
@@ -0,0 +1,29 @@
+"""
+parsing with bodies="lazy" and materializing the bodies reports the errors of a full parse, once each
+"""
+import pytest
+
+from solidity_parser import parser
+
+SOURCE = """contract C {
+    function f() public {
+        uint a = 1 # 2;
+    }
+    function g() public { }
+}
+"""
+
+
+@pytest.mark.parametrize("prediction_mode", ["two-stage", "ll"])
+@pytest.mark.parametrize("engine", ["antlr", "rd"])
+@pytest.mark.parametrize("lexer", ["antlr", "regex"])
+def test_errors_reported_once(capsys, lexer, engine, prediction_mode):
+    options = dict(lexer=lexer, engine=engine, prediction_mode=prediction_mode, loc=True)
+    parser.parse(SOURCE, **options)
+    expected = capsys.readouterr().err
+    assert "token recognition error" in expected and "extraneous input" in expected
+
+    ast = parser.parse(SOURCE, bodies="lazy", **options)
+    for function in ast["children"][0]["subNodes"]:
+        function["body"].materialize()
+    assert capsys.readouterr().err == expected
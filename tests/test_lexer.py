@@ -0,0 +1,101 @@
+"""
+RegexLexer and SkipHiddenRegexLexer must produce the tokens (and the lexer errors) of
+SolidityLexer and SkipHiddenLexer, token for token
+"""
+import glob
+import os
+import random
+
+import pytest
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+from antlr4.error.ErrorListener import ErrorListener
+
+from solidity_parser.charstream import BufferStream, CodePointStream, is_plain_ascii
+from solidity_parser.lexer import RegexLexer, SkipHiddenLexer, SkipHiddenRegexLexer, SolidityLexer
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        "samples", "*.sol")))
+
+# pieces of the token soup: tokens of every rule, near misses and characters no rule matches
+PIECES = [
+    "contract", "function", "returns", "uint256", "int8", "bytes32", "byte", "address", "payable", "mapping",
+    "ufixed128x18", "fixed8x1", "fixed", "ufixed", "fixedx", "emit", "unicode", "hex", "pragma", "solidity",
+    "assembly", "let", "leave", "_", "$x", "x_1", "ether", "gwei", "seconds", "true", "false", "type",
+    "0", "1", "007", "1_000", "1__0", "1_", "1.5", "1.", ".5", "1e10", "1E-3", "2.5e_3", "1.2.3", "0.8.0", "1..2",
+    "0x", "0x1f", "0XAB_cd", "0x_1", "0xg",
+    "\"\"", "\"a b\"", "\"\\\"\"", "\"\\n\\u1234\"", "\"unterminated", "'x'", "'\\''", "unicode\"é\"",
+    "hex\"\"", "hex\"00ff\"", "hex'AB_cd'", "hex\"0\"", "hex\"0_\"", "hex'",
+    "/* c */", "/**/", "/*/", "/* multi\nline */", "/* open", "// line", "///", "/",
+    "(", ")", "{", "}", "[", "]", ";", ",", ".", "?", ":", "=", "==", "=>", "!", "!=", "<", "<=", "<<", "<<=",
+    ">", ">=", ">>", ">>=", ">>>", "+", "++", "+=", "-", "--", "-=", "->", "*", "**", "*=", "/=", "%", "%=",
+    "&", "&&", "&=", "|", "||", "|=", "^", "^=", "~", ":=", "=:",
+    "#", "@", "\\", "`", "é", "€", " ", "\x00",
+]
+SEPARATORS = ["", "", " ", "\t", "\n", "\r\n", "\r", "\x0c", "  \n  "]
+
+
+def _soup(rng, size):
+    return "".join(rng.choice(PIECES) + rng.choice(SEPARATORS) for _ in range(size))
+
+
+class _Errors(ErrorListener):
+
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def _lex(lexer_class, stream):
+    lexer = lexer_class(stream)
+    errors = _Errors()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(errors)
+    tokens = []
+    while True:
+        token = lexer.nextToken()
+        tokens.append((token.type, token.text, token.channel, token.start, token.stop, token.line, token.column))
+        if token.type == Token.EOF:
+            break
+    return tokens, errors.errors, getattr(lexer, "hidden_tokens", None)
+
+
+def _streams(text):
+    yield InputStream(text)
+    yield CodePointStream(text)
+    data = text.encode("utf-8")
+    if is_plain_ascii(data):
+        yield BufferStream(data)
+
+
+def _assert_same_tokens(text):
+    for expected_class, actual_class in ((SolidityLexer, RegexLexer), (SkipHiddenLexer, SkipHiddenRegexLexer)):
+        expected = _lex(expected_class, InputStream(text))
+        for stream in _streams(text):
+            assert _lex(actual_class, stream) == expected, (actual_class.__name__, type(stream).__name__, text)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_token_soup(seed):
+    rng = random.Random(seed)
+    _assert_same_tokens(_soup(rng, rng.randint(1, 200)))
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "\n",
+    "/* unterminated comment",
+    "\"unterminated string\ncontract C {}",
+    "contract C { function f() { x = 1 # 2; } }\r\n",
+    "€" * 3,
+])
+def test_edge_cases(text):
+    _assert_same_tokens(text)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_samples(path):
+    with open(path, encoding="utf-8") as f:
+        _assert_same_tokens(f.read())
@@ -0,0 +1,62 @@
+"""
+loc only applies to its own parse, also when threads parse with different settings at the same time
+"""
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+SNIPPETS = [
+    "contract C { uint x; function f(uint a) public returns (uint) { x = a * 2; return x + 1; } }",
+    "library L { function g(uint[] memory a) internal pure returns (uint s) { for (uint i; i < a.length; i++) "
+    "{ s += a[i]; } } }",
+    "interface I { event E(address indexed a); function h() external view returns (bool); }",
+]
+
+OPTIONS = [{}, {"lexer": "regex", "engine": "rd"}, {"nodes": "slots"}, {"bodies": "lazy"}]
+
+
+def _dump(ast):
+    def encode(node):
+        if isinstance(node, parser.LazyBody):
+            return node.materialize()
+        return dict(node.items())
+
+    return json.dumps(ast, sort_keys=True, default=encode)
+
+
+@pytest.fixture
+def switch_interval():
+    # switch threads as often as possible to interleave the parses
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_threads_with_mixed_loc(switch_interval):
+    with open(SAMPLE) as f:
+        texts = SNIPPETS + [f.read()]
+    expected = {(i, loc): _dump(parser.parse(text, loc=loc)) for i, text in enumerate(texts) for loc in (False, True)}
+
+    def parse(n):
+        i, loc, options = n % len(texts), (False, True, "lazy")[n % 3], OPTIONS[n // 3 % len(OPTIONS)]
+        return i, bool(loc), _dump(parser.parse(texts[i], loc=loc, **options))
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(parse, range(len(texts) * 3 * len(OPTIONS) * 4)))
+    assert all(dump == expected[(i, loc)] for i, loc, dump in results)
+
+
+def test_enable_loc_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        parser.Node.ENABLE_LOC = True
+    with pytest.warns(DeprecationWarning):
+        assert parser.Node.ENABLE_LOC is False
+    assert "loc" not in parser.parse("contract C {}")["children"][0]
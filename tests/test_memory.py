@@ -0,0 +1,92 @@
+"""
+the ast must not keep the ANTLR parse tree (and through it the token stream) alive, and the default
+parse must not build the whole parse tree in the first place
+"""
+import gc
+import os
+import tracemalloc
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+# identifier lists and declaration lists used to store their contexts in the ast (iden=, decl=)
+DECLARATIONS = """
+contract C {
+    function f() public returns (uint, uint) { return (1, 2); }
+    function g() public {
+        var (a, b) = f();
+        (uint c, , uint d) = f();
+        (c, d) = (d, c);
+    }
+}
+"""
+
+UNIT = """contract C%d {
+    uint x;
+    mapping(address => uint) balances;
+    function f(uint a, uint b) public returns (uint) {
+        if (a > b) { x = a * 2 + b; } else { balances[msg.sender] = b; }
+        return x + 1;
+    }
+}
+"""
+
+
+def _live_contexts():
+    from antlr4 import ParserRuleContext
+
+    gc.collect()
+    # ParserRuleContext.EMPTY is a static of the runtime
+    return sum(1 for o in gc.get_objects() if isinstance(o, ParserRuleContext) and o is not ParserRuleContext.EMPTY)
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"prediction_mode": "ll"},
+    {"loc": True, "nodes": "slots"},
+    {"bodies": False},
+    {"engine": "rd", "lexer": "regex"},
+])
+def test_parse_tree_is_collectable(options):
+    with open(SAMPLE) as f:
+        sources = [f.read(), DECLARATIONS]
+    asts = [parser.parse(text, **options) for text in sources for _ in range(3)]
+    assert _live_contexts() == 0
+    assert all(ast["type"] == "SourceUnit" for ast in asts)
+
+
+def test_contexts_side_table():
+    contexts = {}
+    ast = parser.parse(DECLARATIONS, contexts=contexts)
+    assert _live_contexts() > 0
+    assert contexts[id(ast)].getRuleIndex() == contexts[id(ast)].parser.RULE_sourceUnit
+    del contexts
+    assert _live_contexts() == 0
+
+
+def _transient_peak(text, **options):
+    """
+    :return: (ast, bytes allocated at the peak of the parse beyond what the ast keeps)
+    """
+    parser.parse(text, **options)  # warm the DFA caches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ast = parser.parse(text, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        return ast, peak - tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_ast_is_built_while_parsing():
+    text = "".join(UNIT % i for i in range(100))
+    # "sll" builds the whole parse tree and visits it, "two-stage" only keeps the tree of one contract
+    ast, peak = _transient_peak(text)
+    tree_ast, tree_peak = _transient_peak(text, prediction_mode="sll")
+    assert ast == tree_ast
+    assert peak < 0.7 * tree_peak
@@ -0,0 +1,80 @@
+"""
+nodes="slots" builds the same ast as nodes="dict", and survives pickling
+"""
+import os
+import pickle
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+EXTRA = """
+contract D {
+    struct S { uint a; mapping(uint => bool) m; }
+    function f(uint[] calldata a) external returns (uint s) {
+        var (x, y) = (1, 2);
+        (uint c, , uint d) = g();
+        for (uint i = 0; i < a.length; i++) { s += a[i]; }
+        assembly { let z := add(1, 2) }
+    }
+}
+"""
+
+
+def _to_dict(value):
+    """
+    :return: value with all nodes converted to plain dicts
+    """
+    if isinstance(value, list):
+        return [_to_dict(item) for item in value]
+    if isinstance(value, (parser.Node, parser.SlotNode)):
+        return dict((key, _to_dict(item)) for key, item in value.items())
+    return value
+
+
+def _field_names(value):
+    """
+    :return: the field names of all nodes in order (slot nodes keep the field order of dict nodes)
+    """
+    if isinstance(value, list):
+        return [_field_names(item) for item in value]
+    if isinstance(value, (parser.Node, parser.SlotNode)):
+        return [(key, _field_names(item)) for key, item in value.items()]
+    return None
+
+
+def _sources():
+    with open(SAMPLE) as f:
+        return [f.read(), EXTRA]
+
+
+def _slot_nodes(value):
+    if isinstance(value, list):
+        return sum((_slot_nodes(item) for item in value), [])
+    if isinstance(value, parser.SlotNode):
+        return [value] + sum((_slot_nodes(item) for key, item in value.items() if key != "loc"), [])
+    return []
+
+
+@pytest.mark.parametrize("loc", [False, True])
+@pytest.mark.parametrize("text", _sources(), ids=["simple.sol", "extra"])
+def test_same_ast(text, loc):
+    expected = _to_dict(parser.parse(text, loc=loc))
+    ast = parser.parse(text, loc=loc, nodes="slots")
+    nodes = _slot_nodes(ast)
+    assert len(nodes) > 50
+    assert all(type(node).__name__ == node.type for node in nodes)
+    assert _to_dict(ast) == expected
+    assert _field_names(ast) == _field_names(parser.parse(text, loc=loc))
+
+
+@pytest.mark.parametrize("loc", [False, True])
+@pytest.mark.parametrize("text", _sources(), ids=["simple.sol", "extra"])
+def test_pickle(text, loc):
+    ast = parser.parse(text, loc=loc, nodes="slots")
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        restored = pickle.loads(pickle.dumps(ast, protocol))
+        assert _to_dict(restored) == _to_dict(ast)
+        assert [type(node) for node in _slot_nodes(restored)] == [type(node) for node in _slot_nodes(ast)]
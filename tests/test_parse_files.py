@@ -0,0 +1,57 @@
+"""
+parse_files: results in order, one failing file does not affect the others, with and without worker processes
+"""
+import os
+
+import pytest
+
+from solidity_parser import dfacache, parser
+
+SOURCES = {
+    "a.sol": "contract A { uint x; }",
+    # recovered syntax error: reported on stderr, the file still has an ast
+    "b.sol": "contract B { uint private = 1; }",
+    # not supported by AstVisitor (member access in inline assembly)
+    "c.sol": "contract C { function f() public { assembly { let x := a.b } } }",
+    "d.sol": "contract D { function f() public { emit E(1); } }",
+}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    for name, text in SOURCES.items():
+        (tmp_path / name).write_text(text)
+    names = ["a.sol", "missing.sol", "b.sol", "c.sol", "d.sol"]
+    return [str(tmp_path / name) for name in names]
+
+
+def _check(results, paths):
+    assert [r.path for r in results] == paths
+    by_name = {os.path.basename(r.path): r for r in results}
+    for name in ("a.sol", "b.sol", "d.sol"):
+        assert by_name[name].error is None
+        assert by_name[name].ast == parser.parse(SOURCES[name])
+    assert by_name["missing.sol"].ast is None
+    assert isinstance(by_name["missing.sol"].error, FileNotFoundError)
+    assert by_name["c.sol"].ast is None
+    assert isinstance(by_name["c.sol"].error, AttributeError)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunksize", [None, 1, 3])
+def test_ordered(paths, workers, chunksize):
+    _check(list(parser.parse_files(paths, workers=workers, chunksize=chunksize)), paths)
+
+
+def test_unordered(paths):
+    results = list(parser.parse_files(paths, workers=2, ordered=False, chunksize=1))
+    _check(sorted(results, key=lambda r: paths.index(r.path)), paths)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_single_path_and_dfa_cache(tmp_path, paths, workers):
+    cache = str(tmp_path / "solidity.dfa")
+    dfacache.save_dfa_cache(cache)
+    _check(list(parser.parse_files(paths, workers=workers, dfa_cache=cache)), paths)
+    [result] = parser.parse_files(paths[:1], workers=workers, dfa_cache=cache)
+    assert result.error is None and result.ast["children"][0]["name"] == "A"
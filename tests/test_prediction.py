@@ -0,0 +1,67 @@
+"""
+stats["prediction_mode"] names the stage a parse finished in: "sll" only if plain SLL prediction
+was enough, i.e. exactly when prediction_mode="sll" succeeds
+"""
+import os
+
+import pytest
+
+from solidity_parser import parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "simple.sol")
+
+SOURCES = [
+    "contract C { uint x; function f(uint a) public { x = a; } }",
+    "contract C { function f() public { if (a) { b(); } else { c = d + e * f; } } }",
+    "pragma solidity ^0.8.0; import 'a.sol'; interface I { function g() external; }",
+]
+
+
+def _stage(text, **options):
+    stats = {}
+    ast = parser.parse(text, stats=stats, **options)
+    return ast, stats["prediction_mode"]
+
+
+def _sources():
+    with open(SAMPLE) as f:
+        return SOURCES + [f.read()]
+
+
+@pytest.mark.parametrize("text", _sources())
+def test_stages(text):
+    ll, stage = _stage(text, prediction_mode="ll")
+    assert stage == "ll"
+
+    ast, stage = _stage(text)
+    assert stage == "sll-fast"
+    assert ast == ll
+
+    # without the fast paths (contexts requested) the first stage is plain SLL
+    ast, stage = _stage(text, contexts={})
+    assert ast == ll
+    try:
+        sll, sll_stage = _stage(text, prediction_mode="sll")
+    except Exception as e:
+        assert "SLL prediction failed" in str(e)
+        assert stage == "ll"
+    else:
+        assert (sll_stage, stage) == ("sll", "sll")
+        assert sll == ll
+
+
+def test_fast_paths_accept_more_than_sll():
+    with open(SAMPLE) as f:
+        text = f.read()
+    assert _stage(text)[1] == "sll-fast"
+    with pytest.raises(Exception, match="SLL prediction failed at line 99:55"):
+        parser.parse(text, prediction_mode="sll")
+
+
+@pytest.mark.parametrize("prediction_mode", ["two-stage", "sll", "ll"])
+def test_unsupported_constructs_raise(prediction_mode):
+    # AstVisitor does not support member access in inline assembly, building the ast while parsing
+    # must raise the same error as visiting the parse tree
+    text = "contract C { function f() public { assembly { let x := a.b } } }"
+    with pytest.raises(AttributeError, match="'list' object has no attribute 'getText'"):
+        parser.parse(text, prediction_mode=prediction_mode)
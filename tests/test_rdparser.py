@@ -0,0 +1,162 @@
+"""
+engine="rd" must build the ast (or raise the error) and report the syntax errors of the generated ANTLR
+parser alone (prediction_mode="ll")
+
+Set SOLIDITY_PARSER_CORPUS to a directory of .sol files to compare the engines on it as well.
+"""
+import contextlib
+import glob
+import io
+import os
+import random
+import re
+
+import pytest
+
+from solidity_parser import parser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = sorted(glob.glob(os.path.join(ROOT, "samples", "*.sol")))
+CORPUS = sorted(glob.glob(os.path.join(os.environ["SOLIDITY_PARSER_CORPUS"], "**", "*.sol"), recursive=True)
+                if os.environ.get("SOLIDITY_PARSER_CORPUS") else [])
+
+# function bodies, each parsed in "contract C { function f() public { ... } }"
+STATEMENTS = [
+    "a = b = c;", "x = c ? a : b = d;", "c ? a : b ? d : e;", "-a ** b;", "a ** b ** c;", "!a && b || c;",
+    "delete a[1];", "a++ + ++b;", "x = new uint[](3);", "new Foo(1);", "a.b.c(1, 2);", "f({a: 1, b: 2});",
+    "f({});", "a.call{value: 1}('');", "a.call{value: 1, gas: 2,}('');", "x = a[1:2];", "x = a[:];", "x = a[1:];",
+    "x = a[:2];", "(a, b) = f();", "(uint a, uint b) = f();", "(, uint b) = f();", "(uint a, ) = f();", "(,,) = f();",
+    "() = f();", "var (a, , b) = f();", "var (a) = f();", "var () = f();", "var (,) = f();", "var x = 1;",
+    "address payable x = y;", "address payable;", "address payable = 1;", "address(this).transfer(1);",
+    "payable(x).transfer(1);", "uint[] memory x;", "uint[2][] storage x = y;", "a[i] = 1;", "a[i] b;",
+    "a.b[] memory c;", "a.b c = d;", "mapping(uint => uint) storage m = n;", "x = a.b[];", "x = a[];", "x = uint[];",
+    "x = abi.decode(d, (a.b[], uint[]));", "type(uint).max;", "x = (a);", "x = ();", "x = (a, );", "x = (, a);",
+    "x = [a, b];", "x = [];", "x = 1 ether + 0x10 wei;", "x = hex'00' hex'11';", "x = 'a' \"b\";", "x = true;",
+    "emit E(1);", "emit a.E(1);", "emit f(1)(2);", "revert E(1);", "revert('x');", "revert();", "revert;",
+    "break; continue; return; return 1; throw;", "if (a) b; else if (c) d; else e;", "if (a) if (b) c; else d;",
+    "for (;;) {}", "for (uint i = 0; i < 10; i++) x++;", "for (i = 0; ; ) {}", "while (a) {}", "do { a; } while (b);",
+    "unchecked { a++; }",
+    "try f() returns (uint v) { } catch Error(string memory r) { } catch (bytes memory b) { } catch { }",
+    "try f() {} catch {}", "try new Foo() returns (Foo f) {} catch {}",
+    "assembly { let x := add(1, 2) x := 3 y: mstore(0, x) }", "assembly { let x }",
+    "assembly { for { let i := 0 } lt(i, 10) { i := add(i, 1) } { } }",
+    "assembly { switch x case 0 { } case 'a' { } default { } }", "assembly { if x { leave } }",
+    "assembly { function g(a) -> b { b := a } }", "assembly { function g() -> b { } }",
+    "assembly { function g(a) { } }",
+    "assembly { x.y := 1 }", "assembly { pop(x.y) }", "assembly { 1 ether }", "assembly { 1 'a' hex'00' 0x1 }",
+    "assembly { return(0, 32) }", "assembly { =: x }", "assembly { (a, b) := f() }", "assembly { break continue }",
+    "assembly { assembly x { } }", "assembly 'evmasm' { }", "assembly { {} }", "assembly { let (a, b) := f() }",
+    "f(x)[0].y++;", "x = a ? b : c;", "a += b -= c;", "x = ~a; x = !b; x = -c; x = +d;", "x = after a;",
+    "x = a << b >> c;", "a == b != c;", "a < b > c <= d >= e;", "a & b ^ c | d;", "uint x = type(I).interfaceId;",
+    "x = new function() external[](1);", "function (uint) external returns (uint) f;",
+    "function (uint) external payable f;", "function (uint) payable f;", "from calldata;", "x = payable;",
+    "x.y{value: 1};", "x{value: 1, gas: 2}();", "a.b.c;", "a;", "1;", "'a';", "x = a.b.c[];",
+]
+
+SOURCES = [
+    "pragma solidity ^0.8.0;", "pragma solidity >=0.4.22 <0.9.0;", "pragma solidity ^0.4.24 || ^0.5.0;",
+    "pragma experimental ABIEncoderV2;", "pragma solidity 0.8;", "pragma abicoder v2;",
+    "import 'a.sol';", "import \"a.sol\" as x;", "import * as x from 'a.sol';", "import x from 'a.sol';",
+    "import x as y from \"a.sol\";", "import {a, b as c} from \"a.sol\";",
+    "abstract contract A is B, C(1, 2), D() { }", "interface I { function f() external view returns (uint); }",
+    "library L { using L for *; using L for uint[]; }",
+    "contract A { uint public constant x = 1; uint internal immutable y; address payable public z; "
+    "address payable q; uint private override(A, B) w; }",
+    "contract A { address payable; }",
+    "contract A { event E(uint indexed a, address payable, bytes) anonymous; event F(); }",
+    "contract A { enum E { } enum F { a, b } struct S { uint a; address payable; mapping(uint => S) m; } }",
+    "contract A { modifier m; modifier n() virtual override { _; } modifier o(uint a) override(B) { _; } }",
+    "contract A { function f() m1 m2(1) payable public returns (uint a, address payable) { } }",
+    "contract A { function() external payable { } fallback() external { } receive() external payable { } "
+    "constructor() public { } }",
+    "contract A { function f(uint calldata) public; function g(bytes calldata calldata) public; "
+    "function h(address payable) public; }",
+    "contract A { function (uint) external f; function () external payable g; }",
+    "contract A { error E(uint a); error x; type T is uint; }",
+    "error E(uint); type T is address; uint constant X = 1; function f() {}",
+    "function f() pure returns (uint) { return 1; }", "struct S { uint a; } enum E { A }",
+    "contract A { function f() public { uint x = a.b(c).d[e]; } }",
+    "contract A { mapping(address => mapping(uint => bool)) public m; }",
+    "contract A { receive x; constructor y; error z; }",
+    # syntax errors, the rd engine hands them to ANTLR
+    "contract A { function f() public { x = ; } }", "contract A { uint private = 1; }", "contract { }",
+    "contract A { function f() public { if (a { } } }", "pragma solidity ^0.8.0 contract A {}",
+]
+
+EXPRESSIONS = ["a = b = c", "a ? b : c ? d : e", "x[1:2]", "type(x)", "a.b[]", "(a, b)", "a b", "f(1) g",
+               "new uint[](1)", "payable(x)", "a{value: 1}"]
+
+OPTIONS = [{"loc": False, "lexer": "antlr"}, {"loc": True, "lexer": "regex"}]
+
+_TOKEN = re.compile(r"[A-Za-z_$][\w$]*|\d+|\"[^\"\n]*\"|'[^'\n]*'|\S")
+
+
+def _parse(text, engine, **options):
+    stderr = io.StringIO()
+    stats = {}
+    with contextlib.redirect_stderr(stderr):
+        try:
+            result = parser.parse(text, engine=engine, stats=stats, **options)
+        except Exception as e:
+            result = (type(e), str(e))
+    return result, stderr.getvalue(), stats.get("engine")
+
+
+def _assert_same(text, **options):
+    # the reference is the generated parser alone (full LL prediction, no fast paths). The expected
+    # tokens ANTLR lists in error messages depend on its prediction cache, compare warm parses
+    _parse(text, "antlr", prediction_mode="ll", **options)
+    expected, expected_stderr, _ = _parse(text, "antlr", prediction_mode="ll", **options)
+    actual, actual_stderr, engine = _parse(text, "rd", **options)
+    assert actual == expected
+    assert actual_stderr == expected_stderr
+    return engine
+
+
+def _mutations(text, seed, count=20):
+    """
+    :return: count copies of text with one to three tokens deleted, inserted or replaced
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        source = text
+        for _ in range(rng.randint(1, 3)):
+            tokens = list(_TOKEN.finditer(source))
+            m, other = rng.choice(tokens), rng.choice(tokens).group()
+            edit = rng.randrange(3)
+            if edit == 0:
+                source = source[:m.start()] + source[m.end():]
+            elif edit == 1:
+                source = source[:m.start()] + other + " " + source[m.start():]
+            else:
+                source = source[:m.start()] + other + source[m.end():]
+        yield source
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("text", ["contract C { function f() public { %s } }" % s for s in STATEMENTS] + SOURCES)
+def test_snippets(text, options):
+    _assert_same(text, **options)
+
+
+@pytest.mark.parametrize("text", EXPRESSIONS)
+def test_expressions(text):
+    _assert_same(text, start="expression", loc=True)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+@pytest.mark.parametrize("options", OPTIONS)
+def test_samples(path, options):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert _assert_same(text, **options) == "rd"
+    for mutated in _mutations(text, seed=os.path.basename(path)):
+        _assert_same(mutated, **options)
+
+
+@pytest.mark.parametrize("path", CORPUS)
+def test_corpus(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    for options in OPTIONS:
+        _assert_same(text, **options)
@@ -0,0 +1,42 @@
+"""
+a ParserSession reuses its recognizers, but never those of a parse whose contexts the caller holds
+"""
+from solidity_parser import parser
+
+SOURCE = """// the token contract
+contract C {
+    /* the supply */
+    uint x;
+}
+"""
+
+
+def test_contexts_survive_next_parse():
+    session = parser.ParserSession()
+    contexts = {}
+    ast = session.parse(SOURCE, contexts=contexts)
+    # parses on the same thread and session, with and without contexts
+    session.parse("contract D { uint y; }")
+    session.parse("contract E {}", contexts={})
+
+    contract = ast["children"][0]
+    variable = contract["subNodes"][0]
+    ctx = contexts[id(contract)]
+    stream = ctx.parser.getTokenStream()
+    assert stream.tokens[ctx.start.tokenIndex] is ctx.start
+    assert [t.text for t in stream.getHiddenTokensToLeft(ctx.start.tokenIndex)] == ["// the token contract"]
+    start = contexts[id(variable)].start
+    assert [t.text for t in stream.getHiddenTokensToLeft(start.tokenIndex)] == ["/* the supply */"]
+    assert stream.getText().startswith("// the token contract")
+
+
+def test_recognizers_are_reused():
+    session = parser.ParserSession()
+    first = session.parse("a + b", start="expression")
+    assert session.parse("a + b", start="expression") == first
+    assert len(session._local.free) == 1
+    # the instances of a parse with contexts stay with the contexts, the next parse builds new ones
+    session.parse("a", start="expression", contexts={})
+    assert len(session._local.free) == 0
+    session.parse("a", start="expression")
+    assert len(session._local.free) == 1